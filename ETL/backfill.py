@@ -0,0 +1,248 @@
+import os
+import re
+import sys
+import json
+import datetime
+import argparse
+
+from response_cache import DEFAULT_CACHE_DIR, season_is_closed
+from storage import DEFAULT_DATA_DIR, backfill_csv, backfill_table
+from scoring import DEFAULT_SCORING_FILE
+
+# Historical backfill: every (season type, season) is fetched and written as its
+# own partition of the backfill table, and a manifest records which partitions are
+# done. The backfill tables are separate from the stats table fantasy_ranking.py
+# reads, so history never changes the current rankings. An interrupted or partly
+# failed run is resumed by running it again - only the missing, failed and
+# still-open seasons are fetched.
+FIRST_SEASON = '1996-97'  # first season with player stats on stats.nba.com
+SEASON_TYPES = ['Regular Season', 'Playoffs', 'PlayIn']
+MANIFEST_FILE = 'backfill_manifest.json'
+
+
+def season_name(start_year):
+    """1996 -> '1996-97'"""
+    return f'{start_year}-{str(start_year + 1)[-2:]}'
+
+
+def season_start_year(season):
+    """'1996-97' -> 1996; raises ValueError for anything else"""
+    match = re.fullmatch(r'(\d{4})-(\d{2})', season)
+    if not match or season_name(int(match.group(1))) != season:
+        raise ValueError(f"Invalid season '{season}' (expected e.g. 1996-97)")
+    return int(match.group(1))
+
+
+def current_season(today=None):
+    """The season in progress (or the last one, in the summer); a season starts in October"""
+    today = today or datetime.date.today()
+    return season_name(today.year if today.month >= 10 else today.year - 1)
+
+
+def season_range(first=FIRST_SEASON, last=None):
+    """Every season from `first` through `last` (default: the current season)"""
+    last = last or current_season()
+    return [season_name(year) for year in range(season_start_year(first), season_start_year(last) + 1)]
+
+
+def partition_key(season_type, season):
+    return f'{season_type}/{season}'
+
+
+def load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'partitions': {}}
+
+
+def save_manifest(manifest, path):
+    """Written to a temp file and renamed, so a crash never leaves a half-written manifest"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def partition_csv_path(data_dir, season_type, season):
+    """Where a partition goes when pyarrow is not installed"""
+    return os.path.join(data_dir, f'{backfill_table(season_type)}_csv', f'SEASON={season}.csv')
+
+
+def partition_exists(data_dir, season_type, season):
+    table_path = os.path.join(data_dir, backfill_table(season_type), f'SEASON={season}')
+    return os.path.isdir(table_path) or os.path.exists(partition_csv_path(data_dir, season_type, season))
+
+
+def plan_partitions(seasons, season_types, manifest, data_dir=DEFAULT_DATA_DIR, force=False, today=None):
+    """
+    The (season type, season) pairs that still need fetching: everything with
+    `force`, otherwise those not done yet, failed, missing from the store, or
+    from a season that was still open when it was fetched. Seasons fetched with
+    no rows (e.g. PlayIn before 2020-21) have no partition and stay done.
+    """
+    planned = []
+    for season_type in season_types:
+        for season in seasons:
+            entry = manifest['partitions'].get(partition_key(season_type, season))
+            done = (entry is not None and entry.get('status') == 'done' and entry.get('closed')
+                    and (entry.get('rows') == 0 or partition_exists(data_dir, season_type, season)))
+            if force or not done or not season_is_closed(season, today):
+                planned.append((season_type, season))
+    return planned
+
+
+def write_partition(fantasy_df, season_type, data_dir=DEFAULT_DATA_DIR):
+    """Replace one season's partition of the backfill table for `season_type`"""
+    from storage import pyarrow_available, write_table
+
+    season = fantasy_df['SEASON'].iloc[0]
+    if pyarrow_available():
+        write_table(fantasy_df, backfill_table(season_type), data_dir=data_dir, partition_by='SEASON', replace=False)
+    else:
+        path = partition_csv_path(data_dir, season_type, season)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fantasy_df.to_csv(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+
+
+def build_partition(payload, season, season_type, scoring):
+    """Fantasy dataset for one fetched season, or None if the season has no rows yet"""
+    from transform import payload_to_dataframe, season_games, transform
+
+    raw_df = payload_to_dataframe(payload, season)
+    if raw_df.empty:
+        return None
+    if season_type == 'Regular Season':
+        games = season_games(season)
+    else:
+        # Playoff runs differ per team; measure against the longest run
+        games = max(1, int(raw_df['GP'].max()))
+    return transform(raw_df, scoring, games)
+
+
+def read_backfilled(season_type, data_dir=DEFAULT_DATA_DIR):
+    """Every backfilled season of `season_type` as one DataFrame (None if there is none)"""
+    import pandas as pd
+    from storage import pyarrow_available, read_table, table_exists
+
+    table = backfill_table(season_type)
+    if pyarrow_available() and table_exists(table, data_dir):
+        return read_table(table, data_dir=data_dir)
+    csv_dir = os.path.dirname(partition_csv_path(data_dir, season_type, FIRST_SEASON))
+    if not os.path.isdir(csv_dir):
+        return None
+    frames = [pd.read_csv(os.path.join(csv_dir, name)) for name in sorted(os.listdir(csv_dir)) if name.endswith('.csv')]
+    return pd.concat(frames, ignore_index=True) if frames else None
+
+
+def run_backfill(seasons, season_types, scoring, data_dir=DEFAULT_DATA_DIR, manifest_path=None, force=False,
+                 workers=4, rate=2.0, timeout=30.0, retries=4, cache=None, today=None):
+    """
+    Fetch and write every planned partition, updating the manifest as each one
+    lands. Returns (planned, failed) lists of (season type, season).
+    """
+    from fetcher import fetch_all, print_fetch_report
+    from nba_api import params, request_headers, url
+
+    manifest_path = manifest_path or os.path.join(data_dir, MANIFEST_FILE)
+    manifest = load_manifest(manifest_path)
+    planned = plan_partitions(seasons, season_types, manifest, data_dir, force, today)
+    skipped = len(seasons) * len(season_types) - len(planned)
+    print(f"Backfill: {len(planned)} partitions to fetch, {skipped} already done")
+    if not planned:
+        return planned, []
+
+    failed = []
+
+    def on_result(index, result):
+        season_type, season = planned[index]
+        entry = {
+            'status': 'failed',
+            'rows': 0,
+            'closed': season_is_closed(season, today),
+            'updated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        }
+        try:
+            if result['data'] is None:
+                raise RuntimeError(result['error'])
+            fantasy_df = build_partition(result['data'], season, season_type, scoring)
+            if fantasy_df is not None:
+                write_partition(fantasy_df, season_type, data_dir)
+                entry['rows'] = len(fantasy_df)
+            entry['status'] = 'done'
+            print(f"{season_type} {season}: {entry['rows']} players")
+        except Exception as e:
+            entry['error'] = str(e)
+            failed.append((season_type, season))
+            print(f"{season_type} {season}: failed ({e})")
+        manifest['partitions'][partition_key(season_type, season)] = entry
+        save_manifest(manifest, manifest_path)
+
+    params_list = [dict(params, Season=season, SeasonType=season_type) for season_type, season in planned]
+    results = fetch_all(url, params_list, headers=request_headers, max_workers=workers, rate=rate,
+                        timeout=timeout, max_retries=retries, cache=cache, on_result=on_result)
+    print_fetch_report(results, label_keys=('SeasonType', 'Season'))
+    return planned, failed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Resumable backfill of historical season stats')
+    parser.add_argument('--from', dest='first', type=str, default=FIRST_SEASON, help='First season to backfill (e.g. 1996-97)')
+    parser.add_argument('--to', dest='last', type=str, default=None, help='Last season to backfill (default: the current season)')
+    parser.add_argument('--season-types', nargs='+', choices=SEASON_TYPES, default=['Regular Season'], help='Season types to backfill')
+    parser.add_argument('--force', action='store_true', help='Re-fetch partitions the manifest records as done')
+    parser.add_argument('--workers', type=int, default=4, help='Number of concurrent fetch workers')
+    parser.add_argument('--rate', type=float, default=1.0, help='Maximum requests per second across all workers')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds')
+    parser.add_argument('--retries', type=int, default=4, help='Maximum retries per request on throttling or transient errors')
+    parser.add_argument('--cache-dir', type=str, default=DEFAULT_CACHE_DIR, help='Directory for the on-disk response cache')
+    parser.add_argument('--no-cache', action='store_true', help='Always download fresh data, bypassing the response cache')
+    parser.add_argument('--data-dir', type=str, default=DEFAULT_DATA_DIR, help='Directory of the columnar data store')
+    parser.add_argument('--manifest', type=str, default=None, help=f'Checkpoint manifest (default: DATA_DIR/{MANIFEST_FILE})')
+    parser.add_argument('--csv', action='store_true', help='Also export every backfilled season to CSV file(s)')
+    parser.add_argument('--scoring-file', type=str, default=DEFAULT_SCORING_FILE, help='JSON file with the scoring systems of every league to score')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from scoring import load_scoring_systems
+
+    try:
+        seasons = season_range(args.first, args.last)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    if not seasons:
+        print(f"Error: --from {args.first} is after --to {args.last}")
+        return 1
+
+    scoring = load_scoring_systems(args.scoring_file)
+    cache = None
+    if not args.no_cache:
+        from response_cache import ResponseCache
+        cache = ResponseCache(args.cache_dir)
+
+    print(f"Backfilling {seasons[0]} to {seasons[-1]} ({', '.join(args.season_types)})")
+    _, failed = run_backfill(seasons, args.season_types, scoring, args.data_dir, args.manifest, args.force,
+                             args.workers, args.rate, args.timeout, args.retries, cache)
+
+    if args.csv:
+        for season_type in args.season_types:
+            df = read_backfilled(season_type, args.data_dir)
+            if df is not None:
+                df.to_csv(backfill_csv(season_type), index=False)
+                print(f"{len(df)} rows of {season_type} stats saved to {backfill_csv(season_type)}")
+
+    if failed:
+        print(f"\n{len(failed)} partitions failed: " + ', '.join(f'{t} {s}' for t, s in failed))
+        print("Run the backfill again to retry them; finished partitions are kept.")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,313 @@
+import csv
+import sys
+import datetime
+import argparse
+from collections import deque
+
+from response_cache import DEFAULT_CACHE_DIR
+from storage import DEFAULT_DATA_DIR, form_csv, form_table
+from scoring import DEFAULT_LEAGUE, DEFAULT_SCORING_FILE, LEAGUE_COLUMNS, league_column
+
+# Per-game player logs, streamed into rolling-window form metrics (last 7/14/30
+# days). Each game updates the running sums of its player's windows and old games
+# fall out of the front of the window, so nothing is recomputed over the history
+# and memory only holds the games inside the longest window.
+GAME_LOG_URL = "https://stats.nba.com/stats/playergamelogs"
+
+DEFAULT_WINDOWS = [7, 14, 30]
+
+# Same 48-minute game as the season totals
+MINUTES_PER_GAME = 48
+
+FORM_COLUMNS = ['SEASON', 'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ABBREVIATION', 'GP', 'TEAM_GAMES',
+                'PCT_GAMES_PLAYED', 'MIN', 'AVG_MINUTES', 'PCT_MINUTES_PLAYED',
+                'FANTASY_POINTS', 'AVG_FANTASY_PPG', 'FANTASY_POINTS_PER_MIN']
+
+
+def game_log_params(season, season_type='Regular Season', date_from=None, date_to=None):
+    """Query parameters for the playergamelogs endpoint"""
+    return {
+        'Season': season,
+        'SeasonType': season_type,
+        'LeagueID': '00',
+        'MeasureType': 'Base',
+        'PerMode': 'Totals',
+        'DateFrom': date_from.strftime('%m/%d/%Y') if date_from else '',
+        'DateTo': date_to.strftime('%m/%d/%Y') if date_to else '',
+    }
+
+
+def game_date(value):
+    """Date of a game log row ('2024-11-02T00:00:00' or '2024-11-02')"""
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+def parse_minutes(value):
+    """Minutes played as a float; accepts '34:12' style values"""
+    if value in (None, ''):
+        return 0.0
+    if isinstance(value, str) and ':' in value:
+        minutes, seconds = value.split(':', 1)
+        return int(minutes) + int(seconds) / 60
+    return float(value)
+
+
+def iter_payload_rows(payload):
+    """Yield the rows of a game log payload as dicts, oldest game first"""
+    results = payload['resultSets'][0]
+    headers = results['headers']
+    rows = results['rowSet']
+    date_index = headers.index('GAME_DATE')
+    # The API lists the newest games first; only the row order is sorted, not copied
+    for i in sorted(range(len(rows)), key=lambda i: rows[i][date_index]):
+        yield dict(zip(headers, rows[i]))
+
+
+def iter_csv_rows(path):
+    """Yield the rows of a game log CSV (sorted by GAME_DATE) one at a time"""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        yield from csv.DictReader(f)
+
+
+def games_until(rows, as_of):
+    """Only the rows of games played on or before `as_of`"""
+    for row in rows:
+        if game_date(row['GAME_DATE']) <= as_of:
+            yield row
+
+
+class RollingWindow:
+    """Running totals of the games within the last `days` days"""
+
+    __slots__ = ('days', 'games', 'count', 'minutes', 'points')
+
+    def __init__(self, days, n_leagues):
+        self.days = days
+        self.games = deque()
+        self.count = 0
+        self.minutes = 0.0
+        self.points = [0.0] * n_leagues
+
+    def add(self, day, minutes, points):
+        self.games.append((day, minutes, points))
+        self.count += 1
+        self.minutes += minutes
+        self.points = [total + p for total, p in zip(self.points, points)]
+
+    def evict(self, as_of):
+        """Drop the games older than the window ending on day `as_of` (an ordinal)"""
+        while self.games and self.games[0][0] <= as_of - self.days:
+            _, minutes, points = self.games.popleft()
+            self.count -= 1
+            self.minutes -= minutes
+            self.points = [total - p for total, p in zip(self.points, points)]
+
+
+class RollingForm:
+    """
+    Rolling form of every player over several windows, fed one game log row at a time.
+    Fantasy points are scored for every league in `scoring` as the games arrive.
+    """
+
+    def __init__(self, scoring, windows=DEFAULT_WINDOWS):
+        self.scoring = scoring
+        self.windows = sorted(windows)
+        self.coefficients = [list(row) for row in scoring.coefficients.tolist()]
+        self.players = {}
+        self.team_games = {}
+        self.latest = None
+        self.rows = 0
+
+    def game_points(self, row):
+        stats = [float(row.get(stat) or 0) for stat in self.scoring.stats]
+        return [sum(c * v for c, v in zip(coefficients, stats)) for coefficients in self.coefficients]
+
+    def add_game(self, row):
+        """Fold one player game into the running window totals"""
+        day = game_date(row['GAME_DATE']).toordinal()
+        self.latest = day if self.latest is None else max(self.latest, day)
+        self.rows += 1
+
+        team = row['TEAM_ABBREVIATION']
+        games = self.team_games.setdefault(team, deque())
+        game_id = row.get('GAME_ID')
+        if game_id in (None, ''):
+            # Without game ids, a team's games are told apart by their day
+            game_id = day
+        if not any(gid == game_id for _, gid in games):
+            games.append((day, game_id))
+        while games and games[0][0] <= self.latest - self.windows[-1]:
+            games.popleft()
+
+        player_id = int(row['PLAYER_ID'])
+        player = self.players.get(player_id)
+        if player is None:
+            player = {'windows': [RollingWindow(days, len(self.coefficients)) for days in self.windows]}
+            self.players[player_id] = player
+        player['name'] = row['PLAYER_NAME']
+        player['team'] = team
+
+        minutes = parse_minutes(row.get('MIN'))
+        points = self.game_points(row)
+        for window in player['windows']:
+            window.add(day, minutes, points)
+            window.evict(self.latest)
+
+    def consume(self, rows):
+        """Feed an iterable of game log rows; returns the number consumed"""
+        count = 0
+        for row in rows:
+            self.add_game(row)
+            count += 1
+        return count
+
+    def frame(self, window_days, as_of=None, season=None):
+        """
+        Form metrics over the last `window_days` days up to `as_of` (default: the
+        latest game seen), one row per player with a game in the window, in the
+        same columns as the season totals so the later stages can use either.
+        Games after `as_of` must not have been fed in (see games_until).
+        """
+        import pandas as pd
+
+        if window_days not in self.windows:
+            raise ValueError(f"No {window_days}-day window (have {self.windows})")
+        slot = self.windows.index(window_days)
+        as_of = as_of.toordinal() if as_of else self.latest
+        if self.latest is not None and as_of < self.latest:
+            raise ValueError("as_of is before the latest game fed in; filter the rows with games_until")
+        start = as_of - window_days
+
+        team_games = {team: sum(1 for day, _ in games if start < day <= as_of)
+                      for team, games in self.team_games.items()}
+
+        columns = {col: [] for col in ['SEASON', 'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ABBREVIATION', 'GP',
+                                       'TEAM_GAMES', 'MIN']}
+        league_points = [[] for _ in self.scoring.leagues]
+        for player_id, player in self.players.items():
+            window = player['windows'][slot]
+            window.evict(as_of)
+            if window.count == 0:
+                continue
+            n_team_games = max(team_games.get(player['team'], 0), window.count)
+            columns['SEASON'].append(season or f'last {window_days} days')
+            columns['PLAYER_ID'].append(player_id)
+            columns['PLAYER_NAME'].append(player['name'])
+            columns['TEAM_ABBREVIATION'].append(player['team'])
+            columns['GP'].append(window.count)
+            columns['TEAM_GAMES'].append(n_team_games)
+            columns['MIN'].append(max(window.minutes, 0.0))
+            for i, total in enumerate(window.points):
+                league_points[i].append(total)
+
+        df = pd.DataFrame(columns)
+        df['PCT_GAMES_PLAYED'] = df['GP'] / df['TEAM_GAMES'] * 100
+        df['AVG_MINUTES'] = df['MIN'] / df['GP']
+        df['PCT_MINUTES_PLAYED'] = df['MIN'] / (MINUTES_PER_GAME * df['TEAM_GAMES']) * 100
+        for i, league in enumerate(self.scoring.leagues):
+            points = pd.Series(league_points[i], index=df.index, dtype='float64')
+            df[league_column('FANTASY_POINTS', league)] = points
+            df[league_column('AVG_FANTASY_PPG', league)] = points / df['GP']
+            df[league_column('FANTASY_POINTS_PER_MIN', league)] = points / df['MIN'].where(df['MIN'] > 0)
+
+        df = df.fillna(0)
+        # The default league's columns are the plain ones in FORM_COLUMNS, wherever it is in the config
+        league_cols = [league_column(base, league) for league in self.scoring.leagues if league != DEFAULT_LEAGUE
+                       for base in LEAGUE_COLUMNS]
+        df = df[FORM_COLUMNS + league_cols]
+        for col in ['MIN', 'AVG_MINUTES', 'PCT_GAMES_PLAYED', 'PCT_MINUTES_PLAYED'] + LEAGUE_COLUMNS + league_cols:
+            df[col] = df[col].round(2)
+        return df.sort_values('FANTASY_POINTS_PER_MIN', ascending=False).reset_index(drop=True)
+
+
+def fetch_game_logs(season, date_from, date_to, season_type='Regular Season', cache=None, timeout=30.0, retries=4):
+    """Fetch one season's game logs between two dates; returns the payload or None"""
+    from fetcher import fetch_all, print_fetch_report
+    from nba_api import request_headers
+
+    params = game_log_params(season, season_type, date_from, date_to)
+    results = fetch_all(GAME_LOG_URL, [params], headers=request_headers, max_workers=1,
+                        timeout=timeout, max_retries=retries, cache=cache)
+    print_fetch_report(results, label_keys=('Season', 'DateFrom', 'DateTo'))
+    if results[0]['data'] is None:
+        print(f"Error fetching game logs for {season}: {results[0]['error']}")
+        return None
+    return results[0]['data']
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Rolling-window player form from per-game box scores')
+    parser.add_argument('--season', type=str, default='2024-25', help='Season of the game logs (e.g. 2024-25)')
+    parser.add_argument('--season-type', type=str, default='Regular Season', help='Season type (Regular Season, Playoffs)')
+    parser.add_argument('--windows', type=int, nargs='+', default=DEFAULT_WINDOWS, help='Rolling windows in days')
+    parser.add_argument('--as-of', type=str, help='Last day (YYYY-MM-DD) of the windows (default: latest game in the logs)')
+    parser.add_argument('--from-csv', type=str, help='Stream game logs from this CSV file instead of stats.nba.com')
+    parser.add_argument('--cache-dir', type=str, default=DEFAULT_CACHE_DIR, help='Directory for the on-disk response cache')
+    parser.add_argument('--no-cache', action='store_true', help='Always download fresh data, bypassing the response cache')
+    parser.add_argument('--format', choices=['parquet', 'csv', 'both'], default='parquet', help='Output format for the form tables')
+    parser.add_argument('--data-dir', type=str, default=DEFAULT_DATA_DIR, help='Directory of the columnar data store')
+    parser.add_argument('--scoring-file', type=str, default=DEFAULT_SCORING_FILE, help='JSON file with the scoring systems of every league to score')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from scoring import load_scoring_systems
+    from storage import export_csv, pyarrow_available, write_table
+
+    scoring = load_scoring_systems(args.scoring_file)
+    form = RollingForm(scoring, args.windows)
+    as_of = datetime.date.fromisoformat(args.as_of) if args.as_of else None
+
+    if args.from_csv:
+        rows = iter_csv_rows(args.from_csv)
+        if as_of:
+            rows = games_until(rows, as_of)
+    else:
+        from response_cache import ResponseCache
+
+        # Only the games inside the longest window are needed
+        date_to = as_of or datetime.date.today() - datetime.timedelta(days=1)
+        date_from = date_to - datetime.timedelta(days=max(args.windows) - 1)
+        cache = None if args.no_cache else ResponseCache(args.cache_dir)
+        payload = fetch_game_logs(args.season, date_from, date_to, args.season_type, cache)
+        if payload is None:
+            return 1
+        rows = iter_payload_rows(payload)
+
+    try:
+        consumed = form.consume(rows)
+    except (KeyError, ValueError) as e:
+        print(f"Error reading game logs: {e}")
+        return 1
+    if not consumed:
+        print("No games found in the game logs.")
+        return 1
+    print(f"Streamed {consumed} player games for {len(form.players)} players")
+
+    output_format = args.format
+    if output_format != 'csv' and not pyarrow_available():
+        print("pyarrow is not installed - falling back to CSV output")
+        output_format = 'csv'
+
+    for window in form.windows:
+        df = form.frame(window, as_of, season=args.season)
+        if output_format in ('parquet', 'both'):
+            write_table(df, form_table(window), data_dir=args.data_dir)
+            print(f"{window}-day form for {len(df)} players saved to {args.data_dir}/{form_table(window)}/")
+        if output_format in ('csv', 'both'):
+            export_csv(df, form_csv(window))
+            print(f"{window}-day form for {len(df)} players saved to {form_csv(window)}")
+
+    # Show who is hot over the shortest window
+    hot = form.frame(form.windows[0], as_of)
+    hot = hot[hot['AVG_MINUTES'] >= 10]
+    print(f"\nHottest players over the last {form.windows[0]} days (fantasy points per minute):")
+    print(hot[['PLAYER_NAME', 'TEAM_ABBREVIATION', 'GP', 'AVG_MINUTES', 'FANTASY_POINTS_PER_MIN',
+               'PCT_MINUTES_PLAYED']].head(10).to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
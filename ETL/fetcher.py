@@ -0,0 +1,219 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from instrumentation import observe_request
+
+# requests is imported inside the functions that use it, so importing this module is cheap
+
+# Status codes worth retrying: throttling and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    `rate` tokens are added per second, up to `capacity` tokens.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _take(self):
+        """Consume a token if one is available (returns 0), else return the seconds until one is"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def try_acquire(self):
+        """Consume a token if one is available right now; never blocks"""
+        return self._take() == 0.0
+
+
+def create_session(headers=None, pool_size=8):
+    """Create a requests Session with a connection pool shared by all workers"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def backoff_delay(attempt, base=1.0, cap=30.0):
+    """Exponential backoff with full jitter for the given retry attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def fetch_one(session, url, params, bucket=None, timeout=10.0, max_retries=4,
+              backoff_base=1.0, backoff_cap=30.0, cache=None):
+    """
+    Fetch a single URL with rate limiting, timeout and jittered exponential backoff.
+    If a ResponseCache is given, fresh entries are served without a request and
+    stale ones are revalidated with ETag/Last-Modified.
+    Never raises - returns a result dict with the parsed JSON (or the error),
+    the final status code, the status (or exception name) of every attempt,
+    total latency and the number of retries used.
+    """
+    import requests
+
+    result = {
+        'params': params,
+        'data': None,
+        'status': None,
+        'error': None,
+        'retries': 0,
+        'attempts': [],
+        'latency': 0.0,
+        'cached': False,
+    }
+    start = time.perf_counter()
+
+    conditional_headers = {}
+    cached_payload = None
+    if cache is not None:
+        entry, cached_payload, fresh = cache.lookup(url, params)
+        if fresh:
+            result.update(data=cached_payload, status=200, cached=True,
+                          latency=time.perf_counter() - start)
+            observe_request(result)
+            return result
+        conditional_headers = cache.validators(entry)
+
+    for attempt in range(max_retries + 1):
+        if bucket is not None:
+            bucket.acquire()
+
+        retry_after = None
+        try:
+            response = session.get(url, params=params, timeout=timeout,
+                                   headers=conditional_headers or None)
+            result['status'] = response.status_code
+            result['attempts'].append(response.status_code)
+            if response.status_code == 304 and cached_payload is not None:
+                cache.touch(url, params)
+                result['data'] = cached_payload
+                result['cached'] = True
+                result['error'] = None
+                break
+            if response.status_code == 200:
+                result['data'] = response.json()
+                result['error'] = None
+                if cache is not None:
+                    cache.store(url, params, result['data'],
+                                etag=response.headers.get('ETag'),
+                                last_modified=response.headers.get('Last-Modified'))
+                break
+            result['error'] = f"HTTP {response.status_code}"
+            if response.status_code not in RETRY_STATUS_CODES:
+                break
+            retry_after = response.headers.get('Retry-After')
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+            result['attempts'].append(type(e).__name__)
+        except Exception as e:
+            # Bad JSON or anything unexpected is not worth retrying
+            result['error'] = f"{type(e).__name__}: {e}"
+            if len(result['attempts']) <= attempt:
+                result['attempts'].append(type(e).__name__)
+            break
+
+        if attempt == max_retries:
+            break
+
+        result['retries'] += 1
+        delay = backoff_delay(attempt, backoff_base, backoff_cap)
+        if retry_after is not None:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        time.sleep(delay)
+
+    result['latency'] = time.perf_counter() - start
+    observe_request(result)
+    return result
+
+
+def fetch_all(url, params_list, headers=None, max_workers=4, rate=2.0, burst=None,
+              timeout=10.0, max_retries=4, backoff_base=1.0, backoff_cap=30.0, session=None,
+              cache=None, on_result=None):
+    """
+    Fetch every params dict in `params_list` concurrently over one pooled session
+    (or `session`, which can be a recording or replay transport from transport.py).
+    Requests across all workers share a single token bucket of `rate` requests per second.
+    Pass a ResponseCache as `cache` to serve and revalidate responses from disk.
+    `on_result(index, result)` is called in the calling thread as each request
+    finishes, so results can be processed before the slowest one is back.
+    Returns the result dicts in the same order as `params_list`.
+    """
+    if session is None:
+        session = create_session(headers, pool_size=max_workers)
+    bucket = TokenBucket(rate, burst) if rate else None
+
+    results = [None] * len(params_list)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(fetch_one, session, url, params, bucket, timeout,
+                            max_retries, backoff_base, backoff_cap, cache): i
+            for i, params in enumerate(params_list)
+        }
+        try:
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index] = future.result()
+                if on_result is not None:
+                    on_result(index, results[index])
+        except BaseException:
+            # Interrupted (Ctrl-C) or the callback failed: don't start the queued requests
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+
+    return results
+
+
+def print_fetch_report(results, label_keys=('Season',)):
+    """Print per-request latency and retry counts plus a short summary"""
+    print("\nFetch report:")
+    print("---------------------------------------------------------------")
+    for result in results:
+        label = ' / '.join(str(result['params'].get(key, '')) for key in label_keys)
+        status = result['status'] if result['status'] is not None else '-'
+        line = f"{label:<30} status={status:<4} latency={result['latency']:.2f}s retries={result['retries']}"
+        if result.get('cached'):
+            line += " (cached)"
+        if result['error']:
+            line += f" error={result['error']}"
+        print(line)
+
+    if results:
+        latencies = sorted(r['latency'] for r in results)
+        failed = sum(1 for r in results if r['data'] is None)
+        print("---------------------------------------------------------------")
+        cached = sum(1 for r in results if r.get('cached'))
+        print(f"{len(results)} requests, {cached} from cache, {failed} failed, "
+              f"{sum(r['retries'] for r in results)} retries, "
+              f"median latency {latencies[len(latencies) // 2]:.2f}s, "
+              f"max latency {latencies[-1]:.2f}s")
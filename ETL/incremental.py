@@ -0,0 +1,155 @@
+import datetime
+import json
+import os
+
+from response_cache import season_is_closed
+from transform import COUNTING_COLUMNS, add_fantasy_metrics, season_games, select_fantasy_columns
+
+DEFAULT_STATE_DIR = 'incremental_state'
+
+# stats.nba.com expects dates as MM/DD/YYYY
+NBA_DATE_FORMAT = '%m/%d/%Y'
+
+
+def load_state(state_dir=DEFAULT_STATE_DIR):
+    """Load the per-season high-water-mark state"""
+    try:
+        with open(os.path.join(state_dir, 'state.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_state(state, state_dir=DEFAULT_STATE_DIR):
+    """Atomically write the per-season high-water-mark state"""
+    os.makedirs(state_dir, exist_ok=True)
+    path = os.path.join(state_dir, 'state.json')
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+# Each season's totals are written to a new file named after their high-water
+# mark, and the state records which file is current. Writing the state is the
+# single rename that commits an update: a crash before it leaves the previous
+# totals and mark in place, so the same games are fetched again, never added twice.
+
+
+def totals_path(season, high_water_mark=None, state_dir=DEFAULT_STATE_DIR):
+    name = f'totals_{season}_{high_water_mark}.csv' if high_water_mark else f'totals_{season}.csv'
+    return os.path.join(state_dir, name)
+
+
+def load_season_totals(season, state_dir=DEFAULT_STATE_DIR, state=None):
+    """Load the per-player totals the state records for a season, or None if there are none yet"""
+    import pandas as pd
+
+    if state is None:
+        state = load_state(state_dir)
+    season_state = state.get(season)
+    if season_state is None:
+        return None
+    # State written before totals files were versioned has no 'totals' entry
+    path = os.path.join(state_dir, season_state.get('totals') or os.path.basename(totals_path(season)))
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path)
+
+
+def save_season_totals(totals, season, high_water_mark, state_dir=DEFAULT_STATE_DIR):
+    """Write the totals as of `high_water_mark`; returns the file name to record in the state"""
+    os.makedirs(state_dir, exist_ok=True)
+    path = totals_path(season, high_water_mark, state_dir)
+    totals.to_csv(path + '.tmp', index=False)
+    os.replace(path + '.tmp', path)
+    return os.path.basename(path)
+
+
+def plan_season_requests(seasons, state, until, today=None):
+    """
+    Work out what each season needs. Returns a list of (season, date_params, full)
+    where `date_params` holds DateFrom/DateTo overrides. Seasons already up to date
+    (or closed and fully loaded) are left out.
+    """
+    planned = []
+    for season in seasons:
+        season_state = state.get(season)
+        if season_state is None:
+            planned.append((season, {'DateFrom': '', 'DateTo': until.strftime(NBA_DATE_FORMAT)}, True))
+            continue
+
+        high_water_mark = datetime.date.fromisoformat(season_state['high_water_mark'])
+        if season_state.get('closed') or high_water_mark >= until:
+            continue
+
+        date_from = high_water_mark + datetime.timedelta(days=1)
+        planned.append((season, {
+            'DateFrom': date_from.strftime(NBA_DATE_FORMAT),
+            'DateTo': until.strftime(NBA_DATE_FORMAT),
+        }, False))
+    return planned
+
+
+def merge_delta(totals, delta, scoring=None):
+    """
+    Add the counting stats from `delta` onto the stored `totals`, keyed by PLAYER_ID.
+    Players new to the season are appended. Returns the merged totals and the
+    PLAYER_IDs whose rows changed.
+    """
+    import pandas as pd
+
+    delta = select_fantasy_columns(delta, scoring)
+    delta = delta[delta['GP'] > 0]
+    if delta.empty:
+        return totals, []
+
+    changed_ids = delta['PLAYER_ID'].tolist()
+    totals = totals.set_index('PLAYER_ID')
+    delta = delta.set_index('PLAYER_ID')
+
+    existing = delta.index.intersection(totals.index)
+    new = delta.index.difference(totals.index)
+
+    counting = [col for col in COUNTING_COLUMNS if col in delta.columns]
+    if scoring is not None:
+        counting += [stat for stat in scoring.stats if stat in delta.columns and stat not in counting]
+    totals.loc[existing, counting] = totals.loc[existing, counting].add(delta.loc[existing, counting])
+    # Names and teams follow the latest data (trades, name corrections)
+    totals.loc[existing, ['PLAYER_NAME', 'TEAM_ABBREVIATION']] = delta.loc[existing, ['PLAYER_NAME', 'TEAM_ABBREVIATION']]
+
+    if len(new):
+        totals = pd.concat([totals, delta.loc[new]])
+
+    return totals.reset_index(), changed_ids
+
+
+def apply_season_update(season, raw_df, until, full, state, state_dir=DEFAULT_STATE_DIR, today=None,
+                        scoring=None):
+    """
+    Fold one fetched season (full pull or date-range delta) into the stored totals
+    and advance its high-water mark. The derived columns are recomputed for every
+    player, so a change to the scoring applies to players without new games too.
+    Returns (totals, number of changed players).
+    """
+    if full:
+        totals = raw_df
+        changed = len(totals)
+    else:
+        totals = load_season_totals(season, state_dir, state)
+        totals, changed_ids = merge_delta(totals, raw_df, scoring)
+        changed = len(changed_ids)
+    totals = add_fantasy_metrics(select_fantasy_columns(totals, scoring), scoring, season_games(season))
+
+    previous = (state.get(season) or {}).get('totals') or os.path.basename(totals_path(season))
+    current = save_season_totals(totals, season, until.isoformat(), state_dir)
+    state[season] = {
+        'high_water_mark': until.isoformat(),
+        'totals': current,
+        # Closed only once the loaded games reach the season's end, not just because it is over by now
+        'closed': season_is_closed(season, min(until, today or datetime.date.today())),
+        'updated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+    }
+    save_state(state, state_dir)
+    if previous != current and os.path.exists(os.path.join(state_dir, previous)):
+        os.remove(os.path.join(state_dir, previous))
+    return totals, changed
@@ -0,0 +1,289 @@
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import platform
+import datetime
+import functools
+import threading
+from contextlib import contextmanager
+
+# Run metrics for the command line tools. A run (one command) is made of stages
+# (fetch, transform, weights, ...), each timed for wall and CPU time, the process's
+# peak memory and the rows going in and out. HTTP requests made by fetcher.py are
+# added to the run as they finish: latency histogram, status codes and retries.
+# At the end of the run one JSON record is appended to a JSONL file. With
+# --profile, chosen stages also run under cProfile and tracemalloc and their
+# profiles are written next to the metrics.
+DEFAULT_METRICS_FILE = 'run_metrics.jsonl'
+DEFAULT_PROFILE_DIR = 'profiles'
+
+# Upper bounds (seconds) of the HTTP latency histogram buckets; the last one is open
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+# Lines of the cProfile and tracemalloc summaries
+PROFILE_TOP = 30
+
+_active_run = None
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far (None where the resource module is missing)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return round(peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def row_count(value):
+    """Rows of a DataFrame, list or other sized output (None when it has no length)"""
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+class StageMetrics:
+    """Measurements of one stage; set `rows_out` (and `rows_in`) from inside the stage"""
+
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_rss_mb = None
+        self.rss_growth_mb = None
+        self.traced_peak_mb = None
+        self.error = None
+
+    def record(self):
+        record = {key: value for key, value in vars(self).items() if value is not None}
+        record['wall_seconds'] = round(self.wall_seconds, 6)
+        record['cpu_seconds'] = round(self.cpu_seconds, 6)
+        return record
+
+
+class HttpMetrics:
+    """Latency histogram, status codes (every attempt) and retries of the run's requests"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.statuses = {}
+        self.requests = 0
+        self.failed = 0
+        self.cached = 0
+        self.retries = 0
+
+    def observe(self, result):
+        with self.lock:
+            self.requests += 1
+            self.latencies.append(result['latency'])
+            self.retries += result.get('retries', 0)
+            self.cached += bool(result.get('cached'))
+            self.failed += result.get('data') is None
+            attempts = result.get('attempts') or [result.get('status')]
+            for status in attempts:
+                key = str(status if status is not None else 'none')
+                self.statuses[key] = self.statuses.get(key, 0) + 1
+
+    def record(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            histogram = {f'<={bound}s': 0 for bound in LATENCY_BUCKETS}
+            histogram[f'>{LATENCY_BUCKETS[-1]}s'] = 0
+            for latency in latencies:
+                bound = next((b for b in LATENCY_BUCKETS if latency <= b), None)
+                histogram[f'<={bound}s' if bound is not None else f'>{LATENCY_BUCKETS[-1]}s'] += 1
+            record = {'requests': self.requests, 'failed': self.failed, 'cached': self.cached,
+                      'retries': self.retries, 'statuses': dict(self.statuses), 'latency_histogram': histogram}
+            if latencies:
+                record['latency_seconds'] = {
+                    'p50': round(latencies[len(latencies) // 2], 4),
+                    'p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 4),
+                    'max': round(latencies[-1], 4),
+                }
+            return record
+
+
+class RunMetrics:
+    """
+    Metrics of one command run. `profile` is None (no profiling), an empty list
+    (profile every stage) or the names of the stages to profile.
+    """
+
+    def __init__(self, command, argv=None, metrics_file=DEFAULT_METRICS_FILE, profile=None,
+                 profile_dir=DEFAULT_PROFILE_DIR):
+        self.command = command
+        self.argv = list(argv or [])
+        self.metrics_file = metrics_file
+        self.profile = profile
+        self.run_id = datetime.datetime.now().strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+        self.profile_dir = os.path.join(profile_dir, self.run_id)
+        self.started = datetime.datetime.now().isoformat(timespec='seconds')
+        self.stages = []
+        self.http = HttpMetrics()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def profiles_stage(self, name):
+        return self.profile is not None and (not self.profile or name in self.profile)
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        metrics = StageMetrics(name, rows_in)
+        profiler = None
+        if self.profiles_stage(name):
+            import cProfile
+            import tracemalloc
+            tracemalloc.start(10)
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        rss_before = peak_rss_mb()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield metrics
+        except BaseException as e:
+            metrics.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            metrics.wall_seconds = time.perf_counter() - wall
+            metrics.cpu_seconds = time.process_time() - cpu
+            if profiler is not None:
+                profiler.disable()
+                metrics.traced_peak_mb = self._write_profile(name, profiler)
+            metrics.peak_rss_mb = peak_rss_mb()
+            if rss_before is not None:
+                metrics.rss_growth_mb = round(metrics.peak_rss_mb - rss_before, 1)
+            self.stages.append(metrics)
+
+    def _write_profile(self, name, profiler):
+        """Write <stage>.prof (for pstats/snakeviz) and a text summary; returns the traced peak in MB"""
+        import io
+        import pstats
+        import tracemalloc
+
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        base = os.path.join(self.profile_dir, name)
+        profiler.dump_stats(base + '.prof')
+        text = io.StringIO()
+        text.write(f"Stage {name} of {self.command} run {self.run_id}\n\n")
+        pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(PROFILE_TOP)
+        text.write(f"\nPeak traced memory: {peak / 1024 ** 2:.1f} MB\nLargest allocations still held:\n")
+        for stat in snapshot.statistics('lineno')[:PROFILE_TOP]:
+            text.write(f"  {stat}\n")
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(text.getvalue())
+        return round(peak / 1024 ** 2, 1)
+
+    def record(self, status):
+        record = {
+            'run_id': self.run_id,
+            'command': self.command,
+            'argv': self.argv,
+            'started': self.started,
+            'status': status,
+            'wall_seconds': round(time.perf_counter() - self._wall, 6),
+            'cpu_seconds': round(time.process_time() - self._cpu, 6),
+            'peak_rss_mb': peak_rss_mb(),
+            'python': platform.python_version(),
+            'stages': [stage.record() for stage in self.stages],
+        }
+        if self.http.requests:
+            record['http'] = self.http.record()
+        if self.profile is not None:
+            record['profile_dir'] = self.profile_dir
+        return record
+
+    def write(self, status):
+        """Append this run's record to the metrics file"""
+        directory = os.path.dirname(self.metrics_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.metrics_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.record(status)) + '\n')
+
+
+@contextmanager
+def stage(name, rows_in=None):
+    """Measure a stage of the active run (only timed when there is none)"""
+    run = _active_run
+    if run is None:
+        metrics = StageMetrics(name, rows_in)
+        start = time.perf_counter()
+        try:
+            yield metrics
+        finally:
+            metrics.wall_seconds = time.perf_counter() - start
+        return
+    with run.stage(name, rows_in) as metrics:
+        yield metrics
+
+
+def observe_request(result):
+    """Add a finished fetcher request to the active run, if any (called from worker threads)"""
+    run = _active_run
+    if run is not None:
+        run.http.observe(result)
+
+
+def add_arguments(parser):
+    """The instrumentation options, so a script's --help lists them"""
+    group = parser.add_argument_group('run metrics')
+    group.add_argument('--metrics-file', default=DEFAULT_METRICS_FILE,
+                       help='JSONL file that gets one metrics record per run')
+    group.add_argument('--no-metrics', action='store_true', help="Don't write a metrics record")
+    group.add_argument('--profile', nargs='*', metavar='STAGE',
+                       help='Run these stages (all if none are named) under cProfile and tracemalloc')
+    group.add_argument('--profile-dir', default=DEFAULT_PROFILE_DIR, help='Directory of the --profile output')
+    return parser
+
+
+def instrumented(command):
+    """
+    Decorator for a script's main(argv): strips the instrumentation options from
+    argv, runs main as an instrumented run and appends its metrics record.
+    """
+    def decorate(main):
+        @functools.wraps(main)
+        def wrapper(argv=None):
+            global _active_run
+
+            argv = sys.argv[1:] if argv is None else list(argv)
+            if '-h' in argv or '--help' in argv:
+                return main(argv)
+            parser = add_arguments(argparse.ArgumentParser(add_help=False, allow_abbrev=False))
+            options, rest = parser.parse_known_args(argv)
+
+            run = RunMetrics(command, rest, options.metrics_file, options.profile, options.profile_dir)
+            previous, _active_run = _active_run, run
+            status = 'error'
+            try:
+                result = main(rest)
+                status = result if result is not None else 0
+                return result
+            except SystemExit as e:
+                status = e.code if isinstance(e.code, int) else 1
+                raise
+            finally:
+                _active_run = previous
+                if not options.no_metrics:
+                    try:
+                        run.write(status)
+                        print(f"\nRun metrics appended to {options.metrics_file}"
+                              + (f" (profiles in {run.profile_dir})" if options.profile is not None else ''))
+                    except OSError as e:
+                        print(f"Warning: could not write run metrics: {e}")
+        return wrapper
+    return decorate
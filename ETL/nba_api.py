@@ -1,87 +1,72 @@
-import requests
-import json
-import pandas as pd
-import time
 import os
 import sys
-import gspread
-from google.oauth2.service_account import Credentials
-from gspread_dataframe import set_with_dataframe
+import datetime
 import argparse
+from response_cache import DEFAULT_CACHE_DIR
+from storage import DEFAULT_DATA_DIR, STATS_TABLE
+from scoring import DEFAULT_SCORING_FILE
+from incremental import DEFAULT_STATE_DIR
+from instrumentation import add_arguments, instrumented, stage
 
-# Parse command line arguments
-parser = argparse.ArgumentParser(description='NBA Fantasy Basketball Data Tool')
-parser.add_argument('--sheets', action='store_true', help='Upload data directly to Google Sheets')
-parser.add_argument('--worksheet', type=str, default='NBA_Fantasy_Data', help='Name of the worksheet for Google Sheets upload')
-parser.add_argument('--no-csv', action='store_true', help='Skip saving data to CSV file')
-args = parser.parse_args()
+# pandas, requests and the Google Sheets libraries are imported by the functions
+# that need them, so importing this module (or running --help) stays fast.
 
 # Google Sheet configuration
 SHEET_ID = '1NythdZUtn3IK9897ig8zGIXpA446z1rSMIUhemY6dhs'
 CREDENTIALS_FILE = 'service_account.json'
 
-def upload_df_to_google_sheets(df, worksheet_name=None):
-    """Upload a dataframe directly to Google Sheets"""
+DEFAULT_SEASONS = ["2023-24", "2024-25"]
+
+def upload_df_to_google_sheets(df, worksheet_name=None, full=False, local_path=None):
+    """
+    Sync a dataframe to Google Sheets. Only the cells that changed since the last
+    upload are sent (everything with `full`); with `local_path` the sheet is a
+    local JSON file instead, for offline runs.
+    """
+    from sheets_sync import GspreadBackend, LocalSheetBackend, sync_dataframe
+
     print("\nUploading data to Google Sheets...")
     
-    # Check if credentials file exists
-    if not os.path.exists(CREDENTIALS_FILE):
-        print(f"Error: Credentials file '{CREDENTIALS_FILE}' not found in current directory.")
-        print(f"Make sure 'service_account.json' is in: {os.getcwd()}")
-        return False
-    
-    # Define the required scopes
-    scopes = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive'
-    ]
-    
     # Get worksheet name if not provided
     if worksheet_name is None:
         worksheet_name = input("Enter worksheet name (or press Enter for default 'NBA_Fantasy_Data'): ")
         if not worksheet_name.strip():
             worksheet_name = "NBA_Fantasy_Data"
     
-    try:
-        # Authenticate using the service account credentials
-        credentials = Credentials.from_service_account_file(
-            CREDENTIALS_FILE, 
-            scopes=scopes
-        )
-        
-        # Create a client to interact with Google Sheets API
-        client = gspread.authorize(credentials)
-        
-        # Open the spreadsheet by its ID
-        spreadsheet = client.open_by_key(SHEET_ID)
-        print(f"Successfully connected to spreadsheet: {spreadsheet.title}")
-        
-        # Try to find existing worksheet or create new one
+    if local_path:
+        backend = LocalSheetBackend(f'local_{worksheet_name}', path=local_path)
+    else:
+        # The Google client libraries are only needed (and imported) for uploads
         try:
-            worksheet = spreadsheet.worksheet(worksheet_name)
-            print(f"Using existing worksheet: {worksheet_name}")
-            # Clear existing content
-            worksheet.clear()
-        except gspread.exceptions.WorksheetNotFound:
-            # Create new worksheet
-            worksheet = spreadsheet.add_worksheet(
-                title=worksheet_name, 
-                rows=max(100, len(df) + 10), 
-                cols=max(20, len(df.columns) + 5)
-            )
-            print(f"Created new worksheet: {worksheet_name}")
+            import gspread  # noqa: F401
+            import google.oauth2.service_account  # noqa: F401
+        except ImportError as e:
+            print(f"Error: Google Sheets upload needs gspread and google-auth ({e})")
+            print("Install them with: pip install -r sheets_requirements.txt")
+            return False
         
-        # Upload the data
-        set_with_dataframe(
-            worksheet=worksheet,
-            dataframe=df,
-            include_index=False,
-            include_column_header=True,
-            resize=True
-        )
+        # Check if credentials file exists
+        if not os.path.exists(CREDENTIALS_FILE):
+            print(f"Error: Credentials file '{CREDENTIALS_FILE}' not found in current directory.")
+            print(f"Make sure 'service_account.json' is in: {os.getcwd()}")
+            return False
+    
+    try:
+        if not local_path:
+            backend = GspreadBackend(SHEET_ID, CREDENTIALS_FILE, worksheet_name)
+            print(f"Successfully connected to spreadsheet: {backend.spreadsheet.title}")
+            print(f"{'Created new' if backend.created else 'Using existing'} worksheet: {worksheet_name}")
         
-        print(f"Successfully uploaded data to worksheet '{worksheet_name}'")
-        print(f"Access your data at: https://docs.google.com/spreadsheets/d/{SHEET_ID}/edit#gid={worksheet.id}")
+        # Send only the changed ranges, in batched calls
+        summary = sync_dataframe(df, backend, full=full)
+        if summary['cells'] == 0:
+            print(f"Worksheet '{worksheet_name}' is already up to date")
+        else:
+            print(f"Successfully synced worksheet '{worksheet_name}': {summary['cells']} cells in "
+                  f"{summary['ranges']} ranges, {summary['requests']} requests"
+                  + (" (full upload)" if summary['full'] else ""))
+        if not local_path:
+            print(f"Access your data at: https://docs.google.com/spreadsheets/d/{SHEET_ID}/edit#gid={backend.worksheet.id}")
         
         return True
         
@@ -89,7 +74,8 @@ def upload_df_to_google_sheets(df, worksheet_name=None):
         print(f"Error uploading to Google Sheets: {e}")
         return False
 
-url = "https://stats.nba.com/stats/leaguedashplayerstats"
+STATS_BASE_URL = "https://stats.nba.com"
+url = STATS_BASE_URL + "/stats/leaguedashplayerstats"
 params = {
     "College": "",
     "Conference": "",
@@ -136,129 +122,212 @@ request_headers = {
     "Referer": "https://www.nba.com/"
 }
 
-# List of seasons to fetch
-seasons = ["2023-24", "2024-25"]
 
-all_data = []
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='NBA Fantasy Basketball Data Tool')
+    parser.add_argument('--sheets', action='store_true', help='Upload data directly to Google Sheets')
+    parser.add_argument('--worksheet', type=str, default='NBA_Fantasy_Data', help='Name of the worksheet for Google Sheets upload')
+    parser.add_argument('--sheets-full', action='store_true', help='Re-send every cell instead of only the changes since the last upload')
+    parser.add_argument('--sheets-local', type=str, help='Sync to this local JSON file instead of Google Sheets (offline testing)')
+    parser.add_argument('--no-csv', action='store_true', help='Skip saving data to CSV file')
+    parser.add_argument('--seasons', nargs='+', default=DEFAULT_SEASONS, help='Seasons to fetch (e.g. 2023-24 2024-25)')
+    parser.add_argument('--workers', type=int, default=4, help='Number of concurrent fetch workers')
+    parser.add_argument('--rate', type=float, default=2.0, help='Maximum requests per second across all workers')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Per-request timeout in seconds')
+    parser.add_argument('--retries', type=int, default=4, help='Maximum retries per request on throttling or transient errors')
+    parser.add_argument('--cache-dir', type=str, default=DEFAULT_CACHE_DIR, help='Directory for the on-disk response cache')
+    parser.add_argument('--cache-ttl', type=float, default=15, help='Minutes before the current season\'s cached data is revalidated')
+    parser.add_argument('--cache-max-mb', type=float, default=200, help='Maximum size of the response cache in MB')
+    parser.add_argument('--no-cache', action='store_true', help='Always download fresh data, bypassing the response cache')
+    parser.add_argument('--incremental', action='store_true', help='Only fetch games since the last run and merge them into stored season totals')
+    parser.add_argument('--state-dir', type=str, default=DEFAULT_STATE_DIR, help='Directory for incremental high-water marks and season totals')
+    parser.add_argument('--until', type=str, help='Last game date (YYYY-MM-DD) to include in an incremental run (default: yesterday)')
+    parser.add_argument('--format', choices=['parquet', 'csv', 'both'], default='parquet', help='Output format: the Parquet data store, the legacy CSV file, or both. '
+                        'csv also deletes the stats table from the data store, so later stages read the new CSV')
+    parser.add_argument('--data-dir', type=str, default=DEFAULT_DATA_DIR, help='Directory of the columnar data store')
+    parser.add_argument('--scoring-file', type=str, default=DEFAULT_SCORING_FILE, help='JSON file with the scoring systems of every league to score')
+    parser.add_argument('--base-url', type=str, default=STATS_BASE_URL, help='Stats server to fetch from (e.g. a local benchmarks/stub_server.py)')
+    transport = parser.add_mutually_exclusive_group()
+    transport.add_argument('--record', type=str, metavar='DIR', help='Save every response to DIR for later --replay')
+    transport.add_argument('--replay', type=str, metavar='DIR', help='Answer requests from the responses recorded in DIR, offline')
+    add_arguments(parser)
+    return parser.parse_args(argv)
 
-for season in seasons:
-    params["Season"] = season
-    try:
-        response = requests.get(url, headers=request_headers, params=params)
-        
-        if response.status_code == 200:
-            data = response.json()
-            results = data['resultSets'][0]
-            column_headers = results['headers']
-            rows = results['rowSet']
-            df = pd.DataFrame(rows, columns=column_headers)
-            
-            # Add a SEASON column to track which season the data belongs to
-            df['SEASON'] = season
-            
-            all_data.append(df)
+
+def fetch_season_payloads(params_list, workers=4, rate=2.0, timeout=10.0, retries=4, cache=None,
+                          transport=None, base_url=None):
+    """
+    Fetch leaguedashplayerstats for every params dict concurrently; returns fetcher result dicts.
+    `transport` (see transport.py) replaces the default pooled session and
+    `base_url` the stats.nba.com host.
+    """
+    from fetcher import fetch_all
+    from transport import stats_url
+
+    endpoint_url = stats_url(base_url, 'leaguedashplayerstats') if base_url else url
+    return fetch_all(endpoint_url, params_list, headers=request_headers, max_workers=workers,
+                     rate=rate, timeout=timeout, max_retries=retries, cache=cache, session=transport)
+
+
+def fetch_seasons(seasons=DEFAULT_SEASONS, workers=4, rate=2.0, timeout=10.0, retries=4, cache=None,
+                  report=True, transport=None, base_url=None):
+    """
+    Fetch the raw season totals for `seasons` and return them as one DataFrame
+    with a SEASON column (None if nothing could be fetched).
+    """
+    import pandas as pd
+    from fetcher import print_fetch_report
+    from transform import payload_to_dataframe
+
+    params_list = [dict(params, Season=season) for season in seasons]
+    results = fetch_season_payloads(params_list, workers, rate, timeout, retries, cache, transport, base_url)
+
+    all_data = []
+    missing = []
+    for season, result in zip(seasons, results):
+        if result['data'] is None:
+            print(f"Error fetching data for season {season}: {result['error']}")
+            missing.append(season)
+            continue
+        try:
+            all_data.append(payload_to_dataframe(result['data'], season))
             print(f"Successfully fetched data for season {season}")
+        except Exception as e:
+            print(f"An error occurred while processing data for season {season}: {str(e)}")
+            missing.append(season)
+
+    if report:
+        print_fetch_report(results)
+    if missing:
+        print(f"\nWarning: the output is missing seasons {', '.join(missing)}. "
+              f"backfill.py fetches season ranges resumably, one partition per season.")
+    if not all_data:
+        return None
+    return pd.concat(all_data, ignore_index=True)
+
+
+def fetch_incremental(seasons, scoring, until=None, state_dir=DEFAULT_STATE_DIR, workers=4, rate=2.0,
+                      timeout=10.0, retries=4, cache=None, report=True, transport=None, base_url=None):
+    """
+    Fetch only the games since each season's high-water mark, merge them into the
+    stored season totals and return the up-to-date totals for all `seasons`.
+    """
+    import pandas as pd
+    from fetcher import print_fetch_report
+    from transform import payload_to_dataframe
+    from incremental import load_state, plan_season_requests, apply_season_update, load_season_totals
+
+    # Only fetch the games since each season's high-water mark
+    until = until or datetime.date.today() - datetime.timedelta(days=1)
+    state = load_state(state_dir)
+    planned = plan_season_requests(seasons, state, until)
+    params_list = [dict(params, Season=season, **date_params) for season, date_params, _ in planned]
+    results = fetch_season_payloads(params_list, workers, rate, timeout, retries, cache, transport, base_url)
+
+    for (season, date_params, full), result in zip(planned, results):
+        if result['data'] is None:
+            print(f"Error fetching data for season {season}: {result['error']}")
+            continue
+        try:
+            df = payload_to_dataframe(result['data'], season)
+            _, changed = apply_season_update(season, df, until, full, state, state_dir, scoring=scoring)
+            mode = "full pull" if full else f"{date_params['DateFrom']} - {date_params['DateTo']}"
+            print(f"Updated season {season} ({mode}): {changed} players changed")
+        except Exception as e:
+            print(f"An error occurred while processing data for season {season}: {str(e)}")
+
+    if report:
+        print_fetch_report(results)
+
+    # Rebuild the output from the stored per-season totals
+    all_data = []
+    for season in seasons:
+        totals = load_season_totals(season, state_dir, state)
+        if totals is not None:
+            totals['SEASON'] = season
+            all_data.append(totals)
+    if not all_data:
+        return None
+    return pd.concat(all_data, ignore_index=True)
+
+
+def save_fantasy_data(fantasy_df, output_format='parquet', data_dir=DEFAULT_DATA_DIR, csv_path='nba_fantasy_stats_new.csv'):
+    """Save the fantasy dataset to the season-partitioned data store and/or CSV"""
+    from storage import drop_table, write_table, export_csv, pyarrow_available
+
+    # Save to the season-partitioned data store
+    if output_format != 'csv' and not pyarrow_available():
+        print("pyarrow is not installed - falling back to CSV output")
+        output_format = 'csv'
+    if output_format in ('parquet', 'both'):
+        write_table(fantasy_df, STATS_TABLE, data_dir=data_dir, partition_by='SEASON')
+        print(f"Fantasy data saved to {data_dir}/{STATS_TABLE}/ (partitioned by season)")
+    else:
+        # Readers prefer the store, so a store from an earlier run would shadow this CSV
+        drop_table(STATS_TABLE, data_dir)
+
+    if output_format in ('csv', 'both') and csv_path:
+        export_csv(fantasy_df, csv_path)
+        print(f"Fantasy data saved to {csv_path}")
+
+
+@instrumented('fetch')
+def main(argv=None):
+    args = parse_args(argv)
+
+    from response_cache import ResponseCache
+    from scoring import load_scoring_systems
+    from transform import transform, finalize_fantasy_df
+    from transport import make_transport
+
+    # Every league's scoring is applied in one batched pass
+    scoring = load_scoring_systems(args.scoring_file)
+    print(f"Scoring leagues: {', '.join(scoring.leagues)}")
+
+    # Closed seasons are served from the response cache; the current season is revalidated.
+    # Recording and replaying bypass it, so every request goes through the transport.
+    cache = None
+    if not (args.no_cache or args.record or args.replay):
+        cache = ResponseCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 1024 * 1024),
+                              current_ttl=args.cache_ttl * 60)
+
+    try:
+        transport = make_transport(request_headers, args.workers, args.record, args.replay)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return 1
+    if args.record:
+        print(f"Recording responses to {args.record}")
+    if args.replay:
+        print(f"Replaying responses recorded in {args.replay}")
+
+    fetch_options = dict(workers=args.workers, rate=args.rate, timeout=args.timeout,
+                         retries=args.retries, cache=cache, transport=transport,
+                         base_url=args.base_url)
+    with stage('fetch') as metrics:
+        if args.incremental:
+            until = datetime.date.fromisoformat(args.until) if args.until else None
+            final_df = fetch_incremental(args.seasons, scoring, until, args.state_dir, **fetch_options)
         else:
-            print(f"Error fetching data for season {season}: {response.status_code}")
-    except Exception as e:
-        print(f"An error occurred while fetching data for season {season}: {str(e)}")
+            final_df = fetch_seasons(args.seasons, **fetch_options)
+        metrics.rows_out = len(final_df) if final_df is not None else 0
+
+    # Only continue if we have data
+    if final_df is None:
+        print("No data was fetched. Cannot create DataFrame.")
+        return 1
 
-# Concatenate all data into a single DataFrame if we have data
-if all_data:
     try:
-        final_df = pd.concat(all_data, ignore_index=True)
         print(f"Combined data: {len(final_df)} rows")
         
-        # Only keep columns directly related to fantasy scoring
-        # Player identification columns
-        id_columns = ['SEASON', 'PLAYER_NAME', 'TEAM_ABBREVIATION', 'GP', 'MIN']
-        
-        # Stats that contribute to fantasy scoring
-        stat_columns = [
-            'FGM', 'FGA',      # Field goals: +1 for makes, -1 for attempts
-            'FTM', 'FTA',      # Free throws: +1 for makes, -1 for attempts
-            'FG3M',            # Three pointers: +1
-            'OREB',            # Offensive rebounds: +0.5
-            'REB',             # Total rebounds: +1
-            'AST',             # Assists: +1
-            'STL',             # Steals: +1.5
-            'BLK',             # Blocks: +1.5
-            'TOV',             # Turnovers: -1
-            'PF',              # Personal fouls: -1
-            'PTS'              # Points: +1
-        ]
-        
-        # Select only columns that exist in the data
-        existing_id_columns = [col for col in id_columns if col in final_df.columns]
-        existing_stat_columns = [col for col in stat_columns if col in final_df.columns]
-        
-        fantasy_df = final_df[existing_id_columns + existing_stat_columns].copy()
-        
-        # Calculate fantasy points based on the scoring system
-        fantasy_df['FANTASY_POINTS'] = (
-            fantasy_df['FGM'] * 1 +
-            fantasy_df['FGA'] * -1 + 
-            fantasy_df['FTM'] * 1 +
-            fantasy_df['FTA'] * -1 + 
-            fantasy_df['FG3M'] * 1 +
-            fantasy_df['OREB'] * 0.5 +
-            fantasy_df['REB'] * 1 +
-            fantasy_df['AST'] * 1 +
-            fantasy_df['STL'] * 1.5 +
-            fantasy_df['BLK'] * 1.5 +
-            fantasy_df['TOV'] * -1 +
-            fantasy_df['PF'] * -1 +
-            fantasy_df['PTS'] * 1
-        )
-            
-        # Calculate additional metrics
-        fantasy_df['AVG_FANTASY_PPG'] = fantasy_df['FANTASY_POINTS'] / fantasy_df['GP']
-        
-        # Assuming 82 games in a season for NBA
-        total_games_in_season = 82
-        
-        # Calculate percentage of games played - a critical metric for fantasy value
-        # This indicates a player's durability and availability throughout the season
-        fantasy_df['PCT_GAMES_PLAYED'] = (fantasy_df['GP'] / total_games_in_season) * 100
-        
-        # Add minutes stats
-        fantasy_df['AVG_MINUTES'] = fantasy_df['MIN'] / fantasy_df['GP']
-        
-        # Assuming 48 minutes per game times 82 games
-        total_minutes_possible = 48 * total_games_in_season
-        fantasy_df['PCT_MINUTES_PLAYED'] = (fantasy_df['MIN'] / total_minutes_possible) * 100
-        
-        # Calculate fantasy points per minute
-        fantasy_df['FANTASY_POINTS_PER_MIN'] = fantasy_df['FANTASY_POINTS'] / fantasy_df['MIN']
-        
-        # Replace any NaN values with 0
-        fantasy_df = fantasy_df.fillna(0)
-        
-        # Round decimal values for readability
-        for col in ['FANTASY_POINTS', 'AVG_FANTASY_PPG', 'PCT_GAMES_PLAYED', 
-                   'AVG_MINUTES', 'PCT_MINUTES_PLAYED', 'FANTASY_POINTS_PER_MIN']:
-            if col in fantasy_df.columns:
-                fantasy_df[col] = fantasy_df[col].round(2)
-        
-        # Sort by fantasy points in descending order
-        fantasy_df = fantasy_df.sort_values('FANTASY_POINTS', ascending=False)
-        
-        # Final columns in the desired order
-        final_columns = [
-            # Player info
-            'SEASON', 'PLAYER_NAME', 'TEAM_ABBREVIATION', 
-            # Game stats
-            'GP', 'PCT_GAMES_PLAYED', 'MIN', 'AVG_MINUTES', 'PCT_MINUTES_PLAYED',
-            # Fantasy metrics
-            'FANTASY_POINTS', 'AVG_FANTASY_PPG', 'FANTASY_POINTS_PER_MIN',
-            # Box score stats that contribute to fantasy
-            'PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF',
-            'FGM', 'FGA', 'FTM', 'FTA', 'FG3M', 'OREB'
-        ]
-        
-        # Only keep columns that exist
-        final_columns = [col for col in final_columns if col in fantasy_df.columns]
-        fantasy_df = fantasy_df[final_columns]
+        with stage('transform', rows_in=len(final_df)) as metrics:
+            if args.incremental:
+                # Derived columns are already up to date in the stored totals
+                fantasy_df = finalize_fantasy_df(final_df)
+            else:
+                fantasy_df = transform(final_df, scoring)
+            metrics.rows_out = len(fantasy_df)
         
         print(f"Fantasy data prepared: {len(fantasy_df)} players")
         print("Columns in final dataset:")
@@ -272,20 +341,26 @@ if all_data:
         print(f"2. PCT_MINUTES_PLAYED: Shows what percentage of total possible minutes a player played")
         print(f"3. FANTASY_POINTS_PER_MIN: Shows efficiency when on the court")
         
-        # Save to CSV (unless --no-csv flag is used)
-        if not args.no_csv:
-            fantasy_df.to_csv('nba_fantasy_stats_new.csv', index=False)
-            print("Fantasy data saved to nba_fantasy_stats_new.csv")
+        # Save to the data store and CSV (unless --no-csv flag is used)
+        with stage('save', rows_in=len(fantasy_df)):
+            save_fantasy_data(fantasy_df, args.format, args.data_dir,
+                              csv_path=None if args.no_csv else 'nba_fantasy_stats_new.csv')
         
         # Upload to Google Sheets if requested via command line or prompt user
-        if args.sheets:
-            upload_df_to_google_sheets(fantasy_df, args.worksheet)
-        else:
+        if args.sheets or args.sheets_local:
+            with stage('sheets', rows_in=len(fantasy_df)):
+                upload_df_to_google_sheets(fantasy_df, args.worksheet, args.sheets_full, args.sheets_local)
+        elif sys.stdin.isatty():
             upload_to_sheets = input("\nDo you want to upload this data to Google Sheets? (y/n): ").lower() == 'y'
             if upload_to_sheets:
-                upload_df_to_google_sheets(fantasy_df)
+                with stage('sheets', rows_in=len(fantasy_df)):
+                    upload_df_to_google_sheets(fantasy_df)
             
     except Exception as e:
         print(f"Error while processing data: {str(e)}")
-else:
-    print("No data was fetched. Cannot create DataFrame.") 
\ No newline at end of file
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
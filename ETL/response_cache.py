@@ -0,0 +1,171 @@
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_CACHE_DIR = '.nba_cache'
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+# How long the in-progress season stays fresh before we revalidate (seconds)
+DEFAULT_CURRENT_SEASON_TTL = 15 * 60
+
+
+def normalize_params(params):
+    """Normalize a params dict so equivalent requests produce the same cache key"""
+    return sorted((str(key), '' if value is None else str(value)) for key, value in params.items())
+
+
+def cache_key(endpoint, params):
+    """Stable cache key for an endpoint plus its normalized params"""
+    raw = json.dumps([endpoint, normalize_params(params)], separators=(',', ':'))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def season_is_closed(season, today=None):
+    """
+    A season such as '2023-24' is closed once the following July has started,
+    after which its stats no longer change.
+    """
+    today = today or datetime.date.today()
+    try:
+        end_year = int(season[:4]) + 1
+    except (TypeError, ValueError):
+        return False
+    return today >= datetime.date(end_year, 7, 1)
+
+
+def season_ttl(params, current_ttl=DEFAULT_CURRENT_SEASON_TTL, today=None):
+    """TTL in seconds for a request: None (never expires) for closed seasons"""
+    season = params.get('Season')
+    if season and season_is_closed(season, today):
+        return None
+    return current_ttl
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache of JSON responses.
+    Payloads live in one file per key; an index file keeps the TTL, the
+    ETag/Last-Modified validators and LRU bookkeeping. The cache is
+    bounded by `max_bytes` and evicts the least recently used entries.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                 current_ttl=DEFAULT_CURRENT_SEASON_TTL):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.current_ttl = current_ttl
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_index(self):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _payload_path(self, key):
+        return os.path.join(self.cache_dir, key + '.json')
+
+    def lookup(self, endpoint, params):
+        """
+        Return (entry, payload, fresh) for a request, or (None, None, False) on a miss.
+        A stale entry is still returned so the caller can revalidate it.
+        """
+        key = cache_key(endpoint, params)
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is None:
+                return None, None, False
+            try:
+                with open(self._payload_path(key), 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+            except (FileNotFoundError, ValueError):
+                del self.index[key]
+                self._save_index()
+                return None, None, False
+
+            entry['last_access'] = time.time()
+            self._save_index()
+
+        ttl = entry.get('ttl')
+        fresh = ttl is None or (time.time() - entry['fetched_at']) < ttl
+        return entry, payload, fresh
+
+    def validators(self, entry):
+        """Conditional request headers for revalidating a stale entry"""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, endpoint, params, payload, etag=None, last_modified=None):
+        """Store a payload with its validators, then evict down to the size bound"""
+        key = cache_key(endpoint, params)
+        data = json.dumps(payload, separators=(',', ':'))
+        with self.lock:
+            tmp_path = self._payload_path(key) + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self._payload_path(key))
+
+            now = time.time()
+            self.index[key] = {
+                'endpoint': endpoint,
+                'season': params.get('Season'),
+                'ttl': season_ttl(params, self.current_ttl),
+                'fetched_at': now,
+                'last_access': now,
+                'etag': etag,
+                'last_modified': last_modified,
+                'size': len(data.encode('utf-8')),
+            }
+            self._evict()
+            self._save_index()
+
+    def touch(self, endpoint, params):
+        """Mark an entry as freshly validated (after a 304 Not Modified)"""
+        key = cache_key(endpoint, params)
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is not None:
+                entry['fetched_at'] = time.time()
+                entry['ttl'] = season_ttl(params, self.current_ttl)
+                self._save_index()
+
+    def _evict(self):
+        total = sum(entry['size'] for entry in self.index.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self.index, key=lambda k: self.index[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= self.index[key]['size']
+            del self.index[key]
+            try:
+                os.remove(self._payload_path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """Remove every cached response"""
+        with self.lock:
+            for key in list(self.index):
+                try:
+                    os.remove(self._payload_path(key))
+                except FileNotFoundError:
+                    pass
+            self.index = {}
+            self._save_index()
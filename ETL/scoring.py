@@ -0,0 +1,143 @@
+import json
+import os
+
+# numpy is imported where it is used so that importing the scoring constants stays cheap
+
+# Scoring systems are data: one entry per league in a JSON config file, each with
+# a coefficient per box-score stat. Together they form a leagues x stats matrix
+# that is applied to the players x stats matrix in a single product.
+DEFAULT_SCORING_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scoring_systems.json')
+DEFAULT_LEAGUE = 'default'
+
+# Used when no config file is available - the original hard-coded scoring
+DEFAULT_COEFFICIENTS = {
+    'FGM': 1, 'FGA': -1, 'FTM': 1, 'FTA': -1, 'FG3M': 1, 'OREB': 0.5, 'REB': 1,
+    'AST': 1, 'STL': 1.5, 'BLK': 1.5, 'TOV': -1, 'PF': -1, 'PTS': 1,
+}
+
+# Columns computed for every league
+LEAGUE_COLUMNS = ['FANTASY_POINTS', 'AVG_FANTASY_PPG', 'FANTASY_POINTS_PER_MIN']
+
+
+class ScoringSystems:
+    """A set of league scoring systems as a leagues x stats coefficient matrix"""
+
+    def __init__(self, leagues, stats, coefficients, descriptions=None):
+        import numpy as np
+
+        self.leagues = list(leagues)
+        self.stats = list(stats)
+        self.coefficients = np.asarray(coefficients, dtype=np.float64)
+        self.descriptions = descriptions or {}
+
+    def subset(self, leagues):
+        """Only the given leagues (the default league is always kept)"""
+        keep = [league for league in self.leagues if league in leagues or league == DEFAULT_LEAGUE]
+        rows = [self.leagues.index(league) for league in keep]
+        return ScoringSystems(keep, self.stats, self.coefficients[rows], self.descriptions)
+
+
+def default_scoring():
+    stats = list(DEFAULT_COEFFICIENTS)
+    return ScoringSystems([DEFAULT_LEAGUE], stats, [[DEFAULT_COEFFICIENTS[stat] for stat in stats]],
+                          {DEFAULT_LEAGUE: 'Original scoring'})
+
+
+def load_scoring_systems(path=DEFAULT_SCORING_FILE):
+    """
+    Load scoring systems from a JSON file of the form
+    {"league": {"description": "...", "coefficients": {"PTS": 1, "REB": 1.2, ...}}, ...}.
+    Falls back to the original scoring if the file does not exist.
+    """
+    if path is None or not os.path.exists(path):
+        return default_scoring()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    if DEFAULT_LEAGUE not in config:
+        config = dict({DEFAULT_LEAGUE: {'coefficients': DEFAULT_COEFFICIENTS}}, **config)
+
+    leagues = list(config)
+    stats = []
+    for league in leagues:
+        for stat in config[league]['coefficients']:
+            if stat not in stats:
+                stats.append(stat)
+
+    import numpy as np
+
+    coefficients = np.zeros((len(leagues), len(stats)))
+    for i, league in enumerate(leagues):
+        for stat, value in config[league]['coefficients'].items():
+            coefficients[i, stats.index(stat)] = value
+
+    descriptions = {league: config[league].get('description', '') for league in leagues}
+    return ScoringSystems(leagues, stats, coefficients, descriptions)
+
+
+def league_column(base, league):
+    """Column name of a per-league metric; the default league keeps the plain name"""
+    if league is None or league == DEFAULT_LEAGUE:
+        return base
+    return f'{base}__{league}'
+
+
+def league_columns(leagues, bases=LEAGUE_COLUMNS):
+    """All per-league metric columns for the given leagues"""
+    return [league_column(base, league) for league in leagues for base in bases]
+
+
+def score_leagues(df, scoring):
+    """
+    Add FANTASY_POINTS, AVG_FANTASY_PPG and FANTASY_POINTS_PER_MIN for every league
+    with one (players x stats) @ (stats x leagues) product. Stats missing from the
+    data count as zero.
+    """
+    import numpy as np
+
+    stats = np.column_stack([
+        df[stat].to_numpy(dtype=np.float64) if stat in df.columns else np.zeros(len(df))
+        for stat in scoring.stats
+    ]) if scoring.stats else np.zeros((len(df), 0))
+
+    points = stats @ scoring.coefficients.T
+    games = df['GP'].to_numpy(dtype=np.float64)[:, None]
+    minutes = df['MIN'].to_numpy(dtype=np.float64)[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_game = points / games
+        per_minute = points / minutes
+
+    new_columns = {}
+    for i, league in enumerate(scoring.leagues):
+        new_columns[league_column('FANTASY_POINTS', league)] = points[:, i]
+        new_columns[league_column('AVG_FANTASY_PPG', league)] = per_game[:, i]
+        new_columns[league_column('FANTASY_POINTS_PER_MIN', league)] = per_minute[:, i]
+    for col, values in new_columns.items():
+        df[col] = values
+    return df
+
+
+def available_leagues(columns):
+    """Leagues whose scored columns are present in a set of columns"""
+    leagues = [DEFAULT_LEAGUE] if 'FANTASY_POINTS' in columns else []
+    prefix = 'FANTASY_POINTS__'
+    leagues += [col[len(prefix):] for col in columns if col.startswith(prefix)]
+    return leagues
+
+
+def select_league(df, league):
+    """
+    Return a copy of `df` whose FANTASY_POINTS/AVG_FANTASY_PPG/FANTASY_POINTS_PER_MIN
+    columns hold the given league's values, so later stages can stay league-agnostic.
+    """
+    if league is None or league == DEFAULT_LEAGUE:
+        return df
+    missing = [league_column(base, league) for base in LEAGUE_COLUMNS
+               if league_column(base, league) not in df.columns]
+    if missing:
+        raise KeyError(f"League '{league}' not found in the data (missing {', '.join(missing)})")
+    df = df.copy()
+    for base in LEAGUE_COLUMNS:
+        df[base] = df[league_column(base, league)]
+    return df
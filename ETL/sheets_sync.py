@@ -0,0 +1,322 @@
+import datetime
+import json
+import math
+import os
+import time
+
+from fetcher import backoff_delay
+
+# Incremental sync of a DataFrame to a spreadsheet worksheet. The last uploaded
+# grid is cached locally; each sync compares against it and sends only the changed
+# ranges, in batched update calls, so the sheet is never cleared and re-written.
+DEFAULT_SNAPSHOT_DIR = '.sheets_sync'
+
+# Limits per batch_update call
+MAX_CELLS_PER_BATCH = 20000
+MAX_RANGES_PER_BATCH = 500
+
+# Google Sheets status codes worth retrying: quota exhausted and transient errors
+RETRY_STATUS_CODES = {429, 500, 502, 503}
+
+
+class QuotaExceededError(Exception):
+    """A backend refused a request because of its rate limit"""
+
+
+def column_letter(index):
+    """0-based column index -> A1 column letters (0 -> A, 26 -> AA)"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def a1_range(first_row, first_col, last_row, last_col):
+    """A1 range for 0-based inclusive cell bounds, e.g. (0, 0, 1, 2) -> 'A1:C2'"""
+    return f'{column_letter(first_col)}{first_row + 1}:{column_letter(last_col)}{last_row + 1}'
+
+
+def parse_cell(cell):
+    """'C12' -> (11, 2), 0-based row and column"""
+    letters = ''.join(ch for ch in cell if ch.isalpha())
+    col = 0
+    for ch in letters.upper():
+        col = col * 26 + ord(ch) - ord('A') + 1
+    return int(cell[len(letters):]) - 1, col - 1
+
+
+def cell_value(value):
+    """A JSON/Sheets friendly cell: numbers stay numbers, NaN and None become ''"""
+    if value is None:
+        return ''
+    if hasattr(value, 'item') and not isinstance(value, str):
+        value = value.item()
+    if isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            return ''
+        return int(value) if value.is_integer() else value
+    if isinstance(value, (int, str)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def dataframe_to_grid(df):
+    """Header row plus one row per DataFrame row, as lists of cell values"""
+    grid = [[str(col) for col in df.columns]]
+    for row in df.itertuples(index=False, name=None):
+        grid.append([cell_value(value) for value in row])
+    return grid
+
+
+def diff_ranges(old_grid, new_grid):
+    """
+    The updates that turn `old_grid` into `new_grid`: a list of
+    {'range': 'A2:F4', 'values': [...]} blocks. Each changed row contributes the
+    span from its first to its last changed cell; consecutive rows with the same
+    span are merged into one block. Cells outside the new grid are blanked.
+    """
+    rows = max(len(old_grid), len(new_grid))
+    spans = []
+    for r in range(rows):
+        old_row = old_grid[r] if r < len(old_grid) else []
+        new_row = new_grid[r] if r < len(new_grid) else []
+        width = max(len(old_row), len(new_row))
+        changed = [c for c in range(width)
+                   if (old_row[c] if c < len(old_row) else '') != (new_row[c] if c < len(new_row) else '')]
+        if changed:
+            spans.append((r, changed[0], changed[-1]))
+
+    updates = []
+    block = None
+    for r, first_col, last_col in spans:
+        if block and block[1] == r - 1 and block[2] == first_col and block[3] == last_col:
+            block[1] = r
+        else:
+            if block:
+                updates.append(block)
+            block = [r, r, first_col, last_col]
+    if block:
+        updates.append(block)
+
+    result = []
+    for first_row, last_row, first_col, last_col in updates:
+        values = []
+        for r in range(first_row, last_row + 1):
+            new_row = new_grid[r] if r < len(new_grid) else []
+            values.append([new_row[c] if c < len(new_row) else '' for c in range(first_col, last_col + 1)])
+        result.append({'range': a1_range(first_row, first_col, last_row, last_col), 'values': values})
+    return result
+
+
+def split_update(update, max_cells):
+    """Split a block into row slices of at most `max_cells` cells"""
+    values = update['values']
+    width = max(1, len(values[0]) if values else 1)
+    rows_per_slice = max(1, max_cells // width)
+    if len(values) <= rows_per_slice:
+        return [update]
+
+    start, _, end = update['range'].partition(':')
+    first_row, first_col = parse_cell(start)
+    last_col = parse_cell(end or start)[1]
+    slices = []
+    for offset in range(0, len(values), rows_per_slice):
+        part = values[offset:offset + rows_per_slice]
+        slices.append({
+            'range': a1_range(first_row + offset, first_col, first_row + offset + len(part) - 1, last_col),
+            'values': part,
+        })
+    return slices
+
+
+def chunk_updates(updates, max_cells=MAX_CELLS_PER_BATCH, max_ranges=MAX_RANGES_PER_BATCH):
+    """Group updates into batches under the cell and range limits of one call"""
+    batches = []
+    batch, cells = [], 0
+    for update in (part for update in updates for part in split_update(update, max_cells)):
+        size = sum(len(row) for row in update['values'])
+        if batch and (cells + size > max_cells or len(batch) >= max_ranges):
+            batches.append(batch)
+            batch, cells = [], 0
+        batch.append(update)
+        cells += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def snapshot_path(backend, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    safe_name = ''.join(ch if ch.isalnum() or ch in '-_' else '_' for ch in backend.name)
+    return os.path.join(snapshot_dir, f'{safe_name}.json')
+
+
+def load_snapshot(path):
+    """The grid of the last successful sync, or None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['grid']
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+
+def save_snapshot(path, grid):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'updated_at': datetime.datetime.now().isoformat(timespec='seconds'), 'grid': grid}, f)
+    os.replace(path + '.tmp', path)
+
+
+def send_with_retry(backend, batch, max_retries=5, backoff_base=2.0, backoff_cap=64.0):
+    """Send one batch, backing off and retrying while the backend reports quota or transient errors"""
+    for attempt in range(max_retries + 1):
+        try:
+            backend.batch_update(batch)
+            return attempt
+        except Exception as e:
+            if attempt == max_retries or not backend.is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, backoff_base, backoff_cap)
+            print(f"Sheets quota/transient error ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def sync_dataframe(df, backend, snapshot_dir=DEFAULT_SNAPSHOT_DIR, full=False, max_cells=MAX_CELLS_PER_BATCH,
+                   max_retries=5, backoff_base=2.0):
+    """
+    Bring the backend's worksheet in line with `df`, sending only the cells that
+    differ from the last successful sync (everything with `full` or without a
+    snapshot). The snapshot is only replaced once every batch went through, so an
+    interrupted sync is simply repeated next time.
+    Returns a summary dict (ranges, cells, requests, retries).
+    """
+    grid = dataframe_to_grid(df)
+    path = snapshot_path(backend, snapshot_dir)
+    old_grid = None if full else load_snapshot(path)
+    if old_grid is None:
+        # Without a trustworthy snapshot, diff against what is in the sheet now
+        # (read values come back as text, so in practice every cell is rewritten)
+        old_grid = backend.read_grid()
+        full = True
+
+    updates = diff_ranges(old_grid, grid)
+    batches = chunk_updates(updates, max_cells)
+    rows = max(len(grid), len(old_grid))
+    cols = max([len(row) for row in grid + old_grid] or [0])
+    if updates:
+        backend.ensure_size(rows, cols)
+
+    retries = 0
+    for batch in batches:
+        retries += send_with_retry(backend, batch, max_retries, backoff_base)
+
+    save_snapshot(path, grid)
+    return {
+        'full': full,
+        'ranges': len(updates),
+        'cells': sum(len(row) for update in updates for row in update['values']),
+        'requests': len(batches),
+        'retries': retries,
+    }
+
+
+class LocalSheetBackend:
+    """
+    Stand-in for a worksheet: an in-memory grid, optionally persisted to a JSON
+    file. Counts requests and cells written and can enforce a per-minute request
+    quota, so syncs can be tested and benchmarked offline.
+    """
+
+    def __init__(self, name='local', path=None, requests_per_minute=None):
+        self.name = name
+        self.path = path
+        self.requests_per_minute = requests_per_minute
+        self.request_times = []
+        self.requests = 0
+        self.cells_written = 0
+        self.grid = []
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.grid = json.load(f)
+
+    def read_grid(self):
+        return [list(row) for row in self.grid]
+
+    def ensure_size(self, rows, cols):
+        while len(self.grid) < rows:
+            self.grid.append([])
+        for row in self.grid:
+            row.extend([''] * (cols - len(row)))
+
+    def _check_quota(self):
+        if not self.requests_per_minute:
+            return
+        now = time.monotonic()
+        self.request_times = [t for t in self.request_times if now - t < 60]
+        if len(self.request_times) >= self.requests_per_minute:
+            raise QuotaExceededError(f"more than {self.requests_per_minute} requests per minute")
+        self.request_times.append(now)
+
+    def batch_update(self, updates):
+        self._check_quota()
+        self.requests += 1
+        for update in updates:
+            start, _, end = update['range'].partition(':')
+            first_row, first_col = parse_cell(start)
+            for r, values in enumerate(update['values']):
+                row = self.grid[first_row + r]
+                for c, value in enumerate(values):
+                    row[first_col + c] = value
+                    self.cells_written += 1
+        if self.path:
+            with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(self.grid, f)
+            os.replace(self.path + '.tmp', self.path)
+
+    def is_retryable(self, error):
+        return isinstance(error, QuotaExceededError)
+
+
+class GspreadBackend:
+    """A Google Sheets worksheet through gspread (imported only when this backend is used)"""
+
+    def __init__(self, sheet_id, credentials_file, worksheet_name):
+        import gspread
+        from google.oauth2.service_account import Credentials
+
+        self.gspread = gspread
+        scopes = [
+            'https://www.googleapis.com/auth/spreadsheets',
+            'https://www.googleapis.com/auth/drive'
+        ]
+        credentials = Credentials.from_service_account_file(credentials_file, scopes=scopes)
+        client = gspread.authorize(credentials)
+        self.spreadsheet = client.open_by_key(sheet_id)
+        self.name = f'{sheet_id}_{worksheet_name}'
+        try:
+            self.worksheet = self.spreadsheet.worksheet(worksheet_name)
+            self.created = False
+        except gspread.exceptions.WorksheetNotFound:
+            self.worksheet = self.spreadsheet.add_worksheet(title=worksheet_name, rows=100, cols=20)
+            self.created = True
+
+    def read_grid(self):
+        return self.worksheet.get_all_values()
+
+    def ensure_size(self, rows, cols):
+        # Only grow: shrinking would drop cells before the new values are written
+        if rows > self.worksheet.row_count or cols > self.worksheet.col_count:
+            self.worksheet.resize(rows=max(rows, self.worksheet.row_count),
+                                  cols=max(cols, self.worksheet.col_count))
+
+    def batch_update(self, updates):
+        self.worksheet.batch_update(updates, value_input_option='RAW')
+
+    def is_retryable(self, error):
+        if not isinstance(error, self.gspread.exceptions.APIError):
+            return False
+        response = getattr(error, 'response', None)
+        return getattr(response, 'status_code', None) in RETRY_STATUS_CODES
@@ -0,0 +1,264 @@
+import os
+import shutil
+
+# pandas and pyarrow are imported by the functions that use them, so the table
+# names and defaults below can be imported without loading either library.
+
+# Shared columnar data store used to hand data between the pipeline stages.
+# Tables are written as Parquet under DEFAULT_DATA_DIR/<table>/, optionally
+# partitioned by a column (SEASON=2023-24/part-0.parquet, hive style).
+DEFAULT_DATA_DIR = 'data'
+
+STATS_TABLE = 'player_stats'
+STATS_CSV = 'nba_fantasy_stats_new.csv'
+RANKINGS_TABLE = 'rankings'
+RANKINGS_CSV = 'nba_fantasy_rankings_three_metrics.csv'
+FORM_TABLE = 'form'
+FORM_CSV = 'nba_fantasy_form.csv'
+# Historical seasons from backfill.py, kept apart from the stats the ranking reads
+BACKFILL_TABLE = 'player_stats_backfill'
+BACKFILL_CSV = 'nba_fantasy_stats_backfill.csv'
+
+# Low-cardinality strings are stored as categoricals
+CATEGORICAL_COLUMNS = ['PLAYER_NAME', 'TEAM_ABBREVIATION', 'SEASON', 'SEASON_TYPE', 'LEAGUE']
+
+# Identifiers keep enough range for NBA player/game ids
+ID_COLUMNS = ['PLAYER_ID', 'TEAM_ID', 'GAME_ID']
+
+
+def backfill_table(season_type='Regular Season'):
+    """Backfill table for a season type; other types than the regular season get a suffix"""
+    if season_type == 'Regular Season':
+        return BACKFILL_TABLE
+    return f"{BACKFILL_TABLE}__{season_type.lower().replace(' ', '_')}"
+
+
+def backfill_csv(season_type='Regular Season'):
+    """CSV export of the backfill table for a season type"""
+    if season_type == 'Regular Season':
+        return BACKFILL_CSV
+    return BACKFILL_CSV.replace('.csv', f"_{season_type.lower().replace(' ', '_')}.csv")
+
+
+def rankings_table(league=None, form_window=None):
+    """
+    Rankings table name for a league; the default league uses the plain name.
+    Rankings built from a rolling `form_window` (days) get a __form<N>d suffix.
+    """
+    name = RANKINGS_TABLE
+    if league is not None and league != 'default':
+        name += f'__{league}'
+    if form_window:
+        name += f'__form{form_window}d'
+    return name
+
+
+def rankings_csv(league=None, form_window=None):
+    """Rankings CSV file name for a league (and rolling form window, if any)"""
+    suffix = ''
+    if league is not None and league != 'default':
+        suffix += f'_{league}'
+    if form_window:
+        suffix += f'_form{form_window}d'
+    return RANKINGS_CSV.replace('.csv', f'{suffix}.csv')
+
+
+def form_table(window):
+    """Table of rolling `window`-day form metrics written by box_scores.py"""
+    return f'{FORM_TABLE}_{window}d'
+
+
+def form_csv(window):
+    return FORM_CSV.replace('.csv', f'_{window}d.csv')
+
+
+def pyarrow_available():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def optimize_dtypes(df):
+    """
+    Return a copy of `df` with compact dtypes: categoricals for names/teams/seasons,
+    int16 for counting stats and float32 for rates.
+    """
+    import pandas as pd
+
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if col in CATEGORICAL_COLUMNS:
+            df[col] = series.astype('category')
+        elif col in ID_COLUMNS and pd.api.types.is_integer_dtype(series):
+            df[col] = series.astype('int32')
+        elif pd.api.types.is_bool_dtype(series):
+            continue
+        elif pd.api.types.is_integer_dtype(series):
+            # int16 covers season totals; wider values keep int32
+            small = series.empty or (series.min() >= -32768 and series.max() <= 32767)
+            df[col] = series.astype('int16' if small else 'int32')
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = series.astype('float32')
+    return df
+
+
+def table_dir(name, data_dir=DEFAULT_DATA_DIR):
+    return os.path.join(data_dir, name)
+
+
+def table_exists(name, data_dir=DEFAULT_DATA_DIR):
+    return os.path.isdir(table_dir(name, data_dir))
+
+
+def _write_parquet(df, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = path + '.tmp'
+    pq.write_table(table, tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+
+
+def _swap_dir(new_dir, target):
+    """Move the finished directory `new_dir` into place as `target`, replacing what is there"""
+    old_dir = os.path.join(os.path.dirname(target), f'.{os.path.basename(target)}.old')
+    if os.path.isdir(old_dir):
+        shutil.rmtree(old_dir)
+    if os.path.isdir(target):
+        os.replace(target, old_dir)
+    os.replace(new_dir, target)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _write_partitions(df, directory, partition_by):
+    for value, part in df.groupby(partition_by, observed=True, sort=False):
+        part = part.drop(columns=[partition_by])
+        _write_parquet(part, os.path.join(directory, f'{partition_by}={value}', 'part-0.parquet'))
+
+
+def write_table(df, name, data_dir=DEFAULT_DATA_DIR, partition_by=None, replace=True):
+    """
+    Write `df` to the store as table `name`.
+    With `replace` the table holds exactly `df` afterwards: partitions left over
+    from earlier writes are removed. With `partition_by` and `replace=False`, only
+    the partitions present in `df` are replaced and the others are kept.
+    New files are written to a hidden sibling directory that is swapped in once
+    complete, so a failed write leaves the previous table or partition in place.
+    """
+    if not pyarrow_available():
+        raise ImportError("pyarrow is required for the Parquet data store (pip install pyarrow)")
+
+    df = optimize_dtypes(df)
+    root = table_dir(name, data_dir)
+
+    if replace or partition_by is None:
+        new_root = os.path.join(data_dir, f'.{name}.tmp')
+        if os.path.isdir(new_root):
+            shutil.rmtree(new_root)
+        if partition_by is None:
+            _write_parquet(df, os.path.join(new_root, 'part-0.parquet'))
+        else:
+            _write_partitions(df, new_root, partition_by)
+        _swap_dir(new_root, root)
+        return
+
+    for value, part in df.groupby(partition_by, observed=True, sort=False):
+        part_dir = os.path.join(root, f'{partition_by}={value}')
+        # No '=' in the name, so a leftover is never listed as a partition
+        new_dir = os.path.join(root, f'.{partition_by}-{value}.tmp')
+        if os.path.isdir(new_dir):
+            shutil.rmtree(new_dir)
+        part = part.drop(columns=[partition_by])
+        _write_parquet(part, os.path.join(new_dir, 'part-0.parquet'))
+        _swap_dir(new_dir, part_dir)
+
+
+def list_partitions(name, data_dir=DEFAULT_DATA_DIR):
+    """Return the (column, value) pairs of the partitions of a table"""
+    root = table_dir(name, data_dir)
+    partitions = []
+    if not os.path.isdir(root):
+        return partitions
+    for entry in sorted(os.listdir(root)):
+        if '=' in entry and os.path.isdir(os.path.join(root, entry)):
+            column, value = entry.split('=', 1)
+            partitions.append((column, value))
+    return partitions
+
+
+def read_table(name, columns=None, partitions=None, data_dir=DEFAULT_DATA_DIR):
+    """
+    Read table `name` from the store into a DataFrame.
+    Only `columns` are loaded (all if None) and the files are memory-mapped.
+    `partitions` restricts a partitioned table to the given values (e.g. seasons).
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    root = table_dir(name, data_dir)
+    if not os.path.isdir(root):
+        raise FileNotFoundError(f"Table '{name}' not found in {data_dir}")
+
+    partition_dirs = list_partitions(name, data_dir)
+    if not partition_dirs:
+        table = pq.read_table(os.path.join(root, 'part-0.parquet'), columns=columns, memory_map=True)
+        return table.to_pandas()
+
+    partition_column = partition_dirs[0][0]
+    file_columns = None
+    if columns is not None:
+        file_columns = [col for col in columns if col != partition_column]
+
+    tables = []
+    for column, value in partition_dirs:
+        if partitions is not None and value not in partitions:
+            continue
+        path = os.path.join(root, f'{column}={value}', 'part-0.parquet')
+        table = pq.read_table(path, columns=file_columns, memory_map=True)
+        if columns is None or partition_column in columns:
+            values = pa.array([value] * table.num_rows).dictionary_encode()
+            table = table.append_column(partition_column, values)
+        tables.append(table)
+
+    if not tables:
+        return pd.DataFrame(columns=columns)
+
+    df = pa.concat_tables(tables, promote_options='permissive').to_pandas()
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    return df
+
+
+def drop_table(name, data_dir=DEFAULT_DATA_DIR):
+    """Remove table `name` from the store, if it is there"""
+    root = table_dir(name, data_dir)
+    if os.path.isdir(root):
+        shutil.rmtree(root)
+
+
+def export_csv(df, path):
+    """Write a DataFrame as CSV for people and tools that want plain text"""
+    df.to_csv(path, index=False)
+
+
+def load_frame(name, csv_path, columns=None, partitions=None, data_dir=DEFAULT_DATA_DIR):
+    """
+    Load a table from the columnar store, falling back to the legacy CSV handoff file
+    when the store (or pyarrow) is not available.
+    """
+    import pandas as pd
+
+    if pyarrow_available() and table_exists(name, data_dir):
+        return read_table(name, columns=columns, partitions=partitions, data_dir=data_dir)
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"Neither table '{name}' in {data_dir} nor '{csv_path}' was found")
+    df = pd.read_csv(csv_path, usecols=lambda col: columns is None or col in columns)
+    if partitions is not None and 'SEASON' in df.columns:
+        df = df[df['SEASON'].isin(partitions)]
+    return df
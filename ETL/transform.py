@@ -0,0 +1,144 @@
+from scoring import LEAGUE_COLUMNS, load_scoring_systems, score_leagues
+
+# Only keep columns directly related to fantasy scoring
+# Player identification columns
+ID_COLUMNS = ['SEASON', 'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ABBREVIATION', 'GP', 'MIN']
+
+# Stats that contribute to fantasy scoring (comments give the default league's values)
+STAT_COLUMNS = [
+    'FGM', 'FGA',      # Field goals: +1 for makes, -1 for attempts
+    'FTM', 'FTA',      # Free throws: +1 for makes, -1 for attempts
+    'FG3M',            # Three pointers: +1
+    'OREB',            # Offensive rebounds: +0.5
+    'REB',             # Total rebounds: +1
+    'AST',             # Assists: +1
+    'STL',             # Steals: +1.5
+    'BLK',             # Blocks: +1.5
+    'TOV',             # Turnovers: -1
+    'PF',              # Personal fouls: -1
+    'PTS'              # Points: +1
+]
+
+# Counting columns that can be summed across date ranges
+COUNTING_COLUMNS = ['GP', 'MIN'] + STAT_COLUMNS
+
+DERIVED_COLUMNS = ['FANTASY_POINTS', 'AVG_FANTASY_PPG', 'PCT_GAMES_PLAYED',
+                   'AVG_MINUTES', 'PCT_MINUTES_PLAYED', 'FANTASY_POINTS_PER_MIN']
+
+# Final columns in the desired order
+FINAL_COLUMNS = [
+    # Player info
+    'SEASON', 'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ABBREVIATION',
+    # Game stats
+    'GP', 'PCT_GAMES_PLAYED', 'MIN', 'AVG_MINUTES', 'PCT_MINUTES_PLAYED',
+    # Fantasy metrics
+    'FANTASY_POINTS', 'AVG_FANTASY_PPG', 'FANTASY_POINTS_PER_MIN',
+    # Box score stats that contribute to fantasy
+    'PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF',
+    'FGM', 'FGA', 'FTM', 'FTA', 'FG3M', 'OREB'
+]
+
+# Assuming 82 games in a season for NBA
+TOTAL_GAMES_IN_SEASON = 82
+
+# Regular seasons that were shortened (lockouts and COVID-19)
+SEASON_GAMES = {
+    '1998-99': 50,
+    '2011-12': 66,
+    # Suspended in March 2020; teams finished with 63 to 75 games
+    '2019-20': 72,
+    '2020-21': 72,
+}
+
+
+def season_games(season):
+    """Regular-season games per team in `season` (e.g. '2011-12' -> 66)"""
+    return SEASON_GAMES.get(str(season), TOTAL_GAMES_IN_SEASON)
+
+
+def games_per_row(df):
+    """Games per team for each row, from its SEASON (82 when there is no SEASON column)"""
+    if 'SEASON' not in df.columns:
+        return TOTAL_GAMES_IN_SEASON
+    return df['SEASON'].astype(str).map(season_games).astype(float)
+
+
+def payload_to_dataframe(payload, season):
+    """Convert a leaguedashplayerstats JSON payload into a DataFrame tagged with its season"""
+    import pandas as pd
+
+    results = payload['resultSets'][0]
+    df = pd.DataFrame(results['rowSet'], columns=results['headers'])
+
+    # Add a SEASON column to track which season the data belongs to
+    df['SEASON'] = season
+    return df
+
+
+def select_fantasy_columns(df, scoring=None):
+    """Keep only the id and stat columns used for fantasy scoring"""
+    stat_columns = list(STAT_COLUMNS)
+    if scoring is not None:
+        stat_columns += [stat for stat in scoring.stats if stat not in stat_columns]
+
+    # Select only columns that exist in the data
+    existing_id_columns = [col for col in ID_COLUMNS if col in df.columns]
+    existing_stat_columns = [col for col in stat_columns if col in df.columns]
+    return df[existing_id_columns + existing_stat_columns].copy()
+
+
+def add_fantasy_metrics(fantasy_df, scoring=None, games=None):
+    """
+    Calculate fantasy points and the derived per-game, per-minute and percentage columns.
+    Every league in `scoring` (default: scoring_systems.json) is scored in one batched pass.
+    `games` is the number of team games the percentages are measured against
+    (default: the regular-season length of each row's SEASON).
+    """
+    if scoring is None:
+        scoring = load_scoring_systems()
+    if games is None:
+        games = games_per_row(fantasy_df)
+
+    # Calculate fantasy points, points per game and points per minute for every league
+    fantasy_df = score_leagues(fantasy_df, scoring)
+
+    # Calculate percentage of games played - a critical metric for fantasy value
+    # This indicates a player's durability and availability throughout the season
+    fantasy_df['PCT_GAMES_PLAYED'] = (fantasy_df['GP'] / games) * 100
+
+    # Add minutes stats
+    fantasy_df['AVG_MINUTES'] = fantasy_df['MIN'] / fantasy_df['GP']
+
+    # 48 minutes per game times the games in the season
+    total_minutes_possible = 48 * games
+    fantasy_df['PCT_MINUTES_PLAYED'] = (fantasy_df['MIN'] / total_minutes_possible) * 100
+
+    # Replace any NaN values with 0
+    fantasy_df = fantasy_df.fillna(0)
+
+    # Round decimal values for readability
+    for col in fantasy_df.columns:
+        if col in DERIVED_COLUMNS or col.split('__')[0] in LEAGUE_COLUMNS:
+            fantasy_df[col] = fantasy_df[col].round(2)
+
+    return fantasy_df
+
+
+def finalize_fantasy_df(fantasy_df):
+    """Sort by fantasy points and put the columns in their final order"""
+    # Sort by fantasy points in descending order
+    fantasy_df = fantasy_df.sort_values('FANTASY_POINTS', ascending=False)
+
+    # Only keep columns that exist, with the other leagues' columns at the end
+    final_columns = [col for col in FINAL_COLUMNS if col in fantasy_df.columns]
+    final_columns += [col for col in fantasy_df.columns if '__' in col and col.split('__')[0] in LEAGUE_COLUMNS]
+    return fantasy_df[final_columns]
+
+
+def transform(raw_df, scoring=None, games=None):
+    """Turn the combined raw season data into the final fantasy dataset"""
+    if scoring is None:
+        scoring = load_scoring_systems()
+    fantasy_df = select_fantasy_columns(raw_df, scoring)
+    fantasy_df = add_fantasy_metrics(fantasy_df, scoring, games)
+    return finalize_fantasy_df(fantasy_df)
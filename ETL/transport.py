@@ -0,0 +1,103 @@
+import os
+import json
+import datetime
+from urllib.parse import urlparse
+
+from response_cache import cache_key
+
+# Transports are what fetcher.py sends requests through: anything with the
+# requests.Session.get signature that returns an object with status_code,
+# headers, text and json(). A plain pooled Session goes to the network,
+# RecordingTransport also saves every successful response to a directory and
+# ReplayTransport answers from such a directory without any network access.
+# Recordings are keyed by the URL path and the query parameters (not the host),
+# so responses recorded from stats.nba.com replay for any --base-url.
+
+# Response headers kept in a recording
+RECORDED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified']
+
+
+class StoredResponse:
+    """A recorded or generated response with the parts of requests.Response the fetcher uses"""
+
+    def __init__(self, status_code, text, headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def recording_path(directory, url, params):
+    """File of the recorded response to a request"""
+    return os.path.join(directory, cache_key(urlparse(url).path, params or {}) + '.json')
+
+
+def read_recording(path):
+    """The StoredResponse saved at `path` (None if there is none)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            recording = json.load(f)
+    except FileNotFoundError:
+        return None
+    return StoredResponse(recording['status'], recording['body'], recording.get('headers'))
+
+
+class RecordingTransport:
+    """Sends requests through `session` and saves every 200 response under `directory`"""
+
+    def __init__(self, session, directory):
+        self.session = session
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, url, params=None, timeout=None, headers=None):
+        response = self.session.get(url, params=params, timeout=timeout, headers=headers)
+        # Throttling and errors are not worth replaying; 304s have no body
+        if response.status_code == 200:
+            recording = {
+                'url': urlparse(url).path,
+                'params': params or {},
+                'status': response.status_code,
+                'headers': {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+                'recorded_at': datetime.datetime.now().isoformat(timespec='seconds'),
+                'body': response.text,
+            }
+            path = recording_path(self.directory, url, params)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(recording, f)
+            os.replace(path + '.tmp', path)
+        return response
+
+
+class ReplayTransport:
+    """Answers requests from the recordings under `directory`; requests never recorded get a 404"""
+
+    def __init__(self, directory):
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"No recordings directory '{directory}'")
+        self.directory = directory
+
+    def get(self, url, params=None, timeout=None, headers=None):
+        response = read_recording(recording_path(self.directory, url, params))
+        if response is None:
+            return StoredResponse(404, json.dumps({'error': f'not recorded: {urlparse(url).path} {params}'}))
+        return response
+
+
+def make_transport(headers=None, pool_size=8, record=None, replay=None):
+    """A pooled session, wrapped to record into `record` or replaced by a replay of `replay`"""
+    from fetcher import create_session
+
+    if replay:
+        return ReplayTransport(replay)
+    session = create_session(headers, pool_size)
+    if record:
+        return RecordingTransport(session, record)
+    return session
+
+
+def stats_url(base_url, endpoint):
+    """URL of a stats endpoint under `base_url` ('http://127.0.0.1:8000' -> .../stats/<endpoint>)"""
+    return f"{base_url.rstrip('/')}/stats/{endpoint}"
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+# Per-season rates that are combined across seasons as GP-weighted averages
+WEIGHTED_COLUMNS = ['AVG_MINUTES', 'AVG_FANTASY_PPG', 'FANTASY_POINTS_PER_MIN',
+                    'PCT_MINUTES_PLAYED', 'PCT_GAMES_PLAYED']
+
+# Columns that are simply summed across seasons
+SUMMED_COLUMNS = ['FANTASY_POINTS']
+
+# Per-league versions of the scored columns (see ETL/scoring.py) are aggregated the same way
+LEAGUE_WEIGHTED_BASES = ['AVG_FANTASY_PPG', 'FANTASY_POINTS_PER_MIN']
+LEAGUE_SUMMED_BASES = ['FANTASY_POINTS']
+
+OUTPUT_COLUMNS = ['PLAYER_ID', 'PLAYER_NAME', 'TEAM_ABBREVIATION', 'GP', 'AVG_MINUTES',
+                  'FANTASY_POINTS', 'AVG_FANTASY_PPG', 'FANTASY_POINTS_PER_MIN',
+                  'PCT_MINUTES_PLAYED', 'PCT_GAMES_PLAYED']
+
+
+def league_variants(df, bases):
+    """Columns like FANTASY_POINTS__espn that belong to another league"""
+    return [col for col in df.columns if '__' in col and col.split('__')[0] in bases]
+
+
+def player_key(df):
+    """Group by the stable PLAYER_ID when available, otherwise by name"""
+    return 'PLAYER_ID' if 'PLAYER_ID' in df.columns else 'PLAYER_NAME'
+
+
+def aggregate_players(df, min_games=20, min_minutes=10):
+    """
+    Aggregate per-season (or per-game) rows into one row per player.
+    Rates are GP-weighted averages, FANTASY_POINTS and GP are summed and the team
+    and name come from the player's most recent season. Players below `min_games`
+    total games or `min_minutes` weighted average minutes are dropped.
+
+    Everything is done with grouped weighted sums over factorized player codes,
+    so the cost is a handful of linear passes regardless of the number of players.
+    """
+    key = player_key(df)
+    codes, uniques = pd.factorize(df[key], sort=True)
+    n_players = len(uniques)
+
+    gp = df['GP'].to_numpy(dtype=np.float64)
+    total_gp = np.bincount(codes, weights=gp, minlength=n_players)
+
+    weighted_columns = WEIGHTED_COLUMNS + league_variants(df, LEAGUE_WEIGHTED_BASES)
+    summed_columns = SUMMED_COLUMNS + league_variants(df, LEAGUE_SUMMED_BASES)
+
+    aggregated = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for col in weighted_columns:
+            values = df[col].to_numpy(dtype=np.float64)
+            aggregated[col] = np.bincount(codes, weights=values * gp, minlength=n_players) / total_gp
+    for col in summed_columns:
+        aggregated[col] = np.bincount(codes, weights=df[col].to_numpy(dtype=np.float64), minlength=n_players)
+
+    # Most recent team and name: last row of each player once ordered by season
+    if 'SEASON' in df.columns:
+        season_codes, _ = pd.factorize(df['SEASON'], sort=True)
+        order = np.argsort(season_codes, kind='stable')
+    else:
+        order = np.arange(len(df))
+    by_player = order[np.argsort(codes[order], kind='stable')]
+    group_ends = np.cumsum(np.bincount(codes, minlength=n_players)) - 1
+    last_row = by_player[group_ends]
+
+    result = pd.DataFrame({
+        'PLAYER_ID': uniques if key == 'PLAYER_ID' else None,
+        'PLAYER_NAME': df['PLAYER_NAME'].iloc[last_row].to_numpy(),
+        'TEAM_ABBREVIATION': df['TEAM_ABBREVIATION'].iloc[last_row].to_numpy(),
+        'GP': total_gp.astype(np.int64),
+        **aggregated,
+    })
+    if key != 'PLAYER_ID':
+        result = result.drop(columns=['PLAYER_ID'])
+
+    # Apply minimum games and minimum minutes filters to aggregated data
+    result = result[(result['GP'] >= min_games) & (result['AVG_MINUTES'] >= min_minutes)]
+
+    columns = [col for col in OUTPUT_COLUMNS if col in result.columns]
+    columns += [col for col in result.columns if col not in columns]
+    return result[columns].sort_values('PLAYER_NAME', kind='stable').reset_index(drop=True)
@@ -1,146 +1,291 @@
-import pandas as pd
+import os
+import sys
+import time
+import argparse
 import numpy as np
-from scipy import stats
-
-# Load the fantasy data
-try:
-    df = pd.read_csv(r'C:\fantasy\nba-fantasy\nba_fantasy_stats_new.csv')
-except FileNotFoundError:
-    print("Error: File 'nba_fantasy_stats_new.csv' not found.")
-    exit()
-
-# Group data by player to aggregate across seasons
-player_groups = df.groupby('PLAYER_NAME')
-
-# Create aggregated dataframe
-aggregated_data = []
-for player, data in player_groups:
-    # Calculate weighted averages based on games played
-    total_gp = data['GP'].sum()
-    
-    if total_gp >= 20:  # Apply minimum games filter to aggregated data
-        avg_minutes = np.average(data['AVG_MINUTES'], weights=data['GP'])
-        
-        if avg_minutes >= 10:  # Apply minimum minutes filter to aggregated data
-            # Aggregate data across seasons
-            player_data = {
-                'PLAYER_NAME': player,
-                'TEAM_ABBREVIATION': data['TEAM_ABBREVIATION'].iloc[-1],  # Most recent team
-                'GP': total_gp,
-                'AVG_MINUTES': avg_minutes,
-                'FANTASY_POINTS': data['FANTASY_POINTS'].sum(),
-                'AVG_FANTASY_PPG': np.average(data['AVG_FANTASY_PPG'], weights=data['GP']),
-                'FANTASY_POINTS_PER_MIN': np.average(data['FANTASY_POINTS_PER_MIN'], weights=data['GP']),
-                'PCT_MINUTES_PLAYED': np.average(data['PCT_MINUTES_PLAYED'], weights=data['GP']),
-                'PCT_GAMES_PLAYED': np.average(data['PCT_GAMES_PLAYED'], weights=data['GP'])
-            }
-            aggregated_data.append(player_data)
-
-# Create new dataframe with aggregated stats
-df_filtered = pd.DataFrame(aggregated_data)
-
-print(f"Total players in original data: {len(df)}")
-print(f"Players after aggregating and filtering: {len(df_filtered)}")
-
-# Analyze correlation between key metrics and total fantasy points
-print("\nCorrelation with total FANTASY_POINTS:")
-correlations = {
-    'AVG_FANTASY_PPG': df_filtered['AVG_FANTASY_PPG'].corr(df_filtered['FANTASY_POINTS']),
-    'PCT_MINUTES_PLAYED': df_filtered['PCT_MINUTES_PLAYED'].corr(df_filtered['FANTASY_POINTS']),
-    'PCT_GAMES_PLAYED': df_filtered['PCT_GAMES_PLAYED'].corr(df_filtered['FANTASY_POINTS']),
-    'AVG_MINUTES': df_filtered['AVG_MINUTES'].corr(df_filtered['FANTASY_POINTS']),
-    'GP': df_filtered['GP'].corr(df_filtered['FANTASY_POINTS']),
-    'FANTASY_POINTS_PER_MIN': df_filtered['FANTASY_POINTS_PER_MIN'].corr(df_filtered['FANTASY_POINTS'])
+
+# The shared data store lives with the ETL stage
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+from storage import STATS_TABLE, load_frame, write_table, pyarrow_available, rankings_table, rankings_csv, form_table, form_csv
+from scoring import DEFAULT_LEAGUE, league_columns, select_league
+from instrumentation import add_arguments, instrumented, stage
+from aggregation import aggregate_players
+from weight_search import min_max_normalize, search_weights
+from weight_resampling import run_bootstrap, run_season_holdout, summarize_stability, top_candidates
+
+# Metrics available to the weighted ranking score: normalized column, label, meaning
+RANKING_METRICS = {
+    'PCT_MINUTES_PLAYED': ('NORM_MINUTES_PCT', '% Minutes', 'How much of all possible minutes a player plays'),
+    'FANTASY_POINTS_PER_MIN': ('NORM_FANTASY_PER_MIN', 'Points/Min', 'How efficient a player is when on the court'),
+    'PCT_GAMES_PLAYED': ('NORM_GAMES_PCT', '% Games', 'How reliable a player is in terms of availability'),
+    'AVG_MINUTES': ('NORM_AVG_MINUTES', 'Avg Minutes', 'How many minutes a player gets when they play'),
+    'AVG_FANTASY_PPG': ('NORM_FANTASY_PPG', 'Points/Game', 'How productive a player is per game played'),
 }
 
-for metric, corr in sorted(correlations.items(), key=lambda x: abs(x[1]), reverse=True):
-    print(f"{metric}: {corr:.4f}")
-
-# Check for correlation between our key metrics
-print("\nCorrelations between key metrics:")
-print(f"% Minutes vs Fantasy Points Per Min: {df_filtered['PCT_MINUTES_PLAYED'].corr(df_filtered['FANTASY_POINTS_PER_MIN']):.4f}")
-print(f"% Games Played vs % Minutes: {df_filtered['PCT_GAMES_PLAYED'].corr(df_filtered['PCT_MINUTES_PLAYED']):.4f}")
-print(f"% Games Played vs Fantasy Points Per Min: {df_filtered['PCT_GAMES_PLAYED'].corr(df_filtered['FANTASY_POINTS_PER_MIN']):.4f}")
-
-# Develop a combined ranking metric
-# Normalize both metrics to a 0-1 scale
-df_filtered['NORM_MINUTES_PCT'] = (df_filtered['PCT_MINUTES_PLAYED'] - df_filtered['PCT_MINUTES_PLAYED'].min()) / \
-                                 (df_filtered['PCT_MINUTES_PLAYED'].max() - df_filtered['PCT_MINUTES_PLAYED'].min())
-
-df_filtered['NORM_FANTASY_PER_MIN'] = (df_filtered['FANTASY_POINTS_PER_MIN'] - df_filtered['FANTASY_POINTS_PER_MIN'].min()) / \
-                                     (df_filtered['FANTASY_POINTS_PER_MIN'].max() - df_filtered['FANTASY_POINTS_PER_MIN'].min())
-
-df_filtered['NORM_GAMES_PCT'] = (df_filtered['PCT_GAMES_PLAYED'] - df_filtered['PCT_GAMES_PLAYED'].min()) / \
-                               (df_filtered['PCT_GAMES_PLAYED'].max() - df_filtered['PCT_GAMES_PLAYED'].min())
-
-# Try different weightings to find optimal combination
-weights = []
-for w_min in [0.2, 0.3, 0.4, 0.5]:
-    for w_fpm in [0.2, 0.3, 0.4, 0.5]:
-        for w_gp in [0.2, 0.3, 0.4, 0.5]:
-            if abs(w_min + w_fpm + w_gp - 1.0) < 0.001:  # Ensure weights sum to 1
-                weights.append((w_min, w_fpm, w_gp))
-
-correlations_by_weight = {}
-
-print("\nTesting different weight combinations:")
-print("---------------------------------------------------------------")
-print("Weight for % Minutes | Weight for Points/Min | Weight for % Games | Correlation")
-print("---------------------------------------------------------------")
-
-for w_min, w_fpm, w_gp in weights:
-    # Create weighted score
-    df_filtered[f'WEIGHTED_SCORE_{w_min}_{w_fpm}_{w_gp}'] = (
-        w_min * df_filtered['NORM_MINUTES_PCT'] + 
-        w_fpm * df_filtered['NORM_FANTASY_PER_MIN'] +
-        w_gp * df_filtered['NORM_GAMES_PCT']
-    )
-    
-    # Check correlation with total fantasy points
-    corr = df_filtered[f'WEIGHTED_SCORE_{w_min}_{w_fpm}_{w_gp}'].corr(df_filtered['FANTASY_POINTS'])
-    correlations_by_weight[(w_min, w_fpm, w_gp)] = corr
-    print(f"      {w_min:.2f}         |        {w_fpm:.2f}         |       {w_gp:.2f}       |   {corr:.4f}")
-
-# Find best weighting
-best_weights = max(correlations_by_weight.items(), key=lambda x: x[1])
-w_min_best, w_fpm_best, w_gp_best = best_weights[0]
-print("\n---------------------------------------------------------------")
-print(f"Best weights: {w_min_best:.2f} for % minutes, {w_fpm_best:.2f} for points per minute, {w_gp_best:.2f} for % games played")
-print(f"Best correlation: {best_weights[1]:.4f}")
-
-# Explain the meaning of the weights
-print("\nWhat these weights mean:")
-print(f"- % Minutes Played ({w_min_best:.2f}): How much of all possible minutes a player plays")
-print(f"- Fantasy Points Per Minute ({w_fpm_best:.2f}): How efficient a player is when on the court")
-print(f"- % Games Played ({w_gp_best:.2f}): How reliable a player is in terms of availability")
-print("\nThese weights create a balanced ranking that accounts for player efficiency,")
-print("playing time, and durability - all key factors for fantasy basketball success.")
-
-# Create final ranking score using the best weights
-df_filtered['FANTASY_RANK_SCORE'] = (
-    w_min_best * df_filtered['NORM_MINUTES_PCT'] + 
-    w_fpm_best * df_filtered['NORM_FANTASY_PER_MIN'] +
-    w_gp_best * df_filtered['NORM_GAMES_PCT']
-)
-
-# Calculate percentile rank (0-100 scale, higher is better)
-df_filtered['FANTASY_RANK_PERCENTILE'] = df_filtered['FANTASY_RANK_SCORE'].rank(pct=True) * 100
-
-# Sort by the ranking score
-df_ranked = df_filtered.sort_values('FANTASY_RANK_SCORE', ascending=False)
-
-# Display top players (now aggregated across seasons)
-print("\nTop 15 players (aggregated across seasons):")
-top_players = df_ranked.head(15)
-print(top_players[['PLAYER_NAME', 'TEAM_ABBREVIATION', 'GP', 'PCT_GAMES_PLAYED', 'AVG_MINUTES', 
-                   'FANTASY_POINTS_PER_MIN', 'PCT_MINUTES_PLAYED', 'FANTASY_RANK_SCORE', 
-                   'FANTASY_RANK_PERCENTILE', 'FANTASY_POINTS']])
-
-# Save detailed rankings to CSV
-df_ranking_output = df_ranked[['PLAYER_NAME', 'TEAM_ABBREVIATION', 
-                             'FANTASY_RANK_SCORE', 'FANTASY_RANK_PERCENTILE',
-                             'FANTASY_POINTS_PER_MIN', 'PCT_MINUTES_PLAYED', 'PCT_GAMES_PLAYED',
-                             'GP', 'AVG_MINUTES', 'FANTASY_POINTS', 'AVG_FANTASY_PPG']]
-
-df_ranking_output.to_csv('nba_fantasy_rankings_three_metrics.csv', index=False)
-print("\nDetailed rankings saved to nba_fantasy_rankings_three_metrics.csv") 
\ No newline at end of file
+# Metrics ranked on by default; every metric added multiplies the weight grid
+DEFAULT_METRICS = ['PCT_MINUTES_PLAYED', 'FANTASY_POINTS_PER_MIN', 'PCT_GAMES_PLAYED']
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='NBA Fantasy Basketball Player Rankings')
+    parser.add_argument('--league', type=str, default=DEFAULT_LEAGUE,
+                        help='Scoring system (league key from scoring_systems.json) to rank by')
+    parser.add_argument('--form-window', type=int, default=None,
+                        help='Rank on rolling form over the last N days (from box_scores.py) instead of season totals')
+    parser.add_argument('--min-games', type=int, default=None,
+                        help='Minimum games played to be ranked (default: 20, or a quarter of the form window)')
+    parser.add_argument('--metrics', nargs='+', choices=list(RANKING_METRICS),
+                        default=DEFAULT_METRICS,
+                        help='Metrics combined into the ranking score')
+    parser.add_argument('--weight-step', type=float, default=0.01, help='Grid step of the weight search over the simplex')
+    parser.add_argument('--min-weight', type=float, default=0.0, help='Smallest weight any metric may get')
+    parser.add_argument('--max-weight', type=float, default=1.0, help='Largest weight any metric may get')
+    parser.add_argument('--method', choices=['pearson', 'spearman'], default='pearson',
+                        help='Correlation used to score weight combinations against total fantasy points')
+    parser.add_argument('--refine', action='store_true', help='Refine the best grid point with a continuous optimizer')
+    parser.add_argument('--show', type=int, default=10, help='Number of top weight combinations to print')
+    parser.add_argument('--bootstrap', type=int, default=0, help='Number of bootstrap resamples used to check the stability of the weights')
+    parser.add_argument('--holdout', action='store_true', help='Also run leave-one-season-out folds of the weight search')
+    parser.add_argument('--candidates', type=int, default=200, help='Number of top weight combinations analyzed when resampling')
+    parser.add_argument('--batch-size', type=int, default=100, help='Bootstrap resamples per stacked batch')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for resampling (default: CPU count)')
+    parser.add_argument('--confidence', type=float, default=0.95, help='Confidence level of the resampling intervals')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for bootstrap resampling')
+    add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def report_weight_stability(df, X, y, weight_grid, grid_correlations, metric_columns, args, min_games=20,
+                            min_minutes=10):
+    """
+    Bootstrap and season-holdout resampling of the weight search, with a stability ranking.
+    X and y are the players that passed `min_games`/`min_minutes`; each holdout fold
+    re-aggregates `df` with the same thresholds.
+    """
+    candidates = top_candidates(grid_correlations, args.candidates)
+    weights = weight_grid[candidates]
+    metric_names = [RANKING_METRICS[metric][1] for metric in metric_columns]
+
+    if args.bootstrap:
+        start_time = time.perf_counter()
+        samples = run_bootstrap(X, y, weights, n_resamples=args.bootstrap, batch_size=args.batch_size,
+                                workers=args.workers, seed=args.seed, method=args.method)
+        elapsed = time.perf_counter() - start_time
+        summary = summarize_stability(weights, samples, grid_correlations[candidates],
+                                      metric_names, args.confidence)
+        print(f"\nBootstrap: {args.bootstrap} resamples x {len(weights)} weight combinations in {elapsed:.2f}s")
+        print_stability(summary, metric_names, args)
+        summary.to_csv('weight_stability_bootstrap.csv', index=False)
+        print("Bootstrap stability saved to weight_stability_bootstrap.csv")
+
+    if args.holdout:
+        if 'SEASON' not in df.columns or df['SEASON'].nunique() < 2:
+            print("\nSeason holdout needs data from at least two seasons - skipping")
+            return
+        start_time = time.perf_counter()
+        seasons, folds = run_season_holdout(df, metric_columns, weights, workers=args.workers, method=args.method,
+                                            min_games=min_games, min_minutes=min_minutes)
+        elapsed = time.perf_counter() - start_time
+        summary = summarize_stability(weights, folds, grid_correlations[candidates],
+                                      metric_names, args.confidence)
+        print(f"\nSeason holdout: {len(seasons)} folds ({', '.join(seasons)}) in {elapsed:.2f}s")
+        print_stability(summary, metric_names, args)
+        summary.to_csv('weight_stability_holdout.csv', index=False)
+        print("Season holdout stability saved to weight_stability_holdout.csv")
+
+
+def print_stability(summary, metric_names, args):
+    """Print the most stable weight combinations with their confidence intervals"""
+    print("---------------------------------------------------------------")
+    print(" | ".join(f"{name:>10}" for name in metric_names) +
+          f" | Correlation [{args.confidence:.0%} CI]    | Best in | Mean rank")
+    print("---------------------------------------------------------------")
+    weight_columns = [f'W_{name}' for name in metric_names]
+    for _, row in summary.head(args.show).iterrows():
+        print(" | ".join(f"{row[col]:>10.2f}" for col in weight_columns) +
+              f" | {row['MEAN_CORR']:.4f} [{row['CI_LOW']:.4f}, {row['CI_HIGH']:.4f}]"
+              f" | {row['BEST_FREQUENCY']:>6.1%} | {row['MEAN_RANK']:>8.1f}")
+
+
+# Columns the ranking needs from the fantasy data
+INPUT_COLUMNS = ['SEASON', 'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ABBREVIATION', 'GP', 'AVG_MINUTES',
+                 'FANTASY_POINTS', 'AVG_FANTASY_PPG', 'FANTASY_POINTS_PER_MIN',
+                 'PCT_MINUTES_PLAYED', 'PCT_GAMES_PLAYED']
+
+# Columns of the saved rankings
+OUTPUT_COLUMNS = ['PLAYER_ID', 'PLAYER_NAME', 'TEAM_ABBREVIATION', 
+                  'FANTASY_RANK_SCORE', 'FANTASY_RANK_PERCENTILE',
+                  'FANTASY_POINTS_PER_MIN', 'PCT_MINUTES_PLAYED', 'PCT_GAMES_PLAYED',
+                  'GP', 'AVG_MINUTES', 'FANTASY_POINTS', 'AVG_FANTASY_PPG']
+
+
+def load_stats(league=DEFAULT_LEAGUE, form_window=None):
+    """
+    Load the per-season fantasy data with `league`'s fantasy points in the base columns.
+    With `form_window`, the rolling form over that many days is loaded instead.
+    Raises FileNotFoundError if there is no data and KeyError if the league was not scored.
+    """
+    # Only the columns the ranking needs are loaded from the store
+    columns = INPUT_COLUMNS + [col for col in league_columns([league]) if col not in INPUT_COLUMNS]
+    if form_window:
+        df = load_frame(form_table(form_window), form_csv(form_window), columns=columns)
+    else:
+        df = load_frame(STATS_TABLE, 'nba_fantasy_stats_new.csv', columns=columns)
+    return select_league(df, league)
+
+
+def normalize_metrics(df, metric_columns):
+    """Add the 0-1 normalized NORM_* column of each metric and return the players x metrics matrix"""
+    norm_columns = [RANKING_METRICS[metric][0] for metric in metric_columns]
+    X = min_max_normalize(df[metric_columns].to_numpy(dtype=np.float64))
+    df[norm_columns] = X
+    return X
+
+
+def rank_players(df, X, weights):
+    """Score the players with `weights`, add their percentile and sort best first"""
+    df = df.copy()
+    df['FANTASY_RANK_SCORE'] = X @ np.asarray(weights, dtype=np.float64)
+
+    # Calculate percentile rank (0-100 scale, higher is better)
+    df['FANTASY_RANK_PERCENTILE'] = df['FANTASY_RANK_SCORE'].rank(pct=True) * 100
+
+    # Sort by the ranking score
+    return df.sort_values('FANTASY_RANK_SCORE', ascending=False)
+
+
+def save_rankings(df_ranked, league=DEFAULT_LEAGUE, form_window=None):
+    """Write the rankings to the data store (when pyarrow is available) and to CSV"""
+    df_ranking_output = df_ranked[[col for col in OUTPUT_COLUMNS if col in df_ranked.columns]]
+    table, csv_path = rankings_table(league, form_window), rankings_csv(league, form_window)
+
+    if pyarrow_available():
+        write_table(df_ranking_output, table)
+        print(f"\nDetailed rankings saved to the data store table '{table}'")
+
+    df_ranking_output.to_csv(csv_path, index=False)
+    print(f"\nDetailed rankings saved to {csv_path}")
+    return df_ranking_output
+
+
+@instrumented('rank')
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Load the fantasy data, ranked by the selected league's fantasy points
+    try:
+        with stage('load') as metrics:
+            df = load_stats(args.league, args.form_window)
+            metrics.rows_out = len(df)
+    except FileNotFoundError:
+        if args.form_window:
+            print(f"Error: No {args.form_window}-day form data found. Run box_scores.py --windows {args.form_window} first.")
+        else:
+            print("Error: File 'nba_fantasy_stats_new.csv' not found.")
+        return 1
+    except KeyError as e:
+        print(f"Error: {e}. Re-run nba_api.py with that league in the scoring file.")
+        return 1
+    if args.league != DEFAULT_LEAGUE:
+        print(f"Ranking with the '{args.league}' scoring system")
+    if args.form_window:
+        print(f"Ranking on form over the last {args.form_window} days")
+
+    # Aggregate data across seasons, applying the minimum games and minutes filters
+    min_games = args.min_games
+    if min_games is None:
+        min_games = max(1, args.form_window // 4) if args.form_window else 20
+    min_minutes = 10
+    with stage('aggregate', rows_in=len(df)) as metrics:
+        df_filtered = aggregate_players(df, min_games=min_games, min_minutes=min_minutes)
+        metrics.rows_out = len(df_filtered)
+
+    print(f"Total players in original data: {len(df)}")
+    print(f"Players after aggregating and filtering: {len(df_filtered)}")
+
+    # Analyze correlation between key metrics and total fantasy points
+    print("\nCorrelation with total FANTASY_POINTS:")
+    correlations = {
+        'AVG_FANTASY_PPG': df_filtered['AVG_FANTASY_PPG'].corr(df_filtered['FANTASY_POINTS']),
+        'PCT_MINUTES_PLAYED': df_filtered['PCT_MINUTES_PLAYED'].corr(df_filtered['FANTASY_POINTS']),
+        'PCT_GAMES_PLAYED': df_filtered['PCT_GAMES_PLAYED'].corr(df_filtered['FANTASY_POINTS']),
+        'AVG_MINUTES': df_filtered['AVG_MINUTES'].corr(df_filtered['FANTASY_POINTS']),
+        'GP': df_filtered['GP'].corr(df_filtered['FANTASY_POINTS']),
+        'FANTASY_POINTS_PER_MIN': df_filtered['FANTASY_POINTS_PER_MIN'].corr(df_filtered['FANTASY_POINTS'])
+    }
+
+    for metric, corr in sorted(correlations.items(), key=lambda x: abs(x[1]), reverse=True):
+        print(f"{metric}: {corr:.4f}")
+
+    # Check for correlation between our key metrics
+    print("\nCorrelations between key metrics:")
+    print(f"% Minutes vs Fantasy Points Per Min: {df_filtered['PCT_MINUTES_PLAYED'].corr(df_filtered['FANTASY_POINTS_PER_MIN']):.4f}")
+    print(f"% Games Played vs % Minutes: {df_filtered['PCT_GAMES_PLAYED'].corr(df_filtered['PCT_MINUTES_PLAYED']):.4f}")
+    print(f"% Games Played vs Fantasy Points Per Min: {df_filtered['PCT_GAMES_PLAYED'].corr(df_filtered['FANTASY_POINTS_PER_MIN']):.4f}")
+
+    # Develop a combined ranking metric
+    # Normalize each metric to a 0-1 scale
+    metric_columns = args.metrics
+    X = normalize_metrics(df_filtered, metric_columns)
+
+    # Score every weight combination on the simplex grid in one matrix operation
+    y = df_filtered['FANTASY_POINTS'].to_numpy(dtype=np.float64)
+    start_time = time.perf_counter()
+    with stage('weights', rows_in=len(df_filtered)) as metrics:
+        weight_grid, grid_correlations, best_weights, best_correlation = search_weights(
+            X, y, step=args.weight_step, min_weight=args.min_weight, max_weight=args.max_weight,
+            method=args.method, refine=args.refine
+        )
+        metrics.rows_out = len(weight_grid)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"\nTested {len(weight_grid)} weight combinations (step {args.weight_step}, "
+          f"{args.method} correlation) in {elapsed * 1000:.1f} ms")
+    print("---------------------------------------------------------------")
+    print(" | ".join(f"{RANKING_METRICS[metric][1]:>10}" for metric in metric_columns) + " | Correlation")
+    print("---------------------------------------------------------------")
+    for i in np.argsort(-np.nan_to_num(grid_correlations, nan=-np.inf))[:args.show]:
+        print(" | ".join(f"{w:>10.2f}" for w in weight_grid[i]) + f" |   {grid_correlations[i]:.4f}")
+
+    # Find best weighting
+    print("\n---------------------------------------------------------------")
+    print("Best weights: " + ", ".join(f"{w:.2f} for {RANKING_METRICS[metric][1]}"
+                                       for metric, w in zip(metric_columns, best_weights)))
+    if args.refine:
+        print("(refined beyond the grid by the continuous optimizer)")
+    print(f"Best correlation: {best_correlation:.4f}")
+
+    # Explain the meaning of the weights
+    print("\nWhat these weights mean:")
+    for metric, w in zip(metric_columns, best_weights):
+        print(f"- {RANKING_METRICS[metric][1]} ({w:.2f}): {RANKING_METRICS[metric][2]}")
+    print("\nThese weights create a balanced ranking that accounts for player efficiency,")
+    print("playing time, and durability - all key factors for fantasy basketball success.")
+
+    # Check how stable the best weights are under resampling
+    if args.bootstrap or args.holdout:
+        with stage('stability', rows_in=len(df_filtered)):
+            report_weight_stability(df, X, y, weight_grid, grid_correlations, metric_columns, args,
+                                    min_games, min_minutes)
+
+    # Create final ranking score using the best weights
+    with stage('rank', rows_in=len(df_filtered)) as metrics:
+        df_ranked = rank_players(df_filtered, X, best_weights)
+        metrics.rows_out = len(df_ranked)
+
+    # Display top players (now aggregated across seasons)
+    print("\nTop 15 players (aggregated across seasons):")
+    top_players = df_ranked.head(15)
+    print(top_players[['PLAYER_NAME', 'TEAM_ABBREVIATION', 'GP', 'PCT_GAMES_PLAYED', 'AVG_MINUTES', 
+                       'FANTASY_POINTS_PER_MIN', 'PCT_MINUTES_PLAYED', 'FANTASY_RANK_SCORE', 
+                       'FANTASY_RANK_PERCENTILE', 'FANTASY_POINTS']])
+
+    # Save detailed rankings to CSV
+    with stage('save', rows_in=len(df_ranked)):
+        save_rankings(df_ranked, args.league, args.form_window)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
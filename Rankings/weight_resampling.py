@@ -0,0 +1,133 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from aggregation import aggregate_players
+from weight_search import min_max_normalize, score_correlations
+
+
+def bootstrap_correlations(X, y, weights, n_resamples, seed, method='pearson'):
+    """
+    Correlations of every weight vector for `n_resamples` bootstrap resamples of the
+    players, computed as one stacked operation. Returns (n_resamples, n_weights).
+    Each resample's metrics are min-max normalized again, as the holdout folds are.
+
+    For Pearson the weighted score is linear in the metrics, so each resample only
+    needs the metrics' covariance matrix and their covariance with y:
+    corr(Xw, y) = w.Cxy / sqrt(w'Cxx w * var(y)).
+    """
+    rng = np.random.default_rng(seed)
+    n_players = len(X)
+    index = rng.integers(0, n_players, size=(n_resamples, n_players))
+
+    if method == 'spearman':
+        # Ranks depend on the full score vector, so fall back to scoring each resample
+        return np.array([score_correlations(min_max_normalize(X[i]), y[i], weights, 'spearman') for i in index])
+
+    Xb = X[index]
+    yb = y[index]
+    low = Xb.min(axis=1, keepdims=True)
+    span = Xb.max(axis=1, keepdims=True) - low
+    span[span == 0] = 1
+    Xb = (Xb - low) / span
+    Xb = Xb - Xb.mean(axis=1, keepdims=True)
+    yb = yb - yb.mean(axis=1, keepdims=True)
+
+    cov_xy = np.einsum('bnm,bn->bm', Xb, yb)
+    cov_xx = np.einsum('bnm,bnk->bmk', Xb, Xb)
+    var_y = np.einsum('bn,bn->b', yb, yb)
+
+    numerator = cov_xy @ weights.T
+    score_var = np.einsum('bmk,mk->bk', cov_xx @ weights.T, weights.T)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return numerator / np.sqrt(score_var * var_y[:, None])
+
+
+def _bootstrap_batch(task):
+    X, y, weights, n_resamples, seed, method = task
+    return bootstrap_correlations(X, y, weights, n_resamples, seed, method).astype(np.float32)
+
+
+def run_bootstrap(X, y, weights, n_resamples=2000, batch_size=100, workers=None, seed=0, method='pearson'):
+    """
+    Spread bootstrap batches across a process pool.
+    Returns an (n_resamples, n_weights) array of correlations.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+
+    batches = [min(batch_size, n_resamples - start) for start in range(0, n_resamples, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    tasks = [(X, y, weights, size, batch_seed, method) for size, batch_seed in zip(batches, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        return np.vstack([_bootstrap_batch(task) for task in tasks])
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        return np.vstack(list(executor.map(_bootstrap_batch, tasks)))
+
+
+def _holdout_fold(task):
+    df, season, metric_columns, weights, method, min_games, min_minutes = task
+    fold = aggregate_players(df[df['SEASON'] != season], min_games=min_games, min_minutes=min_minutes)
+    if len(fold) < 3:
+        return np.full(len(weights), np.nan, dtype=np.float32)
+    X = min_max_normalize(fold[metric_columns].to_numpy(dtype=np.float64))
+    y = fold['FANTASY_POINTS'].to_numpy(dtype=np.float64)
+    return score_correlations(X, y, weights, method).astype(np.float32)
+
+
+def run_season_holdout(df, metric_columns, weights, workers=None, method='pearson',
+                       min_games=20, min_minutes=10):
+    """
+    Leave-one-season-out folds: re-aggregate and re-normalize the players without
+    each season and score every weight vector. Returns (seasons, correlations).
+    """
+    seasons = sorted(df['SEASON'].astype(str).unique())
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    tasks = [(df, season, metric_columns, weights, method, min_games, min_minutes) for season in seasons]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        results = [_holdout_fold(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            results = list(executor.map(_holdout_fold, tasks))
+    return seasons, np.vstack(results) if results else np.empty((0, len(weights)))
+
+
+def summarize_stability(weights, correlations, full_sample, metric_names, confidence=0.95):
+    """
+    Confidence intervals and a stability ranking for each weight vector.
+    `correlations` is (resamples, weight vectors). Stability is how often a vector
+    is the best one in a resample, then its mean rank across resamples.
+    """
+    correlations = np.nan_to_num(np.asarray(correlations, dtype=np.float64), nan=-np.inf)
+    alpha = (1 - confidence) / 2
+
+    best = np.argmax(correlations, axis=1)
+    best_frequency = np.bincount(best, minlength=len(weights)) / len(correlations)
+    # Rank 1 = highest correlation within the resample
+    ranks = np.argsort(np.argsort(-correlations, axis=1, kind='stable'), axis=1) + 1
+
+    finite = np.where(np.isfinite(correlations), correlations, np.nan)
+    summary = pd.DataFrame(weights, columns=[f'W_{name}' for name in metric_names])
+    summary['FULL_SAMPLE_CORR'] = full_sample
+    summary['MEAN_CORR'] = np.nanmean(finite, axis=0)
+    summary['CI_LOW'] = np.nanquantile(finite, alpha, axis=0)
+    summary['CI_HIGH'] = np.nanquantile(finite, 1 - alpha, axis=0)
+    summary['BEST_FREQUENCY'] = best_frequency
+    summary['MEAN_RANK'] = ranks.mean(axis=0)
+
+    summary = summary.sort_values(['BEST_FREQUENCY', 'MEAN_RANK'], ascending=[False, True])
+    summary['STABILITY_RANK'] = np.arange(1, len(summary) + 1)
+    return summary.reset_index(drop=True)
+
+
+def top_candidates(correlations, n_candidates):
+    """Indices of the best `n_candidates` weight vectors by full-sample correlation"""
+    order = np.argsort(-np.nan_to_num(correlations, nan=-np.inf), kind='stable')
+    return order[:n_candidates]
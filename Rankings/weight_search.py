@@ -0,0 +1,134 @@
+import itertools
+
+import numpy as np
+
+# Keep the players x weights score matrix under this many cells per chunk
+MAX_CHUNK_CELLS = 4_000_000
+
+
+def simplex_grid(n_metrics, step=0.01, min_weight=0.0, max_weight=1.0):
+    """
+    All weight vectors on a regular grid over the simplex: every weight is a
+    multiple of `step` within [min_weight, max_weight] and each vector sums to 1.
+    Returns an array of shape (n_combinations, n_metrics).
+    """
+    units = int(round(1 / step))
+    if abs(units * step - 1) > 1e-9:
+        raise ValueError(f"step must divide 1 evenly, got {step}")
+
+    if n_metrics == 1:
+        return np.ones((1, 1))
+
+    # Stars and bars: choose the n_metrics - 1 bar positions among units + n_metrics - 1 slots
+    bars = np.array(list(itertools.combinations(range(units + n_metrics - 1), n_metrics - 1)), dtype=np.int64)
+    edges = np.hstack([np.full((len(bars), 1), -1), bars, np.full((len(bars), 1), units + n_metrics - 1)])
+    counts = np.diff(edges, axis=1) - 1
+
+    weights = counts / units
+    keep = np.all((weights >= min_weight - 1e-9) & (weights <= max_weight + 1e-9), axis=1)
+    return weights[keep]
+
+
+def min_max_normalize(X):
+    """Scale each column of X to 0-1 (constant columns become 0)"""
+    X = np.asarray(X, dtype=np.float64)
+    low = X.min(axis=0)
+    span = X.max(axis=0) - low
+    span[span == 0] = 1
+    return (X - low) / span
+
+
+def rank_columns(S):
+    """Rank each column of S (average ranks for ties), for Spearman correlation"""
+    try:
+        from scipy.stats import rankdata
+        return rankdata(S, axis=0)
+    except ImportError:
+        # Ordinal ranks - ties broken by position
+        ranks = np.empty_like(S, dtype=np.float64)
+        order = np.argsort(S, axis=0, kind='stable')
+        np.put_along_axis(ranks, order, np.arange(1, S.shape[0] + 1, dtype=np.float64)[:, None], axis=0)
+        return ranks
+
+
+def pearson_columns(S, y):
+    """Pearson correlation of every column of S with y, in one pass"""
+    S_centered = S - S.mean(axis=0)
+    y_centered = y - y.mean()
+    numerator = y_centered @ S_centered
+    denominator = np.sqrt((S_centered ** 2).sum(axis=0) * (y_centered @ y_centered))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return numerator / denominator
+
+
+def score_correlations(X, y, weights, method='pearson'):
+    """
+    Correlation with `y` of the weighted score X @ w for every weight vector.
+    X is players x metrics, weights is combinations x metrics. The score matrix
+    is built in chunks of weight vectors so memory stays bounded for large grids.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    if method == 'spearman':
+        y = rank_columns(y[:, None])[:, 0]
+
+    chunk = max(1, MAX_CHUNK_CELLS // max(1, len(X)))
+    correlations = np.empty(len(weights))
+    for start in range(0, len(weights), chunk):
+        scores = X @ weights[start:start + chunk].T
+        if method == 'spearman':
+            scores = rank_columns(scores)
+        correlations[start:start + chunk] = pearson_columns(scores, y)
+    return correlations
+
+
+def refine_weights(X, y, initial, method='pearson', step=0.01, tolerance=1e-5, min_weight=0.0, max_weight=1.0):
+    """
+    Continuous refinement of a grid optimum by pattern search on the simplex:
+    repeatedly move `step` of weight from one metric to another while that improves
+    the correlation, halving the step when no move helps. Moves are shortened so
+    every weight stays within [min_weight, max_weight].
+    Returns (weights, correlation).
+    """
+    weights = np.asarray(initial, dtype=np.float64).copy()
+    best = score_correlations(X, y, weights, method)[0]
+    n_metrics = len(weights)
+    pairs = [(i, j) for i in range(n_metrics) for j in range(n_metrics) if i != j]
+
+    while step > tolerance:
+        candidates = []
+        for i, j in pairs:
+            moved = weights.copy()
+            amount = min(step, moved[j] - min_weight, max_weight - moved[i])
+            if amount <= 0:
+                continue
+            moved[i] += amount
+            moved[j] -= amount
+            candidates.append(moved)
+        if not candidates:
+            break
+        candidates = np.array(candidates)
+        correlations = score_correlations(X, y, candidates, method)
+        best_index = int(np.nanargmax(correlations))
+        if correlations[best_index] > best + 1e-12:
+            weights, best = candidates[best_index], correlations[best_index]
+        else:
+            step /= 2
+    return weights, best
+
+
+def search_weights(X, y, step=0.01, min_weight=0.0, max_weight=1.0, method='pearson', refine=False):
+    """
+    Evaluate every weight vector on the simplex grid at once.
+    Returns (weights, correlations, best_weights, best_correlation); with `refine`
+    the best grid point is polished by the continuous optimizer.
+    """
+    weights = simplex_grid(X.shape[1], step, min_weight, max_weight)
+    correlations = score_correlations(X, y, weights, method)
+    best_index = int(np.nanargmax(correlations))
+    best_weights, best_correlation = weights[best_index], correlations[best_index]
+    if refine:
+        best_weights, best_correlation = refine_weights(X, y, best_weights, method, step=step / 2,
+                                                         min_weight=min_weight, max_weight=max_weight)
+    return weights, correlations, best_weights, best_correlation
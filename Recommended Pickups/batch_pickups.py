@@ -0,0 +1,183 @@
+"""
+Pickup recommendations for many fantasy leagues in one run.
+
+    python "Recommended Pickups/batch_pickups.py" --dir waivers/
+    python "Recommended Pickups/batch_pickups.py" --manifest leagues.csv --workers 8
+
+With --dir, every CSV file in the directory is one league's available players
+(the league is named after the file). A manifest is a CSV with a NAME and a FILE
+column, plus optional SCORING (league key of the scoring system) and TOP columns;
+relative FILE paths are resolved against the manifest's directory.
+
+The rankings of each scoring system are loaded and indexed once, handed to every
+worker process once, and all leagues' picks are written to one combined CSV.
+"""
+import pandas as pd
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from name_index import DEFAULT_MIN_SCORE, NameIndex
+from recommend_pickups import PICKUP_COLUMNS, find_best_pickups, load_rankings, read_available_players
+
+DEFAULT_OUTPUT = 'pickups_batch.csv'
+
+# Rankings and name indexes per scoring system, set once in each worker
+_RANKINGS = {}
+
+
+def read_manifest(path, default_top=10, default_scoring=None):
+    """Read a manifest CSV into a list of league dicts (name, file, scoring, top)"""
+    manifest = pd.read_csv(path)
+    missing = {'NAME', 'FILE'} - set(manifest.columns)
+    if missing:
+        raise ValueError(f"Manifest '{path}' is missing column(s): {', '.join(sorted(missing))}")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    leagues = []
+    for row in manifest.to_dict('records'):
+        scoring = row.get('SCORING')
+        top = row.get('TOP')
+        leagues.append({
+            'name': str(row['NAME']),
+            'file': os.path.join(base_dir, str(row['FILE'])),
+            'scoring': default_scoring if pd.isna(scoring) else str(scoring),
+            'top': default_top if pd.isna(top) else int(top),
+        })
+    return leagues
+
+
+def leagues_from_directory(directory, default_top=10, default_scoring=None):
+    """One league per CSV file in `directory`, named after the file"""
+    leagues = []
+    for entry in sorted(os.listdir(directory)):
+        if entry.lower().endswith('.csv'):
+            leagues.append({
+                'name': os.path.splitext(entry)[0],
+                'file': os.path.join(directory, entry),
+                'scoring': default_scoring,
+                'top': default_top,
+            })
+    return leagues
+
+
+def load_all_rankings(scoring_keys):
+    """Load and index the rankings of every scoring system once"""
+    rankings = {}
+    for scoring in scoring_keys:
+        rankings_df = load_rankings(scoring)
+        rankings[scoring] = (rankings_df, NameIndex(rankings_df['PLAYER_NAME']))
+    return rankings
+
+
+def _init_worker(rankings):
+    _RANKINGS.clear()
+    _RANKINGS.update(rankings)
+
+
+def recommend_for_league(league, min_score=DEFAULT_MIN_SCORE):
+    """
+    Picks for one league. Returns (picks, unmatched names, error); picks carry the
+    league's NAME and PICK_RANK ahead of the usual recommendation columns.
+    """
+    try:
+        available_players = read_available_players(league['file'])
+    except Exception as e:
+        return None, [], f"{type(e).__name__}: {e}"
+
+    rankings_df, index = _RANKINGS[league['scoring']]
+    picks, unmatched = find_best_pickups(rankings_df, available_players, league['top'],
+                                         index=index, min_score=min_score)
+    picks = picks.reset_index(drop=True)
+    picks.insert(0, 'PICK_RANK', range(1, len(picks) + 1))
+    picks.insert(0, 'FANTASY_LEAGUE', league['name'])
+    return picks, unmatched, None
+
+
+def _recommend_task(task):
+    league, min_score = task
+    return recommend_for_league(league, min_score)
+
+
+def run_batch(leagues, rankings, workers=None, min_score=DEFAULT_MIN_SCORE):
+    """
+    Recommend picks for every league, spread across a process pool.
+    Returns one list of (picks, unmatched, error) per league, in order.
+    """
+    tasks = [(league, min_score) for league in leagues]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        _init_worker(rankings)
+        return [_recommend_task(task) for task in tasks]
+
+    # Each worker receives the rankings once through the initializer
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=_init_worker,
+                             initargs=(rankings,)) as executor:
+        return list(executor.map(_recommend_task, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Batch pickup recommendations for many leagues')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--dir', '-d', help='Directory with one available-players CSV per league')
+    source.add_argument('--manifest', '-m', help='CSV with NAME, FILE and optional SCORING and TOP columns')
+    parser.add_argument('--top', '-t', type=int, default=10, help='Number of picks per league (unless the manifest sets TOP)')
+    parser.add_argument('--league', '-l', help='Scoring system (league key) for leagues without a SCORING column')
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE,
+                        help='Minimum confidence (0-1) for a fuzzy name match')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--output', '-o', default=DEFAULT_OUTPUT, help='Combined output CSV file')
+    args = parser.parse_args(argv)
+
+    print("NBA Fantasy Basketball Batch Pickup Recommendations")
+    print("===================================================")
+
+    try:
+        if args.manifest:
+            leagues = read_manifest(args.manifest, args.top, args.league)
+        else:
+            leagues = leagues_from_directory(args.dir, args.top, args.league)
+    except (OSError, ValueError) as e:
+        print(f"Error reading the league list: {e}")
+        return 1
+    if not leagues:
+        print("No leagues found. Exiting.")
+        return 1
+
+    # Rankings are loaded and indexed once per scoring system
+    rankings = load_all_rankings(sorted({league['scoring'] for league in leagues}, key=str))
+
+    start_time = time.perf_counter()
+    results = run_batch(leagues, rankings, args.workers, args.min_score)
+    elapsed = time.perf_counter() - start_time
+
+    all_picks = []
+    unmatched_rows = []
+    failed = 0
+    for league, (picks, unmatched, error) in zip(leagues, results):
+        if error:
+            print(f"{league['name']}: error reading {league['file']}: {error}")
+            failed += 1
+            continue
+        all_picks.append(picks)
+        unmatched_rows += [{'FANTASY_LEAGUE': league['name'], 'INPUT_NAME': name} for name in unmatched]
+        note = f", {len(unmatched)} names not found" if unmatched else ""
+        print(f"{league['name']}: {len(picks)} picks{note}")
+
+    columns = ['FANTASY_LEAGUE', 'PICK_RANK'] + PICKUP_COLUMNS
+    combined = pd.concat(all_picks, ignore_index=True) if all_picks else pd.DataFrame(columns=columns)
+    combined.to_csv(args.output, index=False)
+    print(f"\nPicks for {len(leagues) - failed} leagues saved to {args.output} ({elapsed:.2f}s)")
+
+    # Names that matched nothing are kept for review rather than dropped
+    if unmatched_rows:
+        unmatched_path = os.path.splitext(args.output)[0] + '_unmatched.csv'
+        pd.DataFrame(unmatched_rows).to_csv(unmatched_path, index=False)
+        print(f"{len(unmatched_rows)} unmatched names saved to {unmatched_path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import re
+import unicodedata
+from collections import Counter
+
+# Generational suffixes that sites include or leave out ("Jaren Jackson Jr.")
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# Confidence given to a match that only agrees once suffixes are dropped
+SUFFIX_MATCH_SCORE = 0.95
+
+# Fuzzy matches below this trigram similarity are reported as unmatched
+DEFAULT_MIN_SCORE = 0.6
+
+# Lookups are memoized; the memo is cleared once it holds this many names
+MAX_CACHED_LOOKUPS = 100_000
+
+# Apostrophes and periods join ("D'Angelo", "P.J."); other punctuation separates words
+_PUNCTUATION = str.maketrans({"'": '', '’': '', '.': '', '-': ' ', ',': ' ', '_': ' '})
+_SPACES = re.compile(r'\s+')
+
+
+def fold_accents(name):
+    """Strip accents: 'Nikola Jokić' -> 'Nikola Jokic'"""
+    if name.isascii():
+        return name
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def normalize_name(name, drop_suffix=False):
+    """
+    Comparable form of a player name: accents folded, lower case, punctuation
+    removed and whitespace collapsed. With `drop_suffix`, Jr./Sr./II... are removed too.
+    """
+    name = fold_accents(str(name)).lower().translate(_PUNCTUATION)
+    words = _SPACES.split(name.strip())
+    if drop_suffix and len(words) > 1 and words[-1] in NAME_SUFFIXES:
+        words = words[:-1]
+    return ' '.join(words)
+
+
+def trigrams(key):
+    """Character trigrams of a normalized name, padded so word edges count"""
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Lookup from free-form player names to row positions of a rankings table.
+    Built once per rankings table: an exact dict on the normalized name, a second
+    one ignoring suffixes, and a trigram inverted index for the fuzzy fallback.
+    """
+
+    def __init__(self, names):
+        self.names = [str(name) for name in names]
+        self.exact = {}
+        self.no_suffix = {}
+        for position, name in enumerate(self.names):
+            self.exact.setdefault(normalize_name(name), []).append(position)
+            self.no_suffix.setdefault(normalize_name(name, drop_suffix=True), []).append(position)
+
+        # Trigram -> keys (suffix-free names) that contain it
+        self.keys = list(self.no_suffix)
+        self.key_trigrams = [trigrams(key) for key in self.keys]
+        self.postings = {}
+        for key_id, grams in enumerate(self.key_trigrams):
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(key_id)
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, name, min_score=DEFAULT_MIN_SCORE):
+        """
+        Match one name. Returns (positions, score): the rankings rows for the name
+        and a confidence from 0 to 1 (1 = exact after normalization).
+        Returns ([], best score) when nothing reaches `min_score`.
+        """
+        cached = self._cache.get((name, min_score))
+        if cached is not None:
+            return cached
+
+        result = self._lookup(name, min_score)
+        if len(self._cache) >= MAX_CACHED_LOOKUPS:
+            self._cache.clear()
+        self._cache[(name, min_score)] = result
+        return result
+
+    def _lookup(self, name, min_score):
+        key = normalize_name(name)
+        if key in self.exact:
+            return self.exact[key], 1.0
+
+        key = normalize_name(name, drop_suffix=True)
+        if key in self.no_suffix:
+            return self.no_suffix[key], SUFFIX_MATCH_SCORE
+
+        # Fuzzy fallback: Dice similarity of trigram sets over the keys sharing any trigram
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+        if not shared:
+            return [], 0.0
+
+        best_id, best_score = None, 0.0
+        for key_id, count in shared.items():
+            score = 2 * count / (len(grams) + len(self.key_trigrams[key_id]))
+            if score > best_score:
+                best_id, best_score = key_id, score
+        best_score = round(best_score, 3)
+        if best_score < min_score:
+            return [], best_score
+        return self.no_suffix[self.keys[best_id]], best_score
+
+    def match(self, names, min_score=DEFAULT_MIN_SCORE):
+        """
+        Match a list of names. Returns (matches, unmatched) where `matches` is a list
+        of (name, position, score) for every rankings row found and `unmatched` lists
+        the names that could not be matched.
+        """
+        matches = []
+        unmatched = []
+        for name in names:
+            positions, score = self.lookup(name, min_score)
+            if not positions:
+                unmatched.append(name)
+            for position in positions:
+                matches.append((name, position, score))
+        return matches, unmatched
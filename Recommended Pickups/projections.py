@@ -0,0 +1,178 @@
+import os
+import sys
+import datetime
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# The shared data store lives with the ETL stage
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+from storage import rankings_csv
+
+# Schedule-aware projections. A local schedule file becomes a teams x days matrix
+# of games; indexing it by each player's team gives a players x days availability
+# matrix, and summing that over a date range gives the games each player has left.
+# A player's projection is then
+#     team games x games-played rate x minutes per game played x points per minute
+# computed for all players, date ranges and leagues as array products.
+MINUTES_PER_GAME = 48
+
+# Accepted column names of a schedule file
+SCHEDULE_COLUMNS = {
+    'GAME_DATE': ['GAME_DATE', 'DATE'],
+    'HOME_TEAM': ['HOME_TEAM', 'HOME', 'HOME_TEAM_ABBREVIATION'],
+    'AWAY_TEAM': ['AWAY_TEAM', 'AWAY', 'VISITOR', 'VISITOR_TEAM', 'AWAY_TEAM_ABBREVIATION'],
+}
+
+# Columns added to the rankings by project_rankings
+PROJECTION_COLUMNS = ['GAMES_LEFT', 'PROJ_POINTS_ROS', 'WEEK_GAMES', 'PROJ_POINTS_WEEK']
+
+
+def read_schedule(path):
+    """Read a schedule CSV (one row per game: date, home team, away team) into GAME_DATE/HOME_TEAM/AWAY_TEAM"""
+    df = pd.read_csv(path)
+    columns = {col.upper().strip(): col for col in df.columns}
+    renamed = {}
+    for name, aliases in SCHEDULE_COLUMNS.items():
+        match = next((columns[alias] for alias in aliases if alias in columns), None)
+        if match is None:
+            raise ValueError(f"Schedule file {path} has no {name} column (expected one of {', '.join(aliases)})")
+        renamed[match] = name
+    df = df[list(renamed)].rename(columns=renamed)
+    df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE']).dt.date
+    return df
+
+
+class Schedule:
+    """Games per team per day as a teams x days matrix, from the first to the last game date"""
+
+    def __init__(self, games_df):
+        dates = pd.to_datetime(games_df['GAME_DATE'])
+        self.start = dates.min().date()
+        self.end = dates.max().date()
+        self.teams = sorted(set(games_df['HOME_TEAM']) | set(games_df['AWAY_TEAM']))
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+
+        days = (dates - pd.Timestamp(self.start)).dt.days.to_numpy()
+        self.matrix = np.zeros((len(self.teams), (self.end - self.start).days + 1), dtype=np.float32)
+        for column in ('HOME_TEAM', 'AWAY_TEAM'):
+            teams = games_df[column].map(self.team_index).to_numpy()
+            np.add.at(self.matrix, (teams, days), 1)
+
+    def day(self, date):
+        """Column of `date`, clipped to the schedule"""
+        return min(max((date - self.start).days, 0), self.matrix.shape[1])
+
+    def window(self, start, end):
+        """Day weights (1 inside [start, end], 0 elsewhere) over the schedule's days"""
+        weights = np.zeros(self.matrix.shape[1], dtype=np.float32)
+        weights[self.day(start):self.day(end + datetime.timedelta(days=1))] = 1
+        return weights
+
+    def team_codes(self, teams):
+        """Rows of the matrix for team abbreviations; -1 for teams not in the schedule"""
+        return np.array([self.team_index.get(team, -1) for team in teams], dtype=np.int64)
+
+    def availability(self, team_codes):
+        """Players x days matrix of scheduled games (all zero for unknown teams)"""
+        padded = np.vstack([self.matrix, np.zeros((1, self.matrix.shape[1]), dtype=np.float32)])
+        return padded[team_codes]
+
+
+def matchup_week(as_of):
+    """Monday to Sunday of the fantasy week containing `as_of`"""
+    monday = as_of - datetime.timedelta(days=as_of.weekday())
+    return monday, monday + datetime.timedelta(days=6)
+
+
+def player_rates(pct_games, pct_minutes):
+    """
+    Games-played rate (0-1) and minutes per game played, from the ranking
+    percentages: minutes share of all team minutes over share of games played.
+    """
+    play_rate = np.clip(np.asarray(pct_games, dtype=np.float64) / 100, 0, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        minutes = np.where(play_rate > 0, np.asarray(pct_minutes, dtype=np.float64) / 100 * MINUTES_PER_GAME / play_rate, 0)
+    return play_rate, np.clip(minutes, 0, MINUTES_PER_GAME)
+
+
+def project_points(availability, windows, play_rate, minutes, points_per_min):
+    """
+    Projected games and fantasy points.
+    availability: players x days, windows: days x W day weights, play_rate and
+    minutes: per player, points_per_min: players x leagues.
+    Returns (games players x W, points players x W x leagues).
+    """
+    games = availability @ windows
+    expected_games = games * play_rate[:, None]
+    per_game = (minutes[:, None] * np.asarray(points_per_min, dtype=np.float64))
+    return games, expected_games[:, :, None] * per_game[:, None, :]
+
+
+def project_rankings(rankings_df, schedule, as_of=None, week_start=None):
+    """
+    Rankings with projected games and fantasy points for the rest of the season
+    (from `as_of`, default today) and for the matchup week starting `week_start`
+    (default: the week containing `as_of`). Returns a copy; `rankings_df` is not modified.
+    """
+    as_of = as_of or datetime.date.today()
+    week_start, week_end = matchup_week(week_start or as_of)
+    windows = np.column_stack([schedule.window(as_of, schedule.end),
+                               schedule.window(max(week_start, as_of), week_end)])
+
+    codes = schedule.team_codes(rankings_df['TEAM_ABBREVIATION'])
+    play_rate, minutes = player_rates(rankings_df['PCT_GAMES_PLAYED'], rankings_df['PCT_MINUTES_PLAYED'])
+    games, points = project_points(schedule.availability(codes), windows, play_rate, minutes,
+                                   rankings_df[['FANTASY_POINTS_PER_MIN']].to_numpy())
+
+    df = rankings_df.copy()
+    df['GAMES_LEFT'] = games[:, 0].astype(np.int64)
+    df['PROJ_POINTS_ROS'] = points[:, 0, 0].round(1)
+    df['WEEK_GAMES'] = games[:, 1].astype(np.int64)
+    df['PROJ_POINTS_WEEK'] = points[:, 1, 0].round(1)
+    return df
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Schedule-aware rest-of-season and weekly fantasy projections')
+    parser.add_argument('--schedule', '-s', required=True, help='CSV file of games (date, home team, away team)')
+    parser.add_argument('--league', '-l', help='Scoring system (league key) whose rankings to project')
+    parser.add_argument('--as-of', type=str, help='First day (YYYY-MM-DD) of the projection (default: today)')
+    parser.add_argument('--week-start', type=str, help='Any day (YYYY-MM-DD) of the matchup week to project (default: the current week)')
+    parser.add_argument('--top', '-t', type=int, default=15, help='Number of players to show')
+    parser.add_argument('--output', '-o', help='CSV file for the projections (default: next to the rankings)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from recommend_pickups import load_rankings
+
+    args = parse_args(argv)
+    try:
+        schedule = Schedule(read_schedule(args.schedule))
+        as_of = datetime.date.fromisoformat(args.as_of) if args.as_of else None
+        week_start = datetime.date.fromisoformat(args.week_start) if args.week_start else None
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    rankings_df = load_rankings(args.league)
+    projected = project_rankings(rankings_df, schedule, as_of, week_start)
+    missing = sorted(set(rankings_df['TEAM_ABBREVIATION']) - set(schedule.teams))
+    if missing:
+        print(f"Teams not in the schedule (projected at 0 games): {', '.join(map(str, missing))}")
+
+    projected = projected.sort_values('PROJ_POINTS_ROS', ascending=False)
+    print(f"\nTop {args.top} players by projected rest-of-season fantasy points:")
+    print(projected[['PLAYER_NAME', 'TEAM_ABBREVIATION', 'FANTASY_RANK_PERCENTILE'] + PROJECTION_COLUMNS]
+          .head(args.top).to_string(index=False))
+
+    output = args.output or rankings_csv(args.league).replace('rankings_three_metrics', 'projections')
+    projected.to_csv(output, index=False)
+    print(f"\nProjections saved to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+Resident ranking service: keeps the latest rankings and their name index in memory
+and answers pickup, player lookup and top-N queries over a local JSON HTTP API.
+
+    python "Recommended Pickups/ranking_service.py" --port 8765
+
+    GET  /health
+    GET  /players?name=Nikola+Jokic&name=Jaren+Jackson
+    GET  /pickups?player=Derrick+White&player=Josh+Hart&top=5
+    POST /pickups        {"players": ["Derrick White", "Josh Hart"], "top": 5}
+    GET  /top?team=BOS&min_percentile=80&max_percentile=95&n=10
+
+Every endpoint takes an optional `league` (scoring system key). The rankings are
+re-read when the ranking pipeline writes new output. The service only listens on
+localhost by default and needs no network access.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+from storage import DEFAULT_DATA_DIR, load_frame, rankings_csv, rankings_table, table_dir
+from scoring import DEFAULT_LEAGUE
+from name_index import DEFAULT_MIN_SCORE, NameIndex
+from recommend_pickups import top_n_indices
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Seconds between checks for new rankings output
+DEFAULT_RELOAD_INTERVAL = 2.0
+
+# Upper bound on the number of rows a single response returns
+MAX_RESULTS = 500
+
+
+def rankings_signature(league=None, data_dir=DEFAULT_DATA_DIR):
+    """
+    (path, mtime, size) of the files the rankings are loaded from, so a rewrite by
+    the ranking pipeline can be detected. Files are replaced atomically, so a
+    changed signature always means a complete new file.
+    """
+    files = []
+    root = table_dir(rankings_table(league), data_dir)
+    if os.path.isdir(root):
+        for dirpath, _, filenames in os.walk(root):
+            files += [os.path.join(dirpath, name) for name in filenames if name.endswith('.parquet')]
+    files.append(rankings_csv(league))
+
+    signature = []
+    for path in sorted(files):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _clean_value(value):
+    """JSON-safe scalar: NaN becomes null, numpy scalars become Python numbers"""
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return None if value != value else value
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+class RankingSnapshot:
+    """
+    One immutable, query-ready copy of a league's rankings: JSON-ready records,
+    the name index, positions ordered best first and the positions of each team.
+    Requests only read a snapshot, so reloads never block them.
+    """
+
+    def __init__(self, rankings_df, league=None, signature=()):
+        self.league = league
+        self.signature = signature
+        self.loaded_at = time.time()
+        self.records = [{key: _clean_value(value) for key, value in record.items()}
+                        for record in rankings_df.to_dict('records')]
+        self.index = NameIndex(rankings_df['PLAYER_NAME'])
+        self.percentiles = rankings_df['FANTASY_RANK_PERCENTILE'].to_numpy(dtype=np.float64)
+
+        # Best first; NaN percentiles last
+        self.order = top_n_indices(self.percentiles, len(self.percentiles))
+        self.team_order = {}
+        for position in self.order:
+            team = self.records[position].get('TEAM_ABBREVIATION')
+            self.team_order.setdefault(str(team).upper(), []).append(int(position))
+
+    @classmethod
+    def load(cls, league=None, data_dir=DEFAULT_DATA_DIR):
+        signature = rankings_signature(league, data_dir)
+        rankings_df = load_frame(rankings_table(league), rankings_csv(league), data_dir=data_dir)
+        return cls(rankings_df, league, signature)
+
+    def __len__(self):
+        return len(self.records)
+
+    def lookup(self, names, min_score=DEFAULT_MIN_SCORE):
+        """Each name with its matched players and confidence"""
+        results = []
+        for name in names:
+            positions, score = self.index.lookup(name, min_score)
+            results.append({
+                'name': name,
+                'match_score': score,
+                'players': [self.records[position] for position in positions],
+            })
+        return results
+
+    def pickups(self, names, top_n=10, min_score=DEFAULT_MIN_SCORE):
+        """Best `top_n` of the named available players, plus the names not found"""
+        matches, unmatched = self.index.match(names, min_score)
+        best = {}
+        for name, position, score in matches:
+            if position not in best or score > best[position][1]:
+                best[position] = (name, score)
+
+        positions = np.fromiter(best, dtype=np.int64, count=len(best))
+        picks = []
+        for position in positions[top_n_indices(self.percentiles[positions], top_n)]:
+            name, score = best[int(position)]
+            picks.append(dict(self.records[position], INPUT_NAME=name, MATCH_SCORE=score))
+        return picks, unmatched
+
+    def top(self, n=10, team=None, min_percentile=None, max_percentile=None):
+        """Best `n` players, optionally only one team's and/or within a percentile band"""
+        positions = self.team_order.get(team.upper(), []) if team else self.order
+        results = []
+        for position in positions:
+            percentile = self.percentiles[position]
+            if max_percentile is not None and not percentile <= max_percentile:
+                continue
+            if min_percentile is not None and not percentile >= min_percentile:
+                # Positions are ordered best first, so nothing further qualifies
+                break
+            results.append(self.records[position])
+            if len(results) >= n:
+                break
+        return results
+
+
+class RankingStore:
+    """
+    The current snapshot of each league. Snapshots are swapped in whole, and a
+    background thread reloads a league when its rankings files change.
+    """
+
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, reload_interval=DEFAULT_RELOAD_INTERVAL):
+        self.data_dir = data_dir
+        self.reload_interval = reload_interval
+        self.snapshots = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.watcher = None
+
+    def get(self, league=None):
+        """The league's current snapshot, loading it on first use"""
+        if league == DEFAULT_LEAGUE:
+            league = None
+        snapshot = self.snapshots.get(league)
+        if snapshot is not None:
+            return snapshot
+        with self.lock:
+            snapshot = self.snapshots.get(league)
+            if snapshot is None:
+                snapshot = RankingSnapshot.load(league, self.data_dir)
+                self.snapshots[league] = snapshot
+                print(f"Loaded rankings for {len(snapshot)} players (league: {league or 'default'})")
+        return snapshot
+
+    def reload_changed(self):
+        """Reload every league whose rankings files changed; keep the old snapshot on errors"""
+        for league, snapshot in list(self.snapshots.items()):
+            if rankings_signature(league, self.data_dir) == snapshot.signature:
+                continue
+            try:
+                fresh = RankingSnapshot.load(league, self.data_dir)
+            except Exception as e:
+                print(f"Reload of league '{league or 'default'}' failed, keeping the loaded rankings: {e}")
+                continue
+            with self.lock:
+                self.snapshots[league] = fresh
+            print(f"Reloaded rankings for {len(fresh)} players (league: {league or 'default'})")
+
+    def start_watching(self):
+        def watch():
+            while not self.stopped.wait(self.reload_interval):
+                self.reload_changed()
+
+        self.watcher = threading.Thread(target=watch, name='rankings-watcher', daemon=True)
+        self.watcher.start()
+
+    def stop(self):
+        self.stopped.set()
+
+
+class RankingRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over the store attached to the server"""
+
+    server_version = 'NBAFantasyRankings/1.0'
+    # Keep connections open between requests from the same client
+    protocol_version = 'HTTP/1.1'
+    # Small responses go out at once instead of waiting on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.handle_api(url.path, parse_qs(url.query), None)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self.send_json(400, {'error': 'Request body must be JSON'})
+            return
+        if not isinstance(body, dict):
+            self.send_json(400, {'error': 'Request body must be a JSON object'})
+            return
+        self.handle_api(url.path, parse_qs(url.query), body)
+
+    def handle_api(self, path, query, body):
+        routes = {
+            '/health': self.health,
+            '/players': self.players,
+            '/pickups': self.pickups,
+            '/top': self.top,
+        }
+        route = routes.get(path.rstrip('/') or '/')
+        if route is None:
+            self.send_json(404, {'error': f"Unknown endpoint '{path}'", 'endpoints': sorted(routes)})
+            return
+
+        params = {key: values[-1] for key, values in query.items()}
+        params['_lists'] = query
+        if body:
+            params.update(body)
+        try:
+            snapshot = self.server.store.get(params.get('league'))
+        except FileNotFoundError as e:
+            self.send_json(404, {'error': str(e)})
+            return
+        try:
+            self.send_json(200, route(snapshot, params))
+        except (KeyError, TypeError, ValueError) as e:
+            self.send_json(400, {'error': f"Bad request: {e}"})
+
+    def health(self, snapshot, params):
+        return {
+            'status': 'ok',
+            'league': snapshot.league or 'default',
+            'players': len(snapshot),
+            'loaded_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(snapshot.loaded_at)),
+        }
+
+    def name_list(self, params, body_key, query_key):
+        """Names from a JSON body list or from repeated query parameters"""
+        names = params.get(body_key)
+        if isinstance(names, list):
+            return [str(name) for name in names]
+        return params['_lists'].get(query_key, [])
+
+    def players(self, snapshot, params):
+        names = self.name_list(params, 'names', 'name')
+        if not names:
+            raise ValueError("pass at least one 'name'")
+        min_score = float(params.get('min_score', DEFAULT_MIN_SCORE))
+        return {'results': snapshot.lookup(names[:MAX_RESULTS], min_score)}
+
+    def pickups(self, snapshot, params):
+        names = self.name_list(params, 'players', 'player')
+        if not names:
+            raise ValueError("pass the available players as 'player' (GET) or 'players' (POST)")
+        top_n = min(int(params.get('top', 10)), MAX_RESULTS)
+        min_score = float(params.get('min_score', DEFAULT_MIN_SCORE))
+        picks, unmatched = snapshot.pickups(names, top_n, min_score)
+        return {'picks': picks, 'unmatched': unmatched}
+
+    def top(self, snapshot, params):
+        n = min(int(params.get('n', 10)), MAX_RESULTS)
+        min_percentile = params.get('min_percentile')
+        max_percentile = params.get('max_percentile')
+        players = snapshot.top(
+            n, team=params.get('team'),
+            min_percentile=None if min_percentile is None else float(min_percentile),
+            max_percentile=None if max_percentile is None else float(max_percentile),
+        )
+        return {'players': players}
+
+
+def create_server(store, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+    """A threaded HTTP server answering from `store` (port 0 picks a free port)"""
+    server = ThreadingHTTPServer((host, port), RankingRequestHandler)
+    server.daemon_threads = True
+    server.store = store
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Local HTTP service for rankings and pickup recommendations')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='Address to listen on (default: localhost only)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port to listen on')
+    parser.add_argument('--league', '-l', action='append', default=[],
+                        help='Scoring system (league key) to load at startup; repeat for several')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='Directory of the columnar data store')
+    parser.add_argument('--reload-interval', type=float, default=DEFAULT_RELOAD_INTERVAL,
+                        help='Seconds between checks for new rankings output')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args(argv)
+
+    store = RankingStore(args.data_dir, args.reload_interval)
+    try:
+        for league in args.league or [None]:
+            store.get(league)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        print("Run fantasy_ranking.py first to generate rankings.")
+        return 1
+
+    store.start_watching()
+    server = create_server(store, args.host, args.port, args.verbose)
+    print(f"Serving rankings on http://{args.host}:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping")
+    finally:
+        store.stop()
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
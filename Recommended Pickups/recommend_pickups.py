@@ -3,23 +3,52 @@ import numpy as np
 import os
 import sys
 import argparse
+import datetime
 
-def load_rankings():
+# The shared data store lives with the ETL stage
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+from storage import load_frame, rankings_table, rankings_csv
+from name_index import DEFAULT_MIN_SCORE, NameIndex
+from projections import PROJECTION_COLUMNS
+from instrumentation import add_arguments, instrumented, stage
+
+# Columns used for matching and display
+RANKING_COLUMNS = ['PLAYER_NAME', 'TEAM_ABBREVIATION', 'FANTASY_RANK_PERCENTILE',
+                   'FANTASY_POINTS_PER_MIN', 'PCT_MINUTES_PLAYED', 'PCT_GAMES_PLAYED']
+
+# Columns of the recommendations (the name as given and the match confidence are added)
+PICKUP_COLUMNS = RANKING_COLUMNS + ['INPUT_NAME', 'MATCH_SCORE']
+
+# --rank-by choices -> column the pickups are ordered by
+RANK_BY_COLUMNS = {
+    'percentile': 'FANTASY_RANK_PERCENTILE',
+    'ros': 'PROJ_POINTS_ROS',
+    'week': 'PROJ_POINTS_WEEK',
+}
+
+def load_rankings(league=None, form_window=None):
     try:
-        # Load the rankings file
-        rankings_file = 'nba_fantasy_rankings_three_metrics.csv'
-        if not os.path.exists(rankings_file):
+        # Load the rankings from the data store, or the CSV file if there is no store
+        rankings_file = rankings_csv(league, form_window)
+        try:
+            rankings_df = load_frame(rankings_table(league, form_window), rankings_file, columns=RANKING_COLUMNS)
+        except FileNotFoundError:
             print(f"Error: Rankings file '{rankings_file}' not found.")
-            print("Run fantasy_ranking.py first to generate rankings.")
+            options = (f" --league {league}" if league else "") + (f" --form-window {form_window}" if form_window else "")
+            print(f"Run fantasy_ranking.py{options} first to generate rankings.")
             sys.exit(1)
-            
-        rankings_df = pd.read_csv(rankings_file)
+
         print(f"Loaded rankings for {len(rankings_df)} players")
         return rankings_df
     except Exception as e:
         print(f"Error loading rankings: {str(e)}")
         sys.exit(1)
 
+def read_available_players(filename):
+    """Read the PLAYER_NAME column of an available-players CSV file"""
+    available_df = pd.read_csv(filename, usecols=['PLAYER_NAME'])
+    return available_df['PLAYER_NAME'].dropna().astype(str).tolist()
+
 def load_available_players(filename=None):
     """
     Load a list of available players from a CSV file.
@@ -27,9 +56,9 @@ def load_available_players(filename=None):
     """
     if filename and os.path.exists(filename):
         try:
-            available_df = pd.read_csv(filename)
-            print(f"Loaded {len(available_df)} available players from {filename}")
-            return available_df['PLAYER_NAME'].tolist()
+            players = read_available_players(filename)
+            print(f"Loaded {len(players)} available players from {filename}")
+            return players
         except Exception as e:
             print(f"Error loading available players: {str(e)}")
             print("Falling back to manual entry...")
@@ -45,38 +74,96 @@ def load_available_players(filename=None):
     
     return players
 
-def find_best_pickups(rankings_df, available_players, top_n=10):
+def top_n_indices(values, top_n):
+    """
+    Positions of the `top_n` largest values, best first, using a partial selection
+    (argpartition) so only the selected values get sorted. NaN values come last.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if top_n <= 0 or len(values) == 0:
+        return np.array([], dtype=np.int64)
+    negated = -values
+    if top_n < len(values):
+        selected = np.argpartition(negated, top_n - 1)[:top_n]
+    else:
+        selected = np.arange(len(values))
+    return selected[np.argsort(negated[selected], kind='stable')]
+
+def find_best_pickups(rankings_df, available_players, top_n=10, index=None, min_score=DEFAULT_MIN_SCORE,
+                      rank_by='FANTASY_RANK_PERCENTILE'):
     """
     Find the best available players based on rankings.
+    Names are matched through a NameIndex (built from `rankings_df` if not given),
+    so accents, suffixes and small spelling differences still match.
+    Players are ordered by the `rank_by` column (e.g. PROJ_POINTS_ROS from projections.py).
+    Returns (recommendations, unmatched names); `rankings_df` is not modified.
     """
-    # Create a case-insensitive player name for matching
-    rankings_df['PLAYER_NAME_LOWER'] = rankings_df['PLAYER_NAME'].str.lower()
-    
-    # Convert available players to lowercase for matching
-    available_players_lower = [p.lower() for p in available_players]
-    
-    # Filter rankings to only include available players
-    available_df = rankings_df[rankings_df['PLAYER_NAME_LOWER'].isin(available_players_lower)]
+    extra_columns = [col for col in PROJECTION_COLUMNS if col in rankings_df.columns]
+    if index is None:
+        index = NameIndex(rankings_df['PLAYER_NAME'])
+    matches, unmatched = index.match(available_players, min_score)
+
+    # One row per ranked player, keeping the most confident match
+    best = {}
+    for name, position, score in matches:
+        if position not in best or score > best[position][1]:
+            best[position] = (name, score)
+
+    positions = list(best)
+    available_df = rankings_df.iloc[positions][RANKING_COLUMNS + extra_columns].copy()
+    available_df['INPUT_NAME'] = [best[position][0] for position in positions]
+    available_df['MATCH_SCORE'] = [best[position][1] for position in positions]
     
-    # Sort by ranking score
-    recommendations = available_df.sort_values('FANTASY_RANK_PERCENTILE', ascending=False).head(top_n)
+    # Select the top players by ranking score without sorting all of them
+    order = top_n_indices(available_df[rank_by].to_numpy(), top_n)
+    recommendations = available_df.iloc[order]
     
-    return recommendations[['PLAYER_NAME', 'TEAM_ABBREVIATION', 
-                           'FANTASY_RANK_PERCENTILE', 'FANTASY_POINTS_PER_MIN', 
-                           'PCT_MINUTES_PLAYED', 'PCT_GAMES_PLAYED']]
+    return recommendations[PICKUP_COLUMNS + extra_columns], unmatched
 
-def main():
+@instrumented('pickups')
+def main(argv=None):
     # Set up command line argument parsing
     parser = argparse.ArgumentParser(description='NBA Fantasy Basketball Pickup Recommendations')
     parser.add_argument('--file', '-f', help='Path to CSV file with available players')
     parser.add_argument('--top', '-t', type=int, default=10, help='Number of top recommendations to show')
-    args = parser.parse_args()
+    parser.add_argument('--league', '-l', help='Scoring system (league key) whose rankings to use')
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE,
+                        help='Minimum confidence (0-1) for a fuzzy name match')
+    parser.add_argument('--form-window', type=int, default=None,
+                        help='Use the rankings built on rolling form over the last N days')
+    parser.add_argument('--rank-by', choices=list(RANK_BY_COLUMNS), default='percentile',
+                        help='Order pickups by ranking percentile or by projected points for the rest of the season or the matchup week')
+    parser.add_argument('--schedule', '-s', help='Schedule CSV used for the projections (needed for --rank-by ros/week)')
+    parser.add_argument('--as-of', type=str, help='First day (YYYY-MM-DD) of the projections (default: today)')
+    parser.add_argument('--week-start', type=str, help='Any day (YYYY-MM-DD) of the matchup week to project (default: the current week)')
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.rank_by != 'percentile' and not args.schedule:
+        parser.error('--rank-by ros/week needs --schedule')
     
     print("NBA Fantasy Basketball Pickup Recommendations")
     print("=============================================")
     
-    # Load rankings
-    rankings_df = load_rankings()
+    # Load rankings and index their names once
+    with stage('load') as metrics:
+        rankings_df = load_rankings(args.league, args.form_window)
+        index = NameIndex(rankings_df['PLAYER_NAME'])
+        metrics.rows_out = len(rankings_df)
+
+    # Add schedule-aware projections (rest of season and matchup week)
+    if args.schedule:
+        from projections import Schedule, project_rankings, read_schedule
+
+        try:
+            schedule = Schedule(read_schedule(args.schedule))
+            as_of = datetime.date.fromisoformat(args.as_of) if args.as_of else None
+            week_start = datetime.date.fromisoformat(args.week_start) if args.week_start else None
+        except (OSError, ValueError) as e:
+            print(f"Error reading the schedule: {e}")
+            return 1
+        with stage('project', rows_in=len(rankings_df)) as metrics:
+            rankings_df = project_rankings(rankings_df, schedule, as_of, week_start)
+            metrics.rows_out = len(rankings_df)
     
     # Get available players
     if args.file:
@@ -93,23 +180,38 @@ def main():
     
     if not available_players:
         print("No available players provided. Exiting.")
-        return
+        return 1
     
     print(f"\nAnalyzing {len(available_players)} available players...")
     
     # Get pickup recommendations
-    recommendations = find_best_pickups(rankings_df, available_players, args.top)
+    with stage('match', rows_in=len(available_players)) as metrics:
+        recommendations, unmatched = find_best_pickups(rankings_df, available_players, args.top, index=index,
+                                                       min_score=args.min_score, rank_by=RANK_BY_COLUMNS[args.rank_by])
+        metrics.rows_out = len(recommendations)
     
     # Display recommendations
     print("\nTop Recommended Pickups:")
     print("------------------------")
     for i, (_, player) in enumerate(recommendations.iterrows(), 1):
         print(f"{i}. {player['PLAYER_NAME']} ({player['TEAM_ABBREVIATION']})")
+        if player['MATCH_SCORE'] < 1:
+            print(f"   Matched from '{player['INPUT_NAME']}' ({player['MATCH_SCORE']:.0%} confidence)")
         print(f"   Ranking: {player['FANTASY_RANK_PERCENTILE']:.1f} percentile")
         print(f"   Fantasy Points Per Min: {player['FANTASY_POINTS_PER_MIN']:.2f}")
         print(f"   % Minutes Played: {player['PCT_MINUTES_PLAYED']:.1f}%")
         print(f"   % Games Played: {player['PCT_GAMES_PLAYED']:.1f}%")
+        if 'PROJ_POINTS_ROS' in player:
+            print(f"   Projected: {player['PROJ_POINTS_ROS']:.1f} points in {player['GAMES_LEFT']} games left, "
+                  f"{player['PROJ_POINTS_WEEK']:.1f} in {player['WEEK_GAMES']} games this week")
         print()
 
+    # Report the names that are not in the rankings instead of dropping them silently
+    if unmatched:
+        print(f"Not found in the rankings ({len(unmatched)}):")
+        for name in unmatched:
+            print(f"   {name}")
+    return 0
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file
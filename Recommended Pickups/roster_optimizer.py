@@ -0,0 +1,431 @@
+"""
+Add/drop suggestions for your own roster against the available-player pool.
+
+    python "Recommended Pickups/roster_optimizer.py" --roster my_team.csv --file available.csv
+    python "Recommended Pickups/roster_optimizer.py" --roster my_team.csv --file available.csv \\
+        --slots PG SG SF PF C G F UTIL UTIL UTIL --max-moves 3 --schedule schedule.csv --rank-by week
+
+Both CSV files have a PLAYER_NAME column and optionally a POSITION column
+("PG", "PG,SG", "G-F", ...); --positions adds a PLAYER_NAME/POSITION file for
+players whose position is not in either file. Players without a known position
+can only fill UTIL slots.
+
+A roster is worth the score of its best starting lineup plus --bench-weight times
+the score of everyone else. Which players can start together is a transversal
+matroid (players matched to the slots they are eligible for), so the best lineup
+is found greedily: best player first, kept if they can still be matched to a slot.
+Swaps of up to --max-moves players are searched drop set by drop set with branch
+and bound: adding players to a roster never gains more than the sum of what each
+one adds on its own, so a drop set or partial add set whose bound cannot beat
+the K-th best move found so far is skipped. A lineup caches, per slot
+eligibility, the weakest starter a new player could replace, so what a
+candidate adds is mostly a dictionary lookup.
+"""
+import sys
+import time
+import heapq
+import argparse
+import datetime
+from itertools import combinations, count
+
+import pandas as pd
+
+from name_index import DEFAULT_MIN_SCORE, NameIndex
+from recommend_pickups import RANK_BY_COLUMNS, load_rankings
+
+# Standard starting lineup; the rest of the roster is the bench
+DEFAULT_SLOTS = ['PG', 'SG', 'SF', 'PF', 'C', 'G', 'F', 'UTIL', 'UTIL', 'UTIL']
+
+# Positions each slot accepts (None: any player)
+SLOT_POSITIONS = {
+    'PG': {'PG'}, 'SG': {'SG'}, 'SF': {'SF'}, 'PF': {'PF'}, 'C': {'C'},
+    'G': {'PG', 'SG'}, 'F': {'SF', 'PF'}, 'UTIL': None,
+}
+
+# Position labels as sites write them -> basic positions
+POSITION_ALIASES = {
+    'PG': {'PG'}, 'SG': {'SG'}, 'SF': {'SF'}, 'PF': {'PF'}, 'C': {'C'},
+    'G': {'PG', 'SG'}, 'F': {'SF', 'PF'}, 'GUARD': {'PG', 'SG'}, 'FORWARD': {'SF', 'PF'}, 'CENTER': {'C'},
+}
+
+
+def parse_positions(text):
+    """'PG,SG' / 'G-F' / 'SF/PF' -> set of basic positions (empty if unknown)"""
+    if text is None or (isinstance(text, float) and pd.isna(text)):
+        return set()
+    positions = set()
+    for label in str(text).upper().replace('/', ',').replace('-', ',').split(','):
+        positions |= POSITION_ALIASES.get(label.strip(), set())
+    return positions
+
+
+def slot_mask(positions, slots):
+    """Bitmask of the starting slots a player with `positions` can fill"""
+    mask = 0
+    for i, slot in enumerate(slots):
+        accepted = SLOT_POSITIONS.get(slot.upper(), None)
+        if accepted is None or positions & accepted:
+            mask |= 1 << i
+    return mask
+
+
+def _assign(player, masks, owner, n_slots, visited):
+    """Augmenting path for `player` in the slot matching (Kuhn's algorithm)"""
+    mask = masks[player]
+    for slot in range(n_slots):
+        bit = 1 << slot
+        if mask & bit and not visited[0] & bit:
+            visited[0] |= bit
+            if owner[slot] < 0 or _assign(owner[slot], masks, owner, n_slots, visited):
+                owner[slot] = player
+                return True
+    return False
+
+
+class Lineup:
+    """
+    The best starting lineup of a set of players, kept up to date one added player
+    at a time. A new player either fills a slot reachable through the current
+    starters (an augmenting path), replaces the weakest starter they can be
+    exchanged with, or goes to the bench - the matroid exchange property makes
+    this the best lineup of the larger set.
+    """
+
+    def __init__(self, n_slots, bench_weight=0.0):
+        self.n_slots = n_slots
+        self.bench_weight = bench_weight
+        self.scores = []
+        self.masks = []
+        self.owner = [-1] * n_slots
+        self.starters = 0.0
+        self.bench = 0.0
+        # Slot mask -> weakest starter a player with that mask could replace (None: a slot is free)
+        self.weakest_by_mask = {}
+
+    @property
+    def value(self):
+        return self.starters + self.bench_weight * self.bench
+
+    def copy(self):
+        lineup = Lineup(self.n_slots, self.bench_weight)
+        lineup.scores, lineup.masks, lineup.owner = list(self.scores), list(self.masks), list(self.owner)
+        lineup.starters, lineup.bench = self.starters, self.bench
+        return lineup
+
+    def _exchange(self, mask):
+        """None if a player eligible for `mask` can start without replacing anyone, else the starters they could replace"""
+        seen, stack, reached = 0, [mask], []
+        while stack:
+            current = stack.pop()
+            for slot in range(self.n_slots):
+                bit = 1 << slot
+                if current & bit and not seen & bit:
+                    seen |= bit
+                    player = self.owner[slot]
+                    if player < 0:
+                        return None
+                    reached.append(player)
+                    stack.append(self.masks[player])
+        return reached
+
+    def gain(self, score, mask):
+        """Value one more player would add"""
+        if mask:
+            if mask not in self.weakest_by_mask:
+                reached = self._exchange(mask)
+                self.weakest_by_mask[mask] = None if reached is None else \
+                    min((self.scores[p] for p in reached), default=float('inf'))
+            weakest = self.weakest_by_mask[mask]
+            if weakest is None:
+                return score
+            if weakest < score:
+                return score - (1 - self.bench_weight) * weakest
+        return self.bench_weight * score
+
+    def add(self, score, mask):
+        """Copy of the lineup with one more player"""
+        lineup = self.copy()
+        player = len(lineup.scores)
+        lineup.scores.append(score)
+        lineup.masks.append(mask)
+        if mask:
+            reached = lineup._exchange(mask)
+            if reached is None:
+                _assign(player, lineup.masks, lineup.owner, lineup.n_slots, [0])
+                lineup.starters += score
+                return lineup
+            weakest = min(reached, key=lambda p: lineup.scores[p], default=None)
+            if weakest is not None and lineup.scores[weakest] < score:
+                lineup.owner[lineup.owner.index(weakest)] = -1
+                _assign(player, lineup.masks, lineup.owner, lineup.n_slots, [0])
+                lineup.starters += score - lineup.scores[weakest]
+                lineup.bench += lineup.scores[weakest]
+                return lineup
+        lineup.bench += score
+        return lineup
+
+
+def roster_value(scores, masks, n_slots, bench_weight=0.0):
+    """Best starting lineup score plus `bench_weight` times the bench"""
+    return build_lineup(scores, masks, n_slots, bench_weight).value
+
+
+def build_lineup(scores, masks, n_slots, bench_weight=0.0):
+    lineup = Lineup(n_slots, bench_weight)
+    for score, mask in zip(scores, masks):
+        lineup = lineup.add(score, mask)
+    return lineup
+
+
+def prune_pool(pool, keep_per_mask):
+    """
+    Only the best `keep_per_mask` players of each slot eligibility: any move using
+    a worse one is matched by a move using an unused better player with the same slots.
+    """
+    by_mask = {}
+    for player in sorted(pool, key=lambda p: -p['score']):
+        by_mask.setdefault(player['mask'], [])
+        if len(by_mask[player['mask']]) < keep_per_mask:
+            by_mask[player['mask']].append(player)
+    return sorted((p for players in by_mask.values() for p in players), key=lambda p: -p['score'])
+
+
+def best_moves(roster, pool, n_slots, max_moves=2, top_k=5, bench_weight=0.1, keep=()):
+    """
+    The `top_k` add/drop moves (up to `max_moves` players each way) that raise the
+    roster value the most. `roster` and `pool` are lists of dicts with name, score
+    and mask; players named in `keep` are never dropped.
+    Returns (current value, [(gain, new value, drop names, add names)] best first, stats).
+    """
+    scores = [p['score'] for p in roster]
+    masks = [p['mask'] for p in roster]
+    baseline = roster_value(scores, masks, n_slots, bench_weight)
+    candidates = prune_pool(pool, max_moves + top_k)
+    droppable = [i for i, p in enumerate(roster) if p['name'] not in keep]
+
+    best = []  # min-heap of (gain, tiebreak, move)
+    tiebreak = count()
+    stats = {'drop_sets': 0, 'pruned_drop_sets': 0, 'evaluations': 0, 'candidates': len(candidates)}
+
+    def threshold():
+        return best[0][0] if len(best) == top_k else 1e-9
+
+    def record(gain, value, drops, adds):
+        # Only moves that improve the roster are worth listing
+        if gain <= 1e-9:
+            return
+        move = (gain, value, [roster[i]['name'] for i in drops], [c['name'] for c in adds])
+        if len(best) < top_k:
+            heapq.heappush(best, (gain, next(tiebreak), move))
+        elif gain > best[0][0]:
+            heapq.heapreplace(best, (gain, next(tiebreak), move))
+
+    def search(lineup, k, drops, start, adds, marginals, gains):
+        need = k - len(adds)
+        if need == 0:
+            record(lineup.value - baseline, lineup.value, drops, adds)
+            return
+
+        # What each remaining candidate adds to this lineup, computed only when needed:
+        # it is at most its gain to the drop set's lineup, which they are sorted by
+        local = {}
+
+        def completion_bound(j):
+            """Upper bound on what `need` of the candidates from j on can add"""
+            if not adds:
+                return sum(gains[j:j + need])
+            top = []
+            for i in range(j, len(marginals)):
+                if len(top) == need and top[0] >= gains[i]:
+                    break
+                if i not in local:
+                    c = marginals[i][1]
+                    local[i] = lineup.gain(c['score'], c['mask'])
+                    stats['evaluations'] += 1
+                heapq.heappush(top, local[i])
+                if len(top) > need:
+                    heapq.heappop(top)
+            return sum(top)
+
+        for j in range(start, len(marginals) - need + 1):
+            # Later starting points can't bound higher
+            if lineup.value + completion_bound(j) - baseline <= threshold():
+                break
+            c = marginals[j][1]
+            stats['evaluations'] += 1
+            search(lineup.add(c['score'], c['mask']), k, drops, j + 1, adds + [c], marginals, gains)
+
+    for k in range(1, max_moves + 1):
+        if k > len(droppable) or k > len(candidates):
+            break
+        top_scores = sum(c['score'] for c in candidates[:k])
+
+        # Drop sets that keep the most value are searched first, so good moves are found early
+        drop_sets = []
+        for drops in combinations(droppable, k):
+            kept = [i for i in range(len(roster)) if i not in drops]
+            lineup = build_lineup([scores[i] for i in kept], [masks[i] for i in kept], n_slots, bench_weight)
+            drop_sets.append((lineup, drops))
+        drop_sets.sort(key=lambda d: -d[0].value)
+
+        for lineup, drops in drop_sets:
+            stats['drop_sets'] += 1
+            # Each add is worth at most its own score
+            if lineup.value + top_scores - baseline <= threshold():
+                stats['pruned_drop_sets'] += 1
+                continue
+
+            # What each candidate adds on its own; with more players it can only add less
+            marginals = sorted(((lineup.gain(c['score'], c['mask']), c) for c in candidates), key=lambda m: -m[0])
+            gains = [m[0] for m in marginals]
+            stats['evaluations'] += len(candidates)
+            if lineup.value + sum(gains[:k]) - baseline <= threshold():
+                stats['pruned_drop_sets'] += 1
+                continue
+
+            search(lineup, k, drops, 0, [], marginals, gains)
+
+    moves = [entry[2] for entry in sorted(best, key=lambda e: -e[0])]
+    return baseline, moves, stats
+
+
+def read_players(path):
+    """PLAYER_NAME and optional POSITION columns of a CSV file"""
+    df = pd.read_csv(path)
+    if 'PLAYER_NAME' not in df.columns:
+        raise ValueError(f"'{path}' has no PLAYER_NAME column")
+    if 'POSITION' not in df.columns:
+        df['POSITION'] = None
+    df = df[df['PLAYER_NAME'].notna()]
+    return list(zip(df['PLAYER_NAME'].astype(str), df['POSITION']))
+
+
+def score_players(players, rankings_df, index, score_column, slots, positions=None, min_score=DEFAULT_MIN_SCORE,
+                  keep_unmatched=False):
+    """
+    Match (name, position) pairs to the rankings. Returns (scored player dicts, unmatched names);
+    positions come from the file, then from the `positions` lookup by normalized name.
+    With `keep_unmatched`, players missing from the rankings are kept with a score of 0.
+    """
+    from name_index import normalize_name
+
+    scored, unmatched = [], []
+    values = rankings_df[score_column].to_numpy()
+    for name, position in players:
+        known = parse_positions(position)
+        if not known and positions:
+            known = parse_positions(positions.get(normalize_name(name, drop_suffix=True)))
+        matched, _ = index.lookup(name, min_score)
+        if not matched:
+            unmatched.append(name)
+            if keep_unmatched:
+                scored.append({'name': name, 'score': 0.0, 'mask': slot_mask(known, slots)})
+            continue
+        row = matched[0]
+        scored.append({
+            'name': str(rankings_df['PLAYER_NAME'].iloc[row]),
+            'score': max(0.0, float(values[row])) if pd.notna(values[row]) else 0.0,
+            'mask': slot_mask(known, slots),
+        })
+    return scored, unmatched
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Best add/drop moves for your roster')
+    parser.add_argument('--roster', '-r', required=True, help='CSV file of your roster (PLAYER_NAME, optional POSITION)')
+    parser.add_argument('--file', '-f', required=True, help='CSV file of available players (PLAYER_NAME, optional POSITION)')
+    parser.add_argument('--positions', '-p', help='CSV file of PLAYER_NAME and POSITION for players missing a position')
+    parser.add_argument('--slots', nargs='+', default=DEFAULT_SLOTS, help='Starting lineup slots (PG SG SF PF C G F UTIL)')
+    parser.add_argument('--max-moves', type=int, default=2, help='Most players dropped (and added) in one move')
+    parser.add_argument('--top', '-t', type=int, default=5, help='Number of moves to show')
+    parser.add_argument('--bench-weight', type=float, default=0.1, help='Value of a bench player relative to a starter (0-1)')
+    parser.add_argument('--keep', nargs='+', default=[], help="Players that must not be dropped")
+    parser.add_argument('--league', '-l', help='Scoring system (league key) whose rankings to use')
+    parser.add_argument('--rank-by', choices=list(RANK_BY_COLUMNS), default='percentile',
+                        help='Score players by ranking percentile or by projected points (needs --schedule)')
+    parser.add_argument('--schedule', '-s', help='Schedule CSV used for the projections')
+    parser.add_argument('--as-of', type=str, help='First day (YYYY-MM-DD) of the projections (default: today)')
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE, help='Minimum confidence (0-1) for a fuzzy name match')
+    args = parser.parse_args(argv)
+    if args.rank_by != 'percentile' and not args.schedule:
+        parser.error('--rank-by ros/week needs --schedule')
+    # The lineup and the search bounds assume a bench player is worth no more than a starter
+    if not 0 <= args.bench_weight <= 1:
+        parser.error(f'--bench-weight must be between 0 and 1, got {args.bench_weight}')
+    unknown = [slot for slot in args.slots if slot.upper() not in SLOT_POSITIONS]
+    if unknown:
+        parser.error(f"unknown slot(s): {', '.join(unknown)} (use {' '.join(SLOT_POSITIONS)})")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    from name_index import normalize_name
+
+    rankings_df = load_rankings(args.league)
+    if args.schedule:
+        from projections import Schedule, project_rankings, read_schedule
+        try:
+            as_of = datetime.date.fromisoformat(args.as_of) if args.as_of else None
+            rankings_df = project_rankings(rankings_df, Schedule(read_schedule(args.schedule)), as_of)
+        except (OSError, ValueError) as e:
+            print(f"Error reading the schedule: {e}")
+            return 1
+    index = NameIndex(rankings_df['PLAYER_NAME'])
+
+    try:
+        roster_players = read_players(args.roster)
+        pool_players = read_players(args.file)
+        positions = None
+        if args.positions:
+            positions = {normalize_name(name, drop_suffix=True): position
+                         for name, position in read_players(args.positions)}
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    score_column = RANK_BY_COLUMNS[args.rank_by]
+    roster, roster_unmatched = score_players(roster_players, rankings_df, index, score_column, args.slots,
+                                             positions, args.min_score, keep_unmatched=True)
+    pool, pool_unmatched = score_players(pool_players, rankings_df, index, score_column, args.slots,
+                                         positions, args.min_score)
+    roster_names = {p['name'] for p in roster}
+    pool = [p for p in pool if p['name'] not in roster_names]
+    if roster_unmatched:
+        print(f"Roster players not in the rankings (scored 0): {', '.join(roster_unmatched)}")
+    if pool_unmatched:
+        print(f"Available players not in the rankings ({len(pool_unmatched)}) are skipped")
+    no_position = [p['name'] for p in roster + pool if p['mask'] == slot_mask(set(), args.slots)]
+    if no_position:
+        print(f"{len(no_position)} players have no known position and only fill UTIL slots")
+
+    # Players to keep, under their names in the rankings
+    keep = set(args.keep)
+    for name in args.keep:
+        matched, _ = index.lookup(name, args.min_score)
+        if matched:
+            keep.add(rankings_df['PLAYER_NAME'].iloc[matched[0]])
+
+    start = time.perf_counter()
+    baseline, moves, stats = best_moves(roster, pool, len(args.slots), args.max_moves, args.top,
+                                        args.bench_weight, keep)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nRoster of {len(roster)} players worth {baseline:.1f} ({score_column}, {len(args.slots)} starters)")
+    print(f"Searched swaps of up to {args.max_moves} players against {len(pool)} available players in "
+          f"{elapsed * 1000:.0f} ms ({stats['candidates']} candidates after pruning, "
+          f"{stats['pruned_drop_sets']} of {stats['drop_sets']} drop sets bounded out)")
+    if not moves:
+        print("\nNo add/drop move improves the roster.")
+        return 0
+
+    print("\nBest moves:")
+    print("------------------------")
+    for i, (gain, value, drops, adds) in enumerate(moves, 1):
+        print(f"{i}. Drop {', '.join(drops)} -> Add {', '.join(adds)}")
+        print(f"   Gain: +{gain:.1f} (roster value {value:.1f})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
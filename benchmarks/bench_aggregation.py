@@ -0,0 +1,109 @@
+"""
+Benchmark the cross-season aggregation in Rankings/aggregation.py against the
+original per-player groupby loop, from a few thousand rows up to millions of
+per-game rows.
+
+    python benchmarks/bench_aggregation.py
+    python benchmarks/bench_aggregation.py --sizes 10000 1000000 5000000 --loop-limit 200000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Rankings'))
+from aggregation import aggregate_players
+
+
+def aggregate_players_loop(df, min_games=20, min_minutes=10):
+    """The original Python loop over df.groupby('PLAYER_ID'), kept as the reference"""
+    aggregated_data = []
+    for player_id, data in df.groupby('PLAYER_ID'):
+        data = data.sort_values('SEASON', kind='stable')
+        total_gp = data['GP'].sum()
+        if total_gp >= min_games:
+            avg_minutes = np.average(data['AVG_MINUTES'], weights=data['GP'])
+            if avg_minutes >= min_minutes:
+                aggregated_data.append({
+                    'PLAYER_ID': player_id,
+                    'PLAYER_NAME': data['PLAYER_NAME'].iloc[-1],
+                    'TEAM_ABBREVIATION': data['TEAM_ABBREVIATION'].iloc[-1],
+                    'GP': total_gp,
+                    'AVG_MINUTES': avg_minutes,
+                    'FANTASY_POINTS': data['FANTASY_POINTS'].sum(),
+                    'AVG_FANTASY_PPG': np.average(data['AVG_FANTASY_PPG'], weights=data['GP']),
+                    'FANTASY_POINTS_PER_MIN': np.average(data['FANTASY_POINTS_PER_MIN'], weights=data['GP']),
+                    'PCT_MINUTES_PLAYED': np.average(data['PCT_MINUTES_PLAYED'], weights=data['GP']),
+                    'PCT_GAMES_PLAYED': np.average(data['PCT_GAMES_PLAYED'], weights=data['GP']),
+                })
+    return pd.DataFrame(aggregated_data).sort_values('PLAYER_NAME', kind='stable').reset_index(drop=True)
+
+
+def synthetic_rows(n_rows, n_players=None, seed=0):
+    """Per-game-like rows (GP=1 each) spread over 20 seasons"""
+    rng = np.random.default_rng(seed)
+    n_players = n_players or max(50, min(5000, n_rows // 200))
+    player_ids = rng.integers(0, n_players, n_rows)
+    minutes = rng.uniform(0, 40, n_rows)
+    fantasy_points = minutes * rng.uniform(0.3, 1.3, n_rows)
+    seasons = np.array([f'{year}-{(year + 1) % 100:02d}' for year in range(2005, 2025)])
+    teams = np.array(['ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DAL', 'DEN', 'DET', 'GSW'])
+    return pd.DataFrame({
+        'SEASON': seasons[rng.integers(0, len(seasons), n_rows)],
+        'PLAYER_ID': player_ids + 200000,
+        'PLAYER_NAME': np.char.add('Player ', player_ids.astype(str)),
+        'TEAM_ABBREVIATION': teams[rng.integers(0, len(teams), n_rows)],
+        'GP': np.ones(n_rows, dtype=np.int64),
+        'AVG_MINUTES': minutes,
+        'FANTASY_POINTS': fantasy_points,
+        'AVG_FANTASY_PPG': fantasy_points,
+        'FANTASY_POINTS_PER_MIN': np.where(minutes > 0, fantasy_points / np.maximum(minutes, 1e-9), 0),
+        'PCT_MINUTES_PLAYED': minutes / 48 * 100,
+        'PCT_GAMES_PLAYED': np.full(n_rows, 100 / 82),
+    })
+
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cross-season player aggregation')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000, 5000000],
+                        help='Row counts to benchmark')
+    parser.add_argument('--loop-limit', type=int, default=100000,
+                        help='Largest row count to run the slow reference loop on')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per size (best time is reported)')
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} | {'players':>8} | {'vectorized':>11} | {'loop':>9} | speedup | same output")
+    print("-" * 70)
+    for n_rows in args.sizes:
+        df = synthetic_rows(n_rows)
+        vectorized_time, vectorized = best_time(lambda: aggregate_players(df), args.repeat)
+
+        loop_cell, speedup_cell, same_cell = '-', '-', '-'
+        if n_rows <= args.loop_limit:
+            loop_time, reference = best_time(lambda: aggregate_players_loop(df), 1)
+            same = len(reference) == len(vectorized) and np.allclose(
+                reference.drop(columns=['PLAYER_NAME', 'TEAM_ABBREVIATION']).to_numpy(dtype=float),
+                vectorized[reference.columns].drop(columns=['PLAYER_NAME', 'TEAM_ABBREVIATION']).to_numpy(dtype=float)
+            ) and (reference['TEAM_ABBREVIATION'].to_numpy() == vectorized['TEAM_ABBREVIATION'].to_numpy()).all()
+            loop_cell = f"{loop_time:8.3f}s"
+            speedup_cell = f"{loop_time / vectorized_time:6.0f}x"
+            same_cell = 'yes' if same else 'NO'
+
+        print(f"{n_rows:>10} | {df['PLAYER_ID'].nunique():>8} | {vectorized_time:10.3f}s | "
+              f"{loop_cell:>9} | {speedup_cell:>7} | {same_cell}")
+
+
+if __name__ == '__main__':
+    main()
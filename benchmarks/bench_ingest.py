@@ -0,0 +1,141 @@
+"""
+Load-test the ingestion path offline: the real fetcher (pooled session, token
+bucket, retries with backoff) fetches leaguedashplayerstats from a local
+stub_server.py and turns each payload into a DataFrame as it arrives. Reports
+throughput, latency and retries for each number of workers.
+
+    python benchmarks/bench_ingest.py
+    python benchmarks/bench_ingest.py --requests 200 --workers 1 8 32 --latency 0.3 --jitter 0.1
+    python benchmarks/bench_ingest.py --rate-limit 10 --error-rate 0.05     # throttling and server errors
+    python benchmarks/bench_ingest.py --url http://127.0.0.1:8765           # an already running stub server
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'ETL'))
+import synthetic
+
+
+def start_stub(args):
+    """Run stub_server.py in its own process (so it doesn't share the GIL); returns (process, base URL)"""
+    command = [sys.executable, os.path.join(HERE, 'stub_server.py'), '--port', '0',
+               '--latency', str(args.latency), '--jitter', str(args.jitter),
+               '--error-rate', str(args.error_rate), '--throttle-rate', str(args.throttle_rate),
+               '--retry-after', str(args.retry_after), '--players', str(args.players)]
+    if args.rate_limit:
+        command += ['--rate-limit', str(args.rate_limit)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline().strip()
+    if not line.startswith('Serving on '):
+        process.kill()
+        raise RuntimeError(f"stub server did not start: {line!r}")
+    return process, line[len('Serving on '):]
+
+
+def server_counts(base_url):
+    import requests
+
+    return requests.get(base_url.rstrip('/') + '/_stats', timeout=5).json()
+
+
+def run_load(base_url, params_list, workers, args):
+    """Fetch and parse every request once; returns a summary dict"""
+    from fetcher import create_session, fetch_all
+    from nba_api import request_headers
+    from transform import payload_to_dataframe
+    from transport import stats_url
+
+    rows = [0]
+
+    def on_result(index, result):
+        if result['data'] is not None:
+            rows[0] += len(payload_to_dataframe(result['data'], params_list[index]['Season']))
+
+    before = server_counts(base_url)
+    start = time.perf_counter()
+    results = fetch_all(stats_url(base_url, 'leaguedashplayerstats'), params_list, max_workers=workers,
+                        rate=args.rate, timeout=args.timeout, max_retries=args.retries,
+                        backoff_base=args.backoff_base, session=create_session(request_headers, workers),
+                        on_result=on_result)
+    elapsed = time.perf_counter() - start
+    after = server_counts(base_url)
+
+    latencies = sorted(result['latency'] for result in results)
+    return {
+        'workers': workers,
+        'seconds': elapsed,
+        'requests_per_second': len(results) / elapsed,
+        'rows_per_second': rows[0] / elapsed,
+        'mb_per_second': (after['bytes'] - before['bytes']) / 1024 ** 2 / elapsed,
+        'p50': latencies[len(latencies) // 2],
+        'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        'retries': sum(result['retries'] for result in results),
+        'failed': sum(1 for result in results if result['data'] is None),
+        'throttled': after['throttled'] - before['throttled'],
+        'errors': after['errors'] - before['errors'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the fetch path against a local stats stand-in')
+    parser.add_argument('--requests', type=int, default=60, help='Requests per run')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16], help='Worker counts to compare')
+    parser.add_argument('--seasons', type=int, default=10, help='Distinct seasons requested (cycled)')
+    parser.add_argument('--url', help='Base URL of a running stub server (default: start one)')
+    parser.add_argument('--rate', type=float, default=0, help='Client requests per second (0: unlimited)')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Per-request timeout in seconds')
+    parser.add_argument('--retries', type=int, default=4, help='Retries per request')
+    parser.add_argument('--backoff-base', type=float, default=0.1, help='Base seconds of the retry backoff')
+    parser.add_argument('--latency', type=float, default=0.1, help='Server seconds per response')
+    parser.add_argument('--jitter', type=float, default=0.05, help='Random +/- seconds on the server latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 500 responses')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of 429 responses')
+    parser.add_argument('--rate-limit', type=float, default=None, help='Server requests per second before 429s')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds of the 429s')
+    parser.add_argument('--players', type=int, default=500, help='Players per synthetic payload')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+    args = parser.parse_args()
+
+    import nba_api
+
+    process = None
+    base_url = args.url
+    if base_url is None:
+        process, base_url = start_stub(args)
+    try:
+        seasons = synthetic.seasons(args.seasons)
+        params_list = [dict(nba_api.params, Season=seasons[i % len(seasons)]) for i in range(args.requests)]
+        # Warm the server's payloads so the runs measure serving, not generating
+        run_load(base_url, [dict(nba_api.params, Season=season) for season in seasons], 4, args)
+
+        results = []
+        if not args.json:
+            print(f"{args.requests} requests to {base_url} (latency {args.latency}s +/- {args.jitter}s, "
+                  f"errors {args.error_rate:.0%}, throttled {args.throttle_rate:.0%}"
+                  + (f", limit {args.rate_limit}/s" if args.rate_limit else '') + ")\n")
+            print(f"{'workers':>7} {'seconds':>8} {'req/s':>7} {'rows/s':>9} {'MB/s':>6} {'p50':>7} {'p95':>7} "
+                  f"{'retries':>7} {'429s':>5} {'500s':>5} {'failed':>6}")
+        for workers in args.workers:
+            result = run_load(base_url, params_list, workers, args)
+            results.append(result)
+            if not args.json:
+                print(f"{workers:>7} {result['seconds']:>8.2f} {result['requests_per_second']:>7.1f} "
+                      f"{result['rows_per_second']:>9,.0f} {result['mb_per_second']:>6.1f} "
+                      f"{result['p50'] * 1000:>5.0f}ms {result['p95'] * 1000:>5.0f}ms {result['retries']:>7} "
+                      f"{result['throttled']:>5} {result['errors']:>5} {result['failed']:>6}")
+        if args.json:
+            print(json.dumps(results, indent=2))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Benchmark matching a waiver list against the rankings with the NameIndex from
+Recommended Pickups/name_index.py: building the index, a cold lookup of the list
+and a repeated (memoized) lookup. Part of the list is misspelled, accent-folded or
+missing its suffix so the fuzzy path is exercised too.
+
+    python benchmarks/bench_name_index.py
+    python benchmarks/bench_name_index.py --players 600 --waiver 300 --repeat 20
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Recommended Pickups'))
+from name_index import NameIndex
+
+FIRST_NAMES = ['Nikola', 'Luka', 'Jaren', 'Shai', 'Dennis', 'Bogdan', 'Jusuf', 'Kristaps', 'Jalen', 'Derrick']
+LAST_NAMES = ['Jokić', 'Dončić', 'Jackson Jr.', 'Gilgeous-Alexander', 'Schröder', 'Bogdanović',
+              'Nurkić', 'Porziņģis', 'Brunson', 'White']
+
+
+def synthetic_names(n_players, seed=0):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < n_players:
+        names.add(f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.randint(1, 10 ** 6)}')
+    return sorted(names)
+
+
+def waiver_list(names, size, seed=0):
+    """Mostly exact names, with some misspelled ones and some not in the rankings"""
+    rng = random.Random(seed)
+    waiver = []
+    for name in rng.sample(names, min(size, len(names))):
+        roll = rng.random()
+        if roll < 0.1:
+            # Drop a letter
+            i = rng.randrange(len(name))
+            name = name[:i] + name[i + 1:]
+        elif roll < 0.15:
+            name = f'Unknown Player {rng.randint(1, 10 ** 6)}'
+        waiver.append(name)
+    return waiver
+
+
+def time_it(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark fuzzy player-name matching')
+    parser.add_argument('--players', type=int, default=600, help='Players in the rankings')
+    parser.add_argument('--waiver', type=int, default=300, help='Names in the waiver list')
+    parser.add_argument('--repeat', type=int, default=10, help='Repetitions (best time is reported)')
+    args = parser.parse_args()
+
+    names = synthetic_names(args.players)
+    waiver = waiver_list(names, args.waiver)
+
+    build = time_it(lambda: NameIndex(names), args.repeat)
+    cold = time_it(lambda: NameIndex(names).match(waiver), args.repeat) - build
+    index = NameIndex(names)
+    matches, unmatched = index.match(waiver)
+    warm = time_it(lambda: index.match(waiver), args.repeat)
+
+    print(f"{args.players} ranked players, {len(waiver)} waiver names "
+          f"({len(matches)} matched, {len(unmatched)} unmatched)")
+    print(f"build index:   {build * 1000:8.2f} ms")
+    print(f"match (cold):  {cold * 1000:8.2f} ms")
+    print(f"match (warm):  {warm * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
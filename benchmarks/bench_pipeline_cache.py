@@ -0,0 +1,81 @@
+"""
+Benchmark the stage cache of pipeline.py offline: a synthetic fetch stage stands
+in for stats.nba.com, and the pipeline is timed cold, re-run unchanged, re-run
+with another league, and re-run with a different games filter.
+
+    python benchmarks/bench_pipeline_cache.py
+    python benchmarks/bench_pipeline_cache.py --seasons 28 --players 550 --fetch-delay 1.0
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline import STAGES, Stage, StageCache, run_pipeline, scoring_rules
+from scoring import DEFAULT_SCORING_FILE
+from transform import STAT_COLUMNS
+
+TEAMS = ['ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DAL', 'DEN', 'DET', 'GSW', 'HOU', 'IND', 'LAC', 'LAL', 'MEM']
+
+
+def synthetic_fetch(n_players, delay):
+    """A fetch stage returning raw season totals after `delay` seconds per season"""
+    def fetch_stage(config):
+        rng = np.random.default_rng(0)
+        frames = []
+        for season in config['seasons']:
+            time.sleep(delay)
+            gp = rng.integers(1, 83, n_players)
+            minutes = gp * rng.uniform(5, 38, n_players)
+            df = pd.DataFrame({stat: (minutes * rng.uniform(0, 0.5, n_players)).round() for stat in STAT_COLUMNS})
+            df.insert(0, 'MIN', minutes.round(1))
+            df.insert(0, 'GP', gp)
+            df.insert(0, 'TEAM_ABBREVIATION', rng.choice(TEAMS, n_players))
+            df.insert(0, 'PLAYER_NAME', [f'Player {i}' for i in range(n_players)])
+            df.insert(0, 'PLAYER_ID', np.arange(n_players) + 1000)
+            df['SEASON'] = season
+            frames.append(df)
+        return pd.concat(frames, ignore_index=True)
+    return fetch_stage
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the pipeline stage cache')
+    parser.add_argument('--seasons', type=int, default=20, help='Number of seasons')
+    parser.add_argument('--players', type=int, default=500, help='Players per season')
+    parser.add_argument('--fetch-delay', type=float, default=0.5, help='Simulated seconds per season fetched')
+    args = parser.parse_args()
+
+    stages = [Stage('fetch', synthetic_fetch(args.players, args.fetch_delay), [], ['seasons'], 1)] + STAGES[1:]
+    config = {
+        'seasons': [f'{year}-{str(year + 1)[-2:]}' for year in range(2024 - args.seasons, 2024)],
+        'scoring_rules': scoring_rules(DEFAULT_SCORING_FILE),
+        'min_games': 20, 'min_minutes': 10, 'league': 'default',
+        'metrics': ['PCT_MINUTES_PLAYED', 'FANTASY_POINTS_PER_MIN', 'PCT_GAMES_PLAYED'],
+        'weight_step': 0.01, 'min_weight': 0.0, 'max_weight': 1.0, 'method': 'pearson',
+    }
+
+    runs = [
+        ('cold', {}),
+        ('unchanged', {}),
+        ('--league espn', {'league': 'espn'}),
+        ('--min-games 40', {'min_games': 40}),
+    ]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = StageCache(cache_dir)
+        for label, changes in runs:
+            start = time.perf_counter()
+            results = run_pipeline(dict(config, **changes), cache, stages)
+            results['rank'].value
+            elapsed = time.perf_counter() - start
+            ran = [name for name, result in results.items() if not result.cached]
+            print(f"{label:<16} {elapsed * 1000:>8.1f} ms   ran: {', '.join(ran) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark the schedule-aware projections (Recommended Pickups/projections.py):
+every player over a full synthetic schedule, for the rest of the season and
+every matchup week, in many leagues at once.
+
+    python benchmarks/bench_projections.py
+    python benchmarks/bench_projections.py --players 600 --leagues 50
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Recommended Pickups'))
+from projections import Schedule, matchup_week, player_rates, project_points
+
+TEAMS = ['ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DAL', 'DEN', 'DET', 'GSW', 'HOU', 'IND', 'LAC', 'LAL', 'MEM',
+         'MIA', 'MIL', 'MIN', 'NOP', 'NYK', 'OKC', 'ORL', 'PHI', 'PHX', 'POR', 'SAC', 'SAS', 'TOR', 'UTA', 'WAS']
+
+
+def synthetic_schedule(start, days=170, seed=0):
+    """About 1,230 games: each day a random set of teams is paired up"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for day in range(days):
+        date = start + datetime.timedelta(days=day)
+        teams = rng.permutation(TEAMS)[:2 * rng.integers(3, 12)]
+        rows.extend((date, teams[i], teams[i + 1]) for i in range(0, len(teams), 2))
+    return pd.DataFrame(rows, columns=['GAME_DATE', 'HOME_TEAM', 'AWAY_TEAM'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark schedule-aware projections')
+    parser.add_argument('--players', type=int, default=550, help='Players to project')
+    parser.add_argument('--leagues', type=int, default=20, help='Scoring systems projected at once')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed repetitions')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    start = datetime.date(2024, 10, 22)
+    games = synthetic_schedule(start)
+    schedule = Schedule(games)
+
+    # Rest of the season plus every matchup week
+    weeks = sorted({matchup_week(schedule.start + datetime.timedelta(days=d))[0]
+                    for d in range(0, (schedule.end - schedule.start).days + 1, 7)})
+    windows = np.column_stack([schedule.window(schedule.start, schedule.end)] +
+                              [schedule.window(monday, monday + datetime.timedelta(days=6)) for monday in weeks])
+
+    teams = rng.choice(TEAMS, args.players)
+    play_rate, minutes = player_rates(rng.uniform(20, 100, args.players), rng.uniform(5, 70, args.players))
+    points_per_min = rng.uniform(0.5, 2.0, (args.players, args.leagues))
+
+    start_time = time.perf_counter()
+    for _ in range(args.repeat):
+        availability = schedule.availability(schedule.team_codes(teams))
+        projected_games, projected_points = project_points(availability, windows, play_rate, minutes, points_per_min)
+    elapsed = (time.perf_counter() - start_time) / args.repeat
+
+    print(f"{len(games)} games over {schedule.matrix.shape[1]} days, {args.players} players, "
+          f"{windows.shape[1]} windows (rest of season + {len(weeks)} weeks), {args.leagues} leagues")
+    print(f"projection: {elapsed * 1000:.2f} ms per run -> {projected_points.size:,} projected values")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark the add/drop roster optimizer (Recommended Pickups/roster_optimizer.py)
+on a synthetic 13-man roster and waiver pool, for swaps of 1 to --max-moves players.
+At the default scale each swap size is checked against a time budget, and the
+script exits with status 1 when one is over it.
+
+    python benchmarks/bench_roster_optimizer.py
+    python benchmarks/bench_roster_optimizer.py --pool 500 --max-moves 3 --top 10
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Recommended Pickups'))
+from roster_optimizer import DEFAULT_SLOTS, best_moves, parse_positions, slot_mask
+
+POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C', 'PG,SG', 'SG,SF', 'SF,PF', 'PF,C', 'G-F']
+
+# Seconds allowed for the slowest seed of each swap size, at the default scale
+BUDGETS = {1: 0.02, 2: 0.15, 3: 1.5}
+DEFAULT_SCALE = {'roster': 13, 'pool': 300, 'top': 5}
+
+
+def synthetic_players(n, prefix, rng, low=0, high=100):
+    return [{'name': f'{prefix} {i}', 'score': rng.uniform(low, high),
+             'mask': slot_mask(parse_positions(rng.choice(POSITIONS)), DEFAULT_SLOTS)} for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the add/drop roster optimizer')
+    parser.add_argument('--roster', type=int, default=DEFAULT_SCALE['roster'], help='Players on the roster')
+    parser.add_argument('--pool', type=int, default=DEFAULT_SCALE['pool'], help='Players in the waiver pool')
+    parser.add_argument('--max-moves', type=int, default=3, help='Largest swap size to time')
+    parser.add_argument('--top', type=int, default=DEFAULT_SCALE['top'], help='Moves returned')
+    parser.add_argument('--seeds', type=int, default=5, help='Random rosters and pools per swap size')
+    args = parser.parse_args()
+
+    # Budgets only mean something at the scale they were set for
+    check = all(getattr(args, key) == value for key, value in DEFAULT_SCALE.items())
+    over_budget = []
+    print(f"{args.roster}-man roster, {args.pool}-player pool, {len(DEFAULT_SLOTS)} starting slots, top {args.top} moves")
+    for moves in range(1, args.max_moves + 1):
+        times = []
+        for seed in range(args.seeds):
+            rng = random.Random(seed)
+            # Rostered players are mostly better than what is on waivers
+            roster = synthetic_players(args.roster, 'Rostered', rng, 30, 100)
+            pool = synthetic_players(args.pool, 'Available', rng, 0, 80)
+            start = time.perf_counter()
+            _, found, stats = best_moves(roster, pool, len(DEFAULT_SLOTS), moves, args.top)
+            times.append(time.perf_counter() - start)
+        times.sort()
+        budget = BUDGETS.get(moves) if check else None
+        status = ''
+        if budget is not None:
+            status = f"  budget {budget * 1000:.0f} ms {'ok' if times[-1] <= budget else 'OVER'}"
+            if times[-1] > budget:
+                over_budget.append(f'{moves} players')
+        print(f"up to {moves} players: median {times[len(times) // 2] * 1000:7.1f} ms, max {times[-1] * 1000:7.1f} ms "
+              f"({stats['candidates']} candidates, {stats['pruned_drop_sets']}/{stats['drop_sets']} drop sets pruned)"
+              + status)
+
+    if over_budget:
+        print(f"\nOver budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Load-test the ranking service (Recommended Pickups/ranking_service.py) in-process
+against synthetic rankings: concurrent keep-alive clients send a mix of pickup,
+player lookup and top-N requests, and the latency percentiles are reported.
+
+    python benchmarks/bench_service.py
+    python benchmarks/bench_service.py --clients 16 --requests 500 --players 600
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Recommended Pickups'))
+from ranking_service import RankingSnapshot, RankingStore, create_server
+
+TEAMS = ['ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DAL', 'DEN', 'DET', 'GSW', 'HOU', 'IND', 'LAC', 'LAL', 'MEM',
+         'MIA', 'MIL', 'MIN', 'NOP', 'NYK', 'OKC', 'ORL', 'PHI', 'PHX', 'POR', 'SAC', 'SAS', 'TOR', 'UTA', 'WAS']
+
+
+def synthetic_rankings(n_players, seed=0):
+    rng = np.random.default_rng(seed)
+    score = rng.random(n_players)
+    return pd.DataFrame({
+        'PLAYER_ID': np.arange(n_players) + 1000,
+        'PLAYER_NAME': [f'Player {i}' for i in range(n_players)],
+        'TEAM_ABBREVIATION': rng.choice(TEAMS, n_players),
+        'FANTASY_RANK_SCORE': score,
+        'FANTASY_RANK_PERCENTILE': pd.Series(score).rank(pct=True).to_numpy() * 100,
+        'FANTASY_POINTS_PER_MIN': rng.uniform(0.5, 2.0, n_players),
+        'PCT_MINUTES_PLAYED': rng.uniform(5, 80, n_players),
+        'PCT_GAMES_PLAYED': rng.uniform(10, 100, n_players),
+    })
+
+
+def request_mix(n_players, waiver_size, rng):
+    """One random request: (method, path, body)"""
+    kind = rng.random()
+    if kind < 0.6:
+        names = [f'Player {rng.randrange(n_players)}' for _ in range(waiver_size)]
+        return 'POST', '/pickups', json.dumps({'players': names, 'top': 10}).encode('utf-8')
+    if kind < 0.8:
+        query = urlencode([('name', f'Player {rng.randrange(n_players)}') for _ in range(3)])
+        return 'GET', f'/players?{query}', None
+    band = rng.randrange(0, 90)
+    return 'GET', f'/top?team={rng.choice(TEAMS)}&min_percentile={band}&max_percentile={band + 10}&n=10', None
+
+
+def run_client(port, n_requests, n_players, waiver_size, seed, latencies):
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    for _ in range(n_requests):
+        method, path, body = request_mix(n_players, waiver_size, rng)
+        start = time.perf_counter()
+        connection.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"{method} {path} returned {response.status}")
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the ranking service')
+    parser.add_argument('--players', type=int, default=600, help='Players in the synthetic rankings')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent clients')
+    parser.add_argument('--requests', type=int, default=250, help='Requests per client')
+    parser.add_argument('--waiver', type=int, default=150, help='Names per pickup request')
+    args = parser.parse_args()
+
+    store = RankingStore()
+    store.snapshots[None] = RankingSnapshot(synthetic_rankings(args.players))
+    server = create_server(store, port=0)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    latencies = []
+    clients = [threading.Thread(target=run_client,
+                                args=(port, args.requests, args.players, args.waiver, seed, latencies))
+               for seed in range(args.clients)]
+    start = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+
+    latencies = np.array(latencies) * 1000
+    print(f"{len(latencies)} requests from {args.clients} clients in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.0f} req/s)")
+    print("latency ms: " + "  ".join(f"p{p}={np.percentile(latencies, p):.2f}" for p in (50, 90, 99)) +
+          f"  max={latencies.max():.2f}")
+
+
+if __name__ == '__main__':
+    main()
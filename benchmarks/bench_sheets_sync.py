@@ -0,0 +1,69 @@
+"""
+Benchmark the incremental Google Sheets sync (ETL/sheets_sync.py) offline with the
+local stand-in backend: cells and requests sent for a nightly-style update, compared
+with clearing the sheet and re-uploading every cell.
+
+    python benchmarks/bench_sheets_sync.py
+    python benchmarks/bench_sheets_sync.py --rows 2000 --changed 0.02
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+from sheets_sync import LocalSheetBackend, dataframe_to_grid, sync_dataframe
+
+
+def synthetic_sheet(n_rows, n_stats=28, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.integers(0, 2000, size=(n_rows, n_stats)), columns=[f'STAT_{i}' for i in range(n_stats)])
+    df.insert(0, 'PLAYER_NAME', [f'Player {i}' for i in range(n_rows)])
+    df['FANTASY_POINTS'] = rng.random(n_rows).round(2) * 3000
+    return df
+
+
+def nightly_update(df, changed_fraction, seed=1):
+    """Add one night of games to a fraction of the players (sheet order is unchanged)"""
+    rng = np.random.default_rng(seed)
+    df = df.copy()
+    rows = rng.choice(len(df), size=max(1, int(len(df) * changed_fraction)), replace=False)
+    stats = [col for col in df.columns if col.startswith('STAT_')]
+    df.loc[rows, stats] += rng.integers(0, 30, size=(len(rows), len(stats)))
+    df.loc[rows, 'FANTASY_POINTS'] += 40
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the incremental Sheets sync')
+    parser.add_argument('--rows', type=int, default=600, help='Rows in the sheet')
+    parser.add_argument('--changed', type=float, default=0.05, help='Fraction of rows changed by the update')
+    args = parser.parse_args()
+
+    df = synthetic_sheet(args.rows)
+    updated = nightly_update(df, args.changed)
+
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        backend = LocalSheetBackend('bench')
+        sync_dataframe(df, backend, snapshot_dir)
+
+        requests_before, cells_before = backend.requests, backend.cells_written
+        start = time.perf_counter()
+        summary = sync_dataframe(updated, backend, snapshot_dir)
+        elapsed = time.perf_counter() - start
+        assert backend.read_grid() == dataframe_to_grid(updated)
+
+    full_cells = len(updated) * len(updated.columns) + len(updated.columns)
+    print(f"{args.rows} rows x {len(updated.columns)} columns, {args.changed:.0%} of rows changed")
+    print(f"clear + full upload: {full_cells:>8} cells, 2 requests")
+    print(f"incremental sync:    {backend.cells_written - cells_before:>8} cells, "
+          f"{backend.requests - requests_before} requests, {summary['ranges']} ranges "
+          f"(diff computed in {elapsed * 1000:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
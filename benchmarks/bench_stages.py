@@ -0,0 +1,219 @@
+"""
+Benchmark every pipeline stage on seeded synthetic data (benchmarks/synthetic.py):
+JSON payloads -> DataFrame, fantasy scoring, rolling form from game logs,
+cross-season aggregation, weight search, ranking and pickup matching.
+
+Each stage is timed over --repeat runs (median) and run once more under
+tracemalloc for its peak memory. Results can be saved as a JSON baseline and
+later runs checked against it: the check exits with status 1 when a stage is
+more than --max-slowdown slower than its baseline.
+
+    python benchmarks/bench_stages.py
+    python benchmarks/bench_stages.py --players 600 --seasons 10 --save
+    python benchmarks/bench_stages.py --check                       # regression gate
+    python benchmarks/bench_stages.py --check baseline.json --max-slowdown 0.5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import nba_fantasy  # noqa: F401 - puts the stage directories on sys.path
+import synthetic
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'stages.json')
+
+# Ranking setup of the default `rank` command
+METRICS = ['PCT_MINUTES_PLAYED', 'FANTASY_POINTS_PER_MIN', 'PCT_GAMES_PLAYED']
+
+# Parameters that must match for two runs to be compared
+SCALE_KEYS = ['players', 'seasons', 'games', 'available', 'seed', 'weight_step']
+
+
+def build_stages(args):
+    """
+    The stages in pipeline order as (name, function of the previous outputs).
+    Inputs are generated up front so only the stage itself is measured.
+    """
+    import pandas as pd
+    from scoring import load_scoring_systems
+    from transform import payload_to_dataframe, select_fantasy_columns, add_fantasy_metrics, finalize_fantasy_df
+    from box_scores import RollingForm, iter_payload_rows
+    from aggregation import aggregate_players
+    from fantasy_ranking import normalize_metrics, rank_players
+    from weight_search import search_weights
+    from name_index import NameIndex
+    from recommend_pickups import find_best_pickups
+
+    scoring = load_scoring_systems()
+    league = synthetic.League(args.players, args.seed)
+    payloads = {}
+    for i, season in enumerate(synthetic.seasons(args.seasons)):
+        if i:
+            league.next_season()
+        payloads[season] = league.season_payload(season, args.games)
+    game_logs = league.game_log_payload(season, args.games)
+
+    def parse(outputs):
+        raw = pd.concat([payload_to_dataframe(payload, season) for season, payload in payloads.items()],
+                        ignore_index=True)
+        return select_fantasy_columns(raw, scoring)
+
+    def score(outputs):
+        return finalize_fantasy_df(add_fantasy_metrics(outputs['parse'], scoring))
+
+    def form(outputs):
+        rolling = RollingForm(scoring)
+        rolling.consume(iter_payload_rows(game_logs))
+        return rolling.frame(30, season=season)
+
+    def aggregate(outputs):
+        return aggregate_players(outputs['score'])
+
+    def weights(outputs):
+        df = outputs['aggregate']
+        X = normalize_metrics(df.copy(), METRICS)
+        y = df['FANTASY_POINTS'].to_numpy(dtype=float)
+        _, _, best_weights, _ = search_weights(X, y, step=args.weight_step)
+        return best_weights
+
+    def rank(outputs):
+        df = outputs['aggregate'].copy()
+        X = normalize_metrics(df, METRICS)
+        return rank_players(df, X, outputs['weights'])
+
+    available = synthetic.available_names(payload_names(payloads), args.available, args.seed)
+
+    def pickups(outputs):
+        rankings = outputs['rank']
+        recommendations, _ = find_best_pickups(rankings, available, top_n=10, index=NameIndex(rankings['PLAYER_NAME']))
+        return recommendations
+
+    return [('parse', parse), ('score', score), ('form', form), ('aggregate', aggregate),
+            ('weights', weights), ('rank', rank), ('pickups', pickups)]
+
+
+def payload_names(payloads):
+    """Every player name in the season payloads, in first-seen order"""
+    names = {}
+    for payload in payloads.values():
+        results = payload['resultSets'][0]
+        name_index = results['headers'].index('PLAYER_NAME')
+        for row in results['rowSet']:
+            names.setdefault(row[name_index], None)
+    return list(names)
+
+
+def measure(func, outputs, repeat):
+    """(median seconds, peak traced bytes, output) of `func(outputs)`"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(outputs)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func(outputs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(times), peak, result
+
+
+def run_suite(args):
+    """{'config': ..., 'stages': {name: {'seconds', 'peak_mb', 'rows'}}}"""
+    results = {}
+    outputs = {}
+    for name, func in build_stages(args):
+        seconds, peak, outputs[name] = measure(func, outputs, args.repeat)
+        rows = len(outputs[name]) if hasattr(outputs[name], '__len__') else 1
+        results[name] = {'seconds': round(seconds, 6), 'peak_mb': round(peak / 1024 ** 2, 3), 'rows': rows}
+        print(f"{name:<10} {seconds * 1000:>9.1f} ms {peak / 1024 ** 2:>9.1f} MB peak {rows:>9,} rows")
+    config = {key: getattr(args, key) for key in SCALE_KEYS}
+    return {'config': config, 'python': platform.python_version(), 'machine': platform.machine(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'stages': results}
+
+
+def check_regressions(current, baseline, max_slowdown, min_delta):
+    """
+    Names of the stages more than `max_slowdown` (0.25 = 25%) slower than the
+    baseline; differences under `min_delta` seconds are timer noise and pass.
+    """
+    regressions = []
+    print(f"\n{'stage':<10} {'baseline':>11} {'current':>11} {'change':>8}")
+    for name, result in current['stages'].items():
+        before = baseline['stages'].get(name)
+        if before is None:
+            print(f"{name:<10} {'-':>11} {result['seconds'] * 1000:>8.1f} ms      new")
+            continue
+        change = result['seconds'] / before['seconds'] - 1 if before['seconds'] else 0.0
+        slower = change > max_slowdown and result['seconds'] - before['seconds'] > min_delta
+        if slower:
+            regressions.append(name)
+        print(f"{name:<10} {before['seconds'] * 1000:>8.1f} ms {result['seconds'] * 1000:>8.1f} ms "
+              f"{change:>+7.0%}{'  REGRESSION' if slower else ''}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark each pipeline stage on synthetic data')
+    parser.add_argument('--players', type=int, default=500, help='Players per season')
+    parser.add_argument('--seasons', type=int, default=5, help='Seasons of season totals')
+    parser.add_argument('--games', type=int, default=82, help='Games per team (season totals and game logs)')
+    parser.add_argument('--available', type=int, default=300, help='Names on the available-players list')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic data')
+    parser.add_argument('--weight-step', type=float, default=0.01, help='Grid step of the weight search')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per stage (the median is used)')
+    parser.add_argument('--save', nargs='?', const=DEFAULT_BASELINE, help='Write the results as a baseline JSON file')
+    parser.add_argument('--check', nargs='?', const=DEFAULT_BASELINE, help='Fail if a stage is slower than this baseline')
+    parser.add_argument('--max-slowdown', type=float, default=0.25, help='Allowed slowdown per stage (0.25 = 25%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=2.0, help='Slowdowns under this many ms always pass')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    baseline = None
+    if args.check:
+        try:
+            with open(args.check, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading baseline {args.check}: {e}")
+            return 2
+        different = {key: (baseline['config'].get(key), getattr(args, key)) for key in SCALE_KEYS
+                     if baseline['config'].get(key) != getattr(args, key)}
+        if different:
+            print("Error: the baseline was measured at a different scale: " +
+                  ', '.join(f'{key} {old} -> {new}' for key, (old, new) in different.items()))
+            return 2
+
+    print(f"{args.players} players x {args.seasons} seasons, {args.games} games, "
+          f"{args.available} available names, seed {args.seed}, median of {args.repeat}\n")
+    results = run_suite(args)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.save}")
+
+    if baseline is not None:
+        regressions = check_regressions(results, baseline, args.max_slowdown, args.min_delta_ms / 1000)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) slower than the baseline by more than "
+                  f"{args.max_slowdown:.0%}: {', '.join(regressions)}")
+            return 1
+        print("\nNo stage is slower than the baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Measure cold startup of the nba_fantasy command line tool and check it against
+a time budget: `--help`, `fetch --help` and a pickup run against a small rankings
+file. Each command runs in a fresh interpreter; the median of several runs is used.
+Exits with status 1 when a command is over its budget.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10 --importtime
+"""
+import argparse
+import csv
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+CLI = os.path.join(ROOT, 'nba_fantasy.py')
+
+# Seconds of wall time allowed for each command (median of the runs)
+BUDGETS = {
+    'help': 0.3,
+    'fetch --help': 0.3,
+    'pickups': 1.5,
+}
+
+
+def write_fixtures(directory, n_players=500):
+    """A rankings CSV and an available-players CSV for the pickup command"""
+    rankings_path = os.path.join(directory, 'nba_fantasy_rankings_three_metrics.csv')
+    with open(rankings_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['PLAYER_NAME', 'TEAM_ABBREVIATION', 'FANTASY_RANK_PERCENTILE',
+                         'FANTASY_POINTS_PER_MIN', 'PCT_MINUTES_PLAYED', 'PCT_GAMES_PLAYED'])
+        for i in range(n_players):
+            writer.writerow([f'Player {i}', 'BOS', 100 * (i + 1) / n_players, 1.0, 50.0, 75.0])
+
+    available_path = os.path.join(directory, 'available.csv')
+    with open(available_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['PLAYER_NAME'])
+        for i in range(0, n_players, 7):
+            writer.writerow([f'Player {i}'])
+    return available_path
+
+
+def time_command(args, cwd, repeat):
+    """Median wall time of `python nba_fantasy.py <args>` in fresh interpreters"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, CLI] + args, cwd=cwd, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def slowest_imports(args, cwd, count=8):
+    """The `count` imports with the largest cumulative time, from -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', CLI] + args, cwd=cwd,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            stdin=subprocess.DEVNULL, text=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold startup of the command line tool')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per command (the median is reported)')
+    parser.add_argument('--importtime', action='store_true', help='Also show the slowest imports of each command')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        available_path = write_fixtures(directory)
+        commands = {
+            'help': ['--help'],
+            'fetch --help': ['fetch', '--help'],
+            'pickups': ['pickups', '--file', available_path, '--top', '5'],
+        }
+
+        print(f"{'command':<15} {'median':>9} {'budget':>9}")
+        over_budget = []
+        for name, command in commands.items():
+            elapsed = time_command(command, directory, args.repeat)
+            status = 'ok' if elapsed <= BUDGETS[name] else 'OVER'
+            print(f"{name:<15} {elapsed * 1000:>7.0f}ms {BUDGETS[name] * 1000:>7.0f}ms  {status}")
+            if status != 'ok':
+                over_budget.append(name)
+
+            if args.importtime:
+                for cumulative, module in slowest_imports(command, directory):
+                    print(f"    {cumulative / 1000:>8.1f}ms  {module}")
+
+    if over_budget:
+        print(f"\nOver budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+A local stand-in for stats.nba.com, for exercising the fetch path offline.
+
+    python benchmarks/stub_server.py --port 8765 --latency 0.2 --error-rate 0.05 --rate-limit 20
+    python ETL/nba_api.py --base-url http://127.0.0.1:8765 --seasons 2022-23 2023-24 --no-csv
+
+Serves /stats/leaguedashplayerstats and /stats/playergamelogs with the responses
+recorded by `nba_api.py --record DIR` (--recordings DIR), falling back to
+seeded synthetic payloads (benchmarks/synthetic.py). Every response is delayed
+by --latency +/- --jitter seconds; --error-rate of them fail with a 500 and
+--throttle-rate with a 429. With --rate-limit, requests beyond that many per
+second are throttled like the real site, with a Retry-After header.
+/_stats returns the server's counters as JSON.
+"""
+import os
+import sys
+import copy
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ETL'))
+from fetcher import TokenBucket
+from transport import read_recording, recording_path
+import synthetic
+
+ENDPOINTS = ['leaguedashplayerstats', 'playergamelogs']
+
+# Synthetic seasons all come from one league, advanced a season at a time from this one
+FIRST_SYNTHETIC_YEAR = 1946
+
+
+class StubStats:
+    """Response policy and counters of the stand-in server (shared by all handler threads)"""
+
+    def __init__(self, latency=0.05, jitter=0.0, error_rate=0.0, throttle_rate=0.0, rate_limit=None,
+                 retry_after=1, recordings=None, players=500, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.retry_after = retry_after
+        self.recordings = recordings
+        self.players = players
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.payloads = {}
+        self.league = synthetic.League(players, seed)
+        self.league_year = FIRST_SYNTHETIC_YEAR
+        self.rosters = {FIRST_SYNTHETIC_YEAR: dict(self.league.active)}
+        self.counts = {'requests': 0, 'ok': 0, 'recorded': 0, 'synthetic': 0, 'errors': 0, 'throttled': 0,
+                       'not_found': 0, 'bytes': 0}
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counts[name] += n
+
+    def season_league(self, season):
+        """
+        The league as of `season`: the shared league is advanced with next_season()
+        up to it, so a player id keeps its name across seasons. Each season draws its
+        stats from its own seed, so payloads don't depend on the order of requests.
+        """
+        year = max(FIRST_SYNTHETIC_YEAR, int(season[:4]))
+        with self.lock:
+            while self.league_year < year:
+                self.league.next_season()
+                self.league_year += 1
+                self.rosters[self.league_year] = dict(self.league.active)
+            league = copy.copy(self.league)
+        league.active = self.rosters[year]
+        league.rng = np.random.default_rng([self.seed, year])
+        return league
+
+    def synthetic_payload(self, endpoint, params):
+        """Generated payload for a request, built once per endpoint and season"""
+        season = params.get('Season') or synthetic.seasons(1)[0]
+        key = (endpoint, season, params.get('SeasonType', ''))
+        with self.lock:
+            body = self.payloads.get(key)
+        if body is None:
+            league = self.season_league(season)
+            if endpoint == 'leaguedashplayerstats':
+                payload = league.season_payload(season, 82 if params.get('SeasonType') != 'Playoffs' else 16)
+            else:
+                payload = league.game_log_payload(season)
+            body = json.dumps(payload, separators=(',', ':'))
+            with self.lock:
+                self.payloads[key] = body
+        return body
+
+    def respond(self, path, params):
+        """(status, headers, body text) for a GET of `path` with query `params`"""
+        if path == '/_stats':
+            with self.lock:
+                return 200, {}, json.dumps(self.counts)
+
+        self.count('requests')
+        with self.lock:
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+        time.sleep(delay)
+
+        endpoint = path.rstrip('/').rsplit('/', 1)[-1]
+        if endpoint not in ENDPOINTS:
+            self.count('not_found')
+            return 404, {}, json.dumps({'error': f'unknown endpoint {path}'})
+
+        with self.lock:
+            draw = self.random.random()
+        if (self.bucket is not None and not self.bucket.try_acquire()) or draw < self.throttle_rate:
+            self.count('throttled')
+            return 429, {'Retry-After': str(self.retry_after)}, json.dumps({'error': 'Too Many Requests'})
+        if draw < self.throttle_rate + self.error_rate:
+            self.count('errors')
+            return 500, {}, json.dumps({'error': 'Internal Server Error'})
+
+        if self.recordings:
+            recorded = read_recording(recording_path(self.recordings, path, params))
+            if recorded is not None:
+                self.count('recorded')
+                self.count('ok')
+                return recorded.status_code, {}, recorded.text
+        self.count('synthetic')
+        self.count('ok')
+        return 200, {}, self.synthetic_payload(endpoint, params)
+
+
+def make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, so pooled client sessions reuse their connections
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            status, headers, text = stub.respond(parsed.path, dict(parse_qsl(parsed.query, keep_blank_values=True)))
+            body = text.encode('utf-8')
+            stub.count('bytes', len(body))
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(stub, host='127.0.0.1', port=0):
+    """Start the server in a background thread; returns it (server.server_address has the port)"""
+    server = ThreadingHTTPServer((host, port), make_handler(stub))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Local stand-in for stats.nba.com')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (0: any free port)')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds before each response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random +/- seconds added to the latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with a 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with a 429')
+    parser.add_argument('--rate-limit', type=float, default=None, help='Requests per second before answering 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with a 429')
+    parser.add_argument('--recordings', help='Directory of responses recorded with nba_api.py --record')
+    parser.add_argument('--players', type=int, default=500, help='Players in synthetic payloads')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic payloads and failures')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stub = StubStats(args.latency, args.jitter, args.error_rate, args.throttle_rate, args.rate_limit,
+                     args.retry_after, args.recordings, args.players, args.seed)
+    server = serve(stub, args.host, args.port)
+    host, port = server.server_address[:2]
+    # The first line is read by bench_ingest.py to find the port
+    print(f"Serving on http://{host}:{port}", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(json.dumps(stub.counts))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Seeded synthetic NBA data for the benchmarks: leaguedashplayerstats season
+payloads, playergamelogs payloads and available-player name lists, shaped like
+what stats.nba.com and the fantasy sites return, at any scale.
+
+The same seed always gives the same players, teams, stats and names. Players
+keep their PLAYER_ID across seasons (with some turnover), so cross-season
+aggregation has real work to do.
+"""
+import datetime
+
+import numpy as np
+
+TEAMS = ['ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DAL', 'DEN', 'DET', 'GSW', 'HOU', 'IND', 'LAC', 'LAL', 'MEM',
+         'MIA', 'MIL', 'MIN', 'NOP', 'NYK', 'OKC', 'ORL', 'PHI', 'PHX', 'POR', 'SAC', 'SAS', 'TOR', 'UTA', 'WAS']
+
+FIRST_NAMES = ['Aaron', 'Bam', 'Cade', 'Damian', 'Evan', 'Franz', 'Gary', 'Herbert', 'Isaiah', 'Jalen', 'Kevin',
+               'LaMelo', 'Mikal', 'Nikola', 'OG', 'Pascal', 'Quentin', 'Rudy', 'Scottie', 'Tyrese', 'Victor',
+               'Walker', 'Zion', 'Anthony', 'Brandon', 'Chris', 'Derrick', 'Jaren', 'Luka', 'Shai']
+LAST_NAMES = ['Adams', 'Brown', 'Cunningham', 'Dončić', 'Edwards', 'Fox', 'Gobert', 'Harden', 'Irving', 'Jokić',
+              'Kuzma', 'Lillard', 'Mitchell', 'Nurkić', 'Oladipo', 'Porziņģis', 'Randle', 'Siakam', 'Towns',
+              'Valančiūnas', 'Wembanyama', 'Young', 'Williams', 'Johnson', "O'Neal", 'Jackson', 'Bridges',
+              'Gilgeous-Alexander', 'Antetokounmpo', 'Murray']
+SUFFIXES = ['', '', '', '', ' Jr.', ' II', ' III', ' Sr.']
+
+# Column order of the real leaguedashplayerstats (Base, Totals) response
+SEASON_HEADERS = ['PLAYER_ID', 'PLAYER_NAME', 'NICKNAME', 'TEAM_ID', 'TEAM_ABBREVIATION', 'AGE', 'GP', 'W', 'L',
+                  'W_PCT', 'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+                  'OREB', 'DREB', 'REB', 'AST', 'TOV', 'STL', 'BLK', 'BLKA', 'PF', 'PFD', 'PTS', 'PLUS_MINUS',
+                  'NBA_FANTASY_PTS', 'DD2', 'TD3']
+
+GAME_LOG_HEADERS = ['SEASON_YEAR', 'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID', 'TEAM_ABBREVIATION', 'GAME_ID',
+                    'GAME_DATE', 'MATCHUP', 'WL', 'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM',
+                    'FTA', 'FT_PCT', 'OREB', 'DREB', 'REB', 'AST', 'TOV', 'STL', 'BLK', 'BLKA', 'PF', 'PFD', 'PTS',
+                    'PLUS_MINUS']
+
+# Per-minute rates of the counting stats for an average player
+RATES = {'FGA': 0.38, 'FG3A': 0.14, 'FTA': 0.11, 'OREB': 0.05, 'DREB': 0.15, 'AST': 0.1, 'TOV': 0.05,
+         'STL': 0.03, 'BLK': 0.02, 'BLKA': 0.02, 'PF': 0.07, 'PFD': 0.07}
+
+
+def seasons(n, last_start_year=2024):
+    """The `n` seasons ending with the one starting in `last_start_year` ('2021-22', ...)"""
+    return [f'{year}-{str(year + 1)[-2:]}' for year in range(last_start_year - n + 1, last_start_year + 1)]
+
+
+def player_names(n, seed=0):
+    """`n` distinct player names with accents, apostrophes and suffixes"""
+    rng = np.random.default_rng(seed)
+    names, seen = [], set()
+    while len(names) < n:
+        name = (f'{FIRST_NAMES[rng.integers(len(FIRST_NAMES))]} {LAST_NAMES[rng.integers(len(LAST_NAMES))]}'
+                f'{SUFFIXES[rng.integers(len(SUFFIXES))]}')
+        if name in seen:
+            name = f'{name} {len(names)}'
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+class League:
+    """
+    A seeded population of `n_players` active players per season. Each player has a
+    team, a minutes share, a games-played rate and a skill multiplier on the
+    per-minute stat rates; `turnover` of the players are replaced every season.
+    """
+
+    def __init__(self, n_players=500, seed=0, turnover=0.15):
+        self.n_players = n_players
+        self.seed = seed
+        self.turnover = turnover
+        self.rng = np.random.default_rng(seed)
+        self.names = player_names(n_players * 4, seed)
+        self.next_id = 0
+        self.active = self._new_players(n_players)
+
+    def _new_players(self, n):
+        ids = np.arange(self.next_id, self.next_id + n)
+        self.next_id += n
+        return {
+            'id': ids + 1_600_000,
+            'name': [self.names[i % len(self.names)] for i in ids],
+            'team': self.rng.integers(len(TEAMS), size=n),
+            'minutes': self.rng.uniform(5, 38, n),
+            'play_rate': self.rng.beta(5, 1.5, n),
+            'skill': self.rng.lognormal(0, 0.25, n),
+            'age': self.rng.integers(19, 38, n),
+        }
+
+    def next_season(self):
+        """Replace `turnover` of the players and move a few to other teams"""
+        n_new = int(self.n_players * self.turnover)
+        leaving = self.rng.choice(self.n_players, n_new, replace=False)
+        new = self._new_players(n_new)
+        for key, values in new.items():
+            column = np.array(self.active[key], dtype=object if key == 'name' else None)
+            column[leaving] = values
+            self.active[key] = column.tolist() if key == 'name' else column
+        traded = self.rng.random(self.n_players) < 0.1
+        self.active['team'] = np.where(traded, self.rng.integers(len(TEAMS), size=self.n_players), self.active['team'])
+        self.active['age'] = self.active['age'] + 1
+
+    def _box_scores(self, minutes, skill):
+        """Counting stats for arrays of minutes played, consistent with each other"""
+        rng = self.rng
+        stats = {stat: rng.poisson(rate * minutes * skill) for stat, rate in RATES.items()}
+        stats['FG3A'] = np.minimum(stats['FG3A'], stats['FGA'])
+        stats['FGM'] = rng.binomial(stats['FGA'], 0.47)
+        stats['FG3M'] = np.minimum(rng.binomial(stats['FG3A'], 0.36), stats['FGM'])
+        stats['FTM'] = rng.binomial(stats['FTA'], 0.78)
+        stats['REB'] = stats['OREB'] + stats['DREB']
+        stats['PTS'] = 2 * stats['FGM'] + stats['FG3M'] + stats['FTM']
+        return stats
+
+    def season_payload(self, season, games=82):
+        """A leaguedashplayerstats response (season totals) as parsed JSON"""
+        p = self.active
+        gp = np.maximum(self.rng.binomial(games, p['play_rate']), 1)
+        minutes = np.round(gp * p['minutes'] * self.rng.uniform(0.8, 1.1, self.n_players), 1)
+        stats = self._box_scores(minutes, p['skill'])
+        wins = self.rng.binomial(gp, 0.5)
+        columns = {
+            'PLAYER_ID': p['id'], 'PLAYER_NAME': p['name'], 'NICKNAME': [name.split()[0] for name in p['name']],
+            'TEAM_ID': p['team'] + 1610612737, 'TEAM_ABBREVIATION': [TEAMS[t] for t in p['team']],
+            'AGE': p['age'], 'GP': gp, 'W': wins, 'L': gp - wins, 'W_PCT': np.round(wins / gp, 3), 'MIN': minutes,
+            'FG_PCT': np.round(stats['FGM'] / np.maximum(stats['FGA'], 1), 3),
+            'FG3_PCT': np.round(stats['FG3M'] / np.maximum(stats['FG3A'], 1), 3),
+            'FT_PCT': np.round(stats['FTM'] / np.maximum(stats['FTA'], 1), 3),
+            'PLUS_MINUS': self.rng.integers(-300, 300, self.n_players),
+            'NBA_FANTASY_PTS': np.zeros(self.n_players), 'DD2': self.rng.poisson(3, self.n_players),
+            'TD3': self.rng.poisson(0.2, self.n_players),
+        }
+        columns.update(stats)
+        return _payload('LeagueDashPlayerStats', SEASON_HEADERS, columns, season)
+
+    def game_log_payload(self, season, games=82, first_day=None):
+        """
+        A playergamelogs response: every team plays `games` games, about one every
+        other day, and each player appears in the games they played (newest first,
+        as the API returns them).
+        """
+        p = self.active
+        first_day = first_day or datetime.date(int(season[:4]), 10, 22)
+        days = [first_day + datetime.timedelta(days=int(d)) for d in
+                np.sort(self.rng.choice(int(games * 2.1), games, replace=False))]
+
+        played = self.rng.random((self.n_players, games)) < p['play_rate'][:, None]
+        player_rows, game_numbers = np.nonzero(played)
+        minutes = np.round(np.clip(self.rng.normal(p['minutes'][player_rows], 5), 1, 48), 1)
+        stats = self._box_scores(minutes, p['skill'][player_rows])
+        team = p['team'][player_rows]
+        columns = {
+            'SEASON_YEAR': [season] * len(player_rows), 'PLAYER_ID': p['id'][player_rows],
+            'PLAYER_NAME': [p['name'][i] for i in player_rows], 'TEAM_ID': team + 1610612737,
+            'TEAM_ABBREVIATION': [TEAMS[t] for t in team],
+            'GAME_ID': [f'002{season[2:4]}{t:02d}{g:03d}' for t, g in zip(team, game_numbers)],
+            'GAME_DATE': [days[g].isoformat() + 'T00:00:00' for g in game_numbers],
+            'MATCHUP': [f'{TEAMS[t]} vs. {TEAMS[(t + 1 + g) % len(TEAMS)]}' for t, g in zip(team, game_numbers)],
+            'WL': self.rng.choice(['W', 'L'], len(player_rows)), 'MIN': minutes,
+            'FG_PCT': np.round(stats['FGM'] / np.maximum(stats['FGA'], 1), 3),
+            'FG3_PCT': np.round(stats['FG3M'] / np.maximum(stats['FG3A'], 1), 3),
+            'FT_PCT': np.round(stats['FTM'] / np.maximum(stats['FTA'], 1), 3),
+            'PLUS_MINUS': self.rng.integers(-30, 30, len(player_rows)),
+        }
+        columns.update(stats)
+        order = np.argsort(game_numbers, kind='stable')[::-1]
+        return _payload('PlayerGameLogs', GAME_LOG_HEADERS, columns, season, order)
+
+
+def _payload(name, headers, columns, season, order=None):
+    """A stats.nba.com style response: resultSets of headers and rows of plain JSON values"""
+    values = [np.asarray(columns[header]) if not isinstance(columns[header], list) else columns[header]
+              for header in headers]
+    values = [column.tolist() if isinstance(column, np.ndarray) else column for column in values]
+    rows = [list(row) for row in zip(*values)]
+    if order is not None:
+        rows = [rows[i] for i in order]
+    return {'resource': name.lower(), 'parameters': {'Season': season},
+            'resultSets': [{'name': name, 'headers': headers, 'rowSet': rows}]}
+
+
+def season_payloads(n_seasons=3, n_players=500, seed=0, last_start_year=2024):
+    """{season: leaguedashplayerstats payload} for `n_seasons` consecutive seasons"""
+    league = League(n_players, seed)
+    payloads = {}
+    for i, season in enumerate(seasons(n_seasons, last_start_year)):
+        if i:
+            league.next_season()
+        payloads[season] = league.season_payload(season)
+    return payloads
+
+
+def available_names(names, n, seed=0, misspelled=0.2, unknown=0.05):
+    """
+    `n` names of available players as a fantasy site would list them: mostly exact,
+    some without accents or suffixes or with a typo, and a few not in `names`.
+    """
+    from name_index import fold_accents
+
+    rng = np.random.default_rng(seed)
+    chosen = [names[i] for i in rng.choice(len(names), min(n, len(names)), replace=False)]
+    result = []
+    for name in chosen:
+        draw = rng.random()
+        if draw < unknown:
+            name = f'Unknown Prospect {len(result)}'
+        elif draw < unknown + misspelled:
+            name = fold_accents(name)
+            if rng.random() < 0.5 and len(name) > 4:
+                i = int(rng.integers(1, len(name) - 2))
+                name = name[:i] + name[i + 1] + name[i] + name[i + 2:]
+            else:
+                name = name.replace(' Jr.', '').replace(' III', '').replace(' II', '').lower()
+        result.append(name)
+    return result
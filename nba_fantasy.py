@@ -0,0 +1,123 @@
+"""
+NBA fantasy basketball pipeline as a library and a single command line tool.
+
+    import nba_fantasy
+    raw = nba_fantasy.fetch(['2023-24', '2024-25'])
+    stats = nba_fantasy.transform(raw)
+    players = nba_fantasy.aggregate(stats)
+    rankings = nba_fantasy.rank(players)
+    picks, unmatched = nba_fantasy.recommend(rankings, ['Jalen Brunson', 'Derrick White'])
+
+    python nba_fantasy.py fetch --seasons 2024-25
+    python nba_fantasy.py rank --league espn
+    python nba_fantasy.py pickups --file available.csv
+    python nba_fantasy.py batch-pickups --dir waivers/
+
+Each stage module (and pandas, numpy, requests, the Google Sheets libraries) is
+only imported when a function or command that needs it runs, so importing this
+module and `--help` stay fast.
+"""
+import os
+import sys
+import argparse
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STAGE_DIRS = [os.path.join(ROOT, 'ETL'), os.path.join(ROOT, 'Rankings'), os.path.join(ROOT, 'Recommended Pickups')]
+for stage_dir in STAGE_DIRS:
+    if stage_dir not in sys.path:
+        sys.path.insert(0, stage_dir)
+
+# Subcommand -> (stage module, description)
+COMMANDS = {
+    'fetch': ('nba_api', 'Fetch season stats from stats.nba.com and build the fantasy dataset'),
+    'backfill': ('backfill', 'Backfill historical seasons into the data store, resumably'),
+    'form': ('box_scores', 'Fetch per-game logs and compute rolling-window form'),
+    'rank': ('fantasy_ranking', 'Aggregate players across seasons and rank them'),
+    'pickups': ('recommend_pickups', 'Recommend the best available players to pick up'),
+    'project': ('projections', 'Project rest-of-season and weekly fantasy points from a schedule'),
+    'batch-pickups': ('batch_pickups', 'Recommend pickups for many leagues in one run'),
+    'optimize': ('roster_optimizer', 'Suggest add/drop moves that improve your own roster'),
+    'run': ('pipeline', 'Run fetch through ranking, reusing cached stage outputs'),
+    'serve': ('ranking_service', 'Serve rankings and pickups over a local JSON HTTP API'),
+}
+
+
+def fetch(seasons=None, workers=4, rate=2.0, timeout=10.0, retries=4, cache=None):
+    """Raw season totals for `seasons` as one DataFrame (None if nothing could be fetched)"""
+    import nba_api
+
+    return nba_api.fetch_seasons(seasons or nba_api.DEFAULT_SEASONS, workers=workers, rate=rate,
+                                 timeout=timeout, retries=retries, cache=cache)
+
+
+def transform(raw_df, scoring=None):
+    """Fantasy dataset (every league's points and the derived columns) from raw season totals"""
+    from transform import transform as transform_raw
+
+    return transform_raw(raw_df, scoring)
+
+
+def aggregate(df, min_games=20, min_minutes=10):
+    """One row per player across seasons, filtered by games and minutes"""
+    from aggregation import aggregate_players
+
+    return aggregate_players(df, min_games=min_games, min_minutes=min_minutes)
+
+
+def rank(players_df, metrics=None, weights=None, step=0.01, method='pearson'):
+    """
+    Rank aggregated players by a weighted score of the normalized `metrics`
+    (default: the same three as the rank command).
+    Without `weights`, the weights that best track total fantasy points are searched for.
+    """
+    import numpy as np
+    from fantasy_ranking import DEFAULT_METRICS, normalize_metrics, rank_players
+    from weight_search import search_weights
+
+    metrics = list(metrics or DEFAULT_METRICS)
+    players_df = players_df.copy()
+    X = normalize_metrics(players_df, metrics)
+    if weights is None:
+        y = players_df['FANTASY_POINTS'].to_numpy(dtype=np.float64)
+        _, _, weights, _ = search_weights(X, y, step=step, method=method)
+    return rank_players(players_df, X, weights)
+
+
+def recommend(rankings_df, available_players, top_n=10, index=None, rank_by='FANTASY_RANK_PERCENTILE'):
+    """
+    Best `top_n` of `available_players` (names) according to `rankings_df`.
+    Returns (recommendations, unmatched names); pass a NameIndex built once from
+    the rankings' PLAYER_NAME column to reuse it across calls. To rank by
+    projected points, add projections first and pass rank_by='PROJ_POINTS_ROS'.
+    """
+    from recommend_pickups import find_best_pickups
+
+    return find_best_pickups(rankings_df, available_players, top_n, index=index, rank_by=rank_by)
+
+
+def project(rankings_df, schedule_file, as_of=None, week_start=None):
+    """Rankings plus projected games and points for the rest of the season and the matchup week"""
+    from projections import Schedule, project_rankings, read_schedule
+
+    return project_rankings(rankings_df, Schedule(read_schedule(schedule_file)), as_of, week_start)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = argparse.ArgumentParser(
+        description='NBA Fantasy Basketball pipeline',
+        epilog="Run '%(prog)s <command> --help' for a command's options."
+    )
+    parser.add_argument('command', choices=list(COMMANDS),
+                        help='; '.join(f'{name}: {description}' for name, (_, description) in COMMANDS.items()))
+    # Only the command name is parsed here; the rest goes to the stage
+    args = parser.parse_args(argv[:1])
+
+    # Only the chosen stage's module gets imported
+    module_name = COMMANDS[args.command][0]
+    module = __import__(module_name)
+    return module.main(argv[1:])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
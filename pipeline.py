@@ -0,0 +1,354 @@
+"""
+The fetch -> transform -> aggregate -> weights -> rank pipeline with a
+content-addressed stage cache, so a re-run only recomputes what changed.
+
+    python pipeline.py --seasons 2023-24 2024-25
+    python pipeline.py --league espn --top 25     # fetch, transform and aggregate come from the cache
+
+Each stage declares its inputs (upstream stages) and the parameters it depends on.
+Its cache key hashes the stage name and version, those parameters and the content
+hashes of its inputs' outputs (a Merkle chain), so a changed parameter invalidates
+exactly the stages downstream of it. When a stage's key is in the cache, its
+upstream stages are not even loaded. Aggregation keeps every league's columns, so
+switching --league only re-runs the weight search and ranking.
+"""
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+import argparse
+from collections import namedtuple
+
+import nba_fantasy  # noqa: F401 - puts the stage directories on sys.path
+from response_cache import season_is_closed
+from scoring import DEFAULT_LEAGUE, DEFAULT_SCORING_FILE
+from instrumentation import add_arguments, instrumented, row_count, stage as measure
+
+DEFAULT_CACHE_DIR = '.pipeline_cache'
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+# name: cache key part; func(config, *input values); inputs: upstream stage names;
+# params: config keys the output depends on; version: bump when the stage's code changes
+Stage = namedtuple('Stage', ['name', 'func', 'inputs', 'params', 'version'])
+
+
+def content_hash(value):
+    """Hash of a stage output: DataFrames by their values, columns and dtypes; anything else as JSON"""
+    import pandas as pd
+
+    h = hashlib.sha256()
+    if isinstance(value, pd.DataFrame):
+        h.update(json.dumps([[str(col) for col in value.columns], [str(t) for t in value.dtypes]]).encode('utf-8'))
+        h.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    else:
+        h.update(json.dumps(value, sort_keys=True, default=str).encode('utf-8'))
+    return h.hexdigest()
+
+
+def stage_key(stage, config, input_hashes):
+    """Cache key of a stage run: its name, version, parameters and the hashes of its inputs"""
+    params = {name: config.get(name) for name in stage.params}
+    raw = json.dumps([stage.name, stage.version, params, input_hashes], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class StageCache:
+    """
+    Stage outputs pickled on disk, one file per key, with an index of sizes,
+    content hashes and last access times. Bounded by `max_bytes`, evicting the
+    least recently used outputs.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        os.makedirs(cache_dir, exist_ok=True)
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.index = {}
+
+    def _save_index(self):
+        with open(self.index_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(self.index_path + '.tmp', self.index_path)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.pkl')
+
+    def entry(self, key):
+        """Index entry of a cached output (None on a miss); marks it as recently used"""
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        if not os.path.exists(self._path(key)):
+            del self.index[key]
+            self._save_index()
+            return None
+        entry['last_access'] = time.time()
+        self._save_index()
+        return entry
+
+    def load(self, key):
+        with open(self._path(key), 'rb') as f:
+            return pickle.load(f)
+
+    def store(self, key, stage_name, value, value_hash):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(self._path(key) + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(self._path(key) + '.tmp', self._path(key))
+        now = time.time()
+        self.index[key] = {'stage': stage_name, 'content_hash': value_hash, 'size': len(data),
+                           'created': now, 'last_access': now}
+        self._evict(keep=key)
+        self._save_index()
+
+    def _evict(self, keep=None):
+        total = sum(entry['size'] for entry in self.index.values())
+        for key in sorted(self.index, key=lambda k: self.index[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self.index[key]['size']
+            del self.index[key]
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        for key in list(self.index):
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+        self.index = {}
+        self._save_index()
+
+
+class StageResult:
+    """A stage's output: computed, or loaded from the cache only when something reads `value`"""
+
+    def __init__(self, key, value_hash, cached, cache=None, value=None, seconds=0.0):
+        self.key = key
+        self.content_hash = value_hash
+        self.cached = cached
+        self.seconds = seconds
+        self._cache = cache
+        self._value = value
+        self._loaded = not cached
+
+    @property
+    def value(self):
+        if not self._loaded:
+            self._value = self._cache.load(self.key)
+            self._loaded = True
+        return self._value
+
+
+def fetch_stage(config):
+    from nba_api import fetch_seasons
+
+    cache = None
+    if not config.get('no_response_cache'):
+        from response_cache import ResponseCache
+        cache = ResponseCache()
+    raw_df = fetch_seasons(config['seasons'], workers=config.get('workers', 4), rate=config.get('rate', 2.0),
+                           cache=cache, report=False)
+    if raw_df is None:
+        raise RuntimeError("No data was fetched")
+    return raw_df
+
+
+def transform_stage(config, raw_df):
+    from scoring import ScoringSystems
+    from transform import transform
+
+    rules = config['scoring_rules']
+    scoring = ScoringSystems(rules['leagues'], rules['stats'], rules['coefficients'])
+    return transform(raw_df, scoring).reset_index(drop=True)
+
+
+def aggregate_stage(config, stats_df):
+    from aggregation import aggregate_players
+
+    return aggregate_players(stats_df, min_games=config['min_games'], min_minutes=config['min_minutes'])
+
+
+def weights_stage(config, players_df):
+    import numpy as np
+    from scoring import select_league
+    from fantasy_ranking import normalize_metrics
+    from weight_search import search_weights
+
+    df = select_league(players_df, config['league']).copy()
+    X = normalize_metrics(df, config['metrics'])
+    y = df['FANTASY_POINTS'].to_numpy(dtype=np.float64)
+    grid, _, best_weights, best_correlation = search_weights(
+        X, y, step=config['weight_step'], min_weight=config['min_weight'], max_weight=config['max_weight'],
+        method=config['method'])
+    return {'weights': [float(w) for w in best_weights], 'correlation': float(best_correlation),
+            'combinations': len(grid)}
+
+
+def rank_stage(config, players_df, weights):
+    from scoring import select_league
+    from fantasy_ranking import normalize_metrics, rank_players
+
+    df = select_league(players_df, config['league']).copy()
+    X = normalize_metrics(df, config['metrics'])
+    return rank_players(df, X, weights['weights'])
+
+
+STAGES = [
+    Stage('fetch', fetch_stage, [], ['seasons', 'fetch_as_of'], 1),
+    Stage('transform', transform_stage, ['fetch'], ['scoring_rules'], 1),
+    Stage('aggregate', aggregate_stage, ['transform'], ['min_games', 'min_minutes'], 1),
+    Stage('weights', weights_stage, ['aggregate'], ['league', 'metrics', 'weight_step', 'min_weight',
+                                                    'max_weight', 'method'], 1),
+    Stage('rank', rank_stage, ['aggregate', 'weights'], ['league', 'metrics'], 1),
+]
+
+
+def run_pipeline(config, cache=None, stages=STAGES, force=()):
+    """
+    Run `stages` in order, reusing cached outputs whose keys match.
+    Stages named in `force` are recomputed (and so is everything whose inputs changed as a result).
+    Returns {stage name: StageResult}.
+    """
+    results = {}
+    for stage in stages:
+        inputs = [results[name] for name in stage.inputs]
+        key = stage_key(stage, config, [result.content_hash for result in inputs])
+        entry = cache.entry(key) if cache is not None and stage.name not in force else None
+        if entry is not None:
+            results[stage.name] = StageResult(key, entry['content_hash'], True, cache=cache)
+            continue
+
+        start = time.perf_counter()
+        input_values = [result.value for result in inputs]
+        with measure(stage.name, rows_in=row_count(input_values[0]) if input_values else None) as metrics:
+            value = stage.func(config, *input_values)
+            metrics.rows_out = row_count(value)
+        value_hash = content_hash(value)
+        seconds = time.perf_counter() - start
+        if cache is not None:
+            cache.store(key, stage.name, value, value_hash)
+        results[stage.name] = StageResult(key, value_hash, False, value=value, seconds=seconds)
+    return results
+
+
+def fetch_as_of(seasons, ttl_minutes, today=None):
+    """
+    Freshness part of the fetch key: None when every season is closed (their
+    stats never change), otherwise the current `ttl_minutes` time bucket.
+    """
+    if all(season_is_closed(season, today) for season in seasons):
+        return None
+    return int(time.time() // (ttl_minutes * 60))
+
+
+def scoring_rules(scoring_file):
+    """Scoring systems as plain data, so they can be part of the transform key"""
+    from scoring import load_scoring_systems
+
+    scoring = load_scoring_systems(scoring_file)
+    return {'leagues': scoring.leagues, 'stats': scoring.stats, 'coefficients': scoring.coefficients.tolist()}
+
+
+def parse_args(argv=None):
+    from nba_api import DEFAULT_SEASONS
+    from fantasy_ranking import DEFAULT_METRICS, RANKING_METRICS
+
+    parser = argparse.ArgumentParser(description='Run the whole pipeline, recomputing only the stages whose inputs changed')
+    parser.add_argument('--seasons', nargs='+', default=DEFAULT_SEASONS, help='Seasons to fetch (e.g. 2023-24 2024-25)')
+    parser.add_argument('--scoring-file', type=str, default=DEFAULT_SCORING_FILE, help='JSON file with the scoring systems of every league to score')
+    parser.add_argument('--league', type=str, default=DEFAULT_LEAGUE, help='Scoring system to rank by')
+    parser.add_argument('--min-games', type=int, default=20, help='Minimum games played to be ranked')
+    parser.add_argument('--min-minutes', type=float, default=10, help='Minimum average minutes to be ranked')
+    parser.add_argument('--metrics', nargs='+', choices=list(RANKING_METRICS),
+                        default=DEFAULT_METRICS,
+                        help='Metrics combined into the ranking score')
+    parser.add_argument('--weight-step', type=float, default=0.01, help='Grid step of the weight search over the simplex')
+    parser.add_argument('--min-weight', type=float, default=0.0, help='Smallest weight any metric may get')
+    parser.add_argument('--max-weight', type=float, default=1.0, help='Largest weight any metric may get')
+    parser.add_argument('--method', choices=['pearson', 'spearman'], default='pearson', help='Correlation used to score weights')
+    parser.add_argument('--top', type=int, default=15, help='Number of top players to show')
+    parser.add_argument('--no-save', action='store_true', help="Don't write the rankings files")
+    parser.add_argument('--workers', type=int, default=4, help='Number of concurrent fetch workers')
+    parser.add_argument('--rate', type=float, default=2.0, help='Maximum requests per second across all workers')
+    parser.add_argument('--fetch-ttl', type=float, default=15, help='Minutes before the current season is fetched again')
+    parser.add_argument('--refresh', action='store_true', help='Fetch again even if the cached data is fresh')
+    parser.add_argument('--cache-dir', type=str, default=DEFAULT_CACHE_DIR, help='Directory of the stage cache')
+    parser.add_argument('--cache-max-mb', type=float, default=500, help='Maximum size of the stage cache in MB')
+    parser.add_argument('--no-cache', action='store_true', help='Run every stage without reading or writing the stage cache')
+    parser.add_argument('--clear-cache', action='store_true', help='Empty the stage cache before running')
+    add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+@instrumented('run')
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+
+    config = {
+        'seasons': list(args.seasons),
+        'fetch_as_of': fetch_as_of(args.seasons, args.fetch_ttl),
+        'scoring_rules': scoring_rules(args.scoring_file),
+        'min_games': args.min_games,
+        'min_minutes': args.min_minutes,
+        'league': args.league,
+        'metrics': list(args.metrics),
+        'weight_step': args.weight_step,
+        'min_weight': args.min_weight,
+        'max_weight': args.max_weight,
+        'method': args.method,
+        'workers': args.workers,
+        'rate': args.rate,
+    }
+    if args.league not in config['scoring_rules']['leagues']:
+        print(f"Error: League '{args.league}' is not in {args.scoring_file}")
+        return 1
+
+    cache = None
+    if not args.no_cache:
+        cache = StageCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+        if args.clear_cache:
+            cache.clear()
+
+    try:
+        results = run_pipeline(config, cache, force=('fetch',) if args.refresh else ())
+    except Exception as e:
+        print(f"Error running the pipeline: {e}")
+        return 1
+
+    print("Stages:")
+    for name, result in results.items():
+        status = 'cached' if result.cached else f'ran in {result.seconds * 1000:.0f} ms'
+        print(f"  {name:<10} {status:<18} {result.key[:12]}")
+
+    weights = results['weights'].value
+    df_ranked = results['rank'].value
+    print("\nBest weights: " + ", ".join(f"{w:.2f} for {metric}" for metric, w in zip(args.metrics, weights['weights']))
+          + f" (correlation {weights['correlation']:.4f})")
+    print(f"\nTop {args.top} players ({args.league} scoring):")
+    print(df_ranked[['PLAYER_NAME', 'TEAM_ABBREVIATION', 'GP', 'FANTASY_POINTS', 'FANTASY_RANK_SCORE',
+                     'FANTASY_RANK_PERCENTILE']].head(args.top).to_string(index=False))
+
+    if not args.no_save:
+        from fantasy_ranking import save_rankings
+        save_rankings(df_ranked, args.league)
+
+    print(f"\nFinished in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())